@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare mxcodec with cloudpickle on model tree attrdicts
+
+Usage::
+
+    python benchmarks/bench_mxcodec.py [spaces] [cells]
+
+The tree is made of the given numbers of spaces and cells in each space,
+in the form of the attrdict returned by mx_get_attrdict.
+The time to load is the time the GUI thread spends on a reply.
+"""
+
+import sys
+import timeit
+import cloudpickle
+
+from spyder_modelx.utility import mxcodec
+
+
+def make_cells(space, name):
+    fullname = space + '.' + name
+    return {'type': 'Cells', 'id': id(fullname), 'name': name,
+            'fullname': fullname, 'repr': name + '(t)',
+            'namedid': fullname.partition('.')[2], '_evalrepr': fullname,
+            'parameters': ('t',), '_is_derived': False, '__len__': 0}
+
+
+def make_space(model, name, cells):
+    fullname = model + '.' + name
+    items = {c: make_cells(fullname, c)
+             for c in ('Cells%d' % i for i in range(cells))}
+    return {'type': 'UserSpace', 'id': id(fullname), 'name': name,
+            'fullname': fullname, 'repr': name, 'namedid': name,
+            '_evalrepr': fullname, 'parameters': None, '_is_derived': False,
+            '_named_itemspaces': {'type': 'SpaceView', 'items': {}},
+            'named_spaces': {'type': 'SpaceView', 'items': {}},
+            'cells': {'type': 'CellsView', 'items': items},
+            'refs': {'type': 'RefView', 'items': {}}}
+
+
+def make_tree(spaces, cells):
+    items = {s: make_space('Model1', s, cells)
+             for s in ('Space%d' % i for i in range(spaces))}
+    return {'type': 'Model', 'id': 1, 'name': 'Model1',
+            'fullname': 'Model1', 'repr': 'Model1', '_evalrepr': 'Model1',
+            'spaces': {'type': 'SpaceView', 'items': items},
+            'refs': {'type': 'RefView', 'items': {}}}
+
+
+def bench(name, dumps, loads, data, number=5):
+    payload = dumps(data)
+    assert loads(payload) == data
+    t_dumps = min(timeit.repeat(
+        lambda: dumps(data), number=number, repeat=3)) / number
+    t_loads = min(timeit.repeat(
+        lambda: loads(payload), number=number, repeat=3)) / number
+    print("%-12s %10d bytes  dumps %8.2f ms  loads %8.2f ms" % (
+        name, len(payload), t_dumps * 1000, t_loads * 1000))
+
+
+def main(spaces=100, cells=100):
+    data = make_tree(spaces, cells)
+    print("%d spaces x %d cells" % (spaces, cells))
+    bench('cloudpickle', cloudpickle.dumps, cloudpickle.loads, data)
+    bench('mxcodec', mxcodec.encode, mxcodec.decode, data)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the memory of the items of MxTreeModel per node
+
+Usage::
+
+    python benchmarks/bench_mxtreememory.py [spaces ...]
+
+The tree of a model with a space of the given numbers of child spaces,
+each with the same cells, is unpickled as received from the kernel,
+and the items are built by ``ModelItem``.
+*data* is the memory of the unpickled tree and *items* is the memory
+allocated by building the items, both per node measured by tracemalloc.
+*items* is net of the duplicate strings in the data freed by interning,
+and includes the growth of the table of the interned strings.
+"""
+
+import sys
+import time
+import tracemalloc
+import cloudpickle
+
+from spyder_modelx.widgets.mxtreemodel import ModelItem
+
+CELLS = ('premium', 'claims', 'expenses', 'reserve', 'pv_cashflow')
+
+
+def make_container(nodes):
+    return {'items': {node['name']: node for node in nodes},
+            'keys': [node['name'] for node in nodes],
+            'type': 'View'}
+
+
+def make_cells(id_, name, parent):
+    # Strings are created per node as they are in the kernel
+    return {'id': id_, 'name': ''.join(name), 'fullname': parent + '.' + name,
+            'repr': ''.join(name), 'type': ''.join('Cells'),
+            'parameters': ('t',), '_is_derived': False, '__len__': 0,
+            '_evalrepr': parent + '.' + name}
+
+
+def make_space(id_, name, fullname, spaces=(), cells=()):
+    return {'id': id_, 'name': name, 'fullname': fullname, 'repr': name,
+            'namedid': name, 'type': ''.join('UserSpace'), 'parameters': None,
+            '_is_derived': False, '__len__': 0, '_evalrepr': fullname,
+            '_named_itemspaces': make_container([]),
+            'named_spaces': make_container(spaces),
+            'cells': make_container(cells),
+            'refs': make_container([])}
+
+
+def make_tree(spaces):
+    children = []
+    for i in range(spaces):
+        fullname = 'M.S.S%d' % i
+        children.append(make_space(
+            10 + i * 10, 'S%d' % i, fullname,
+            cells=[make_cells(11 + i * 10 + j, name, fullname)
+                   for j, name in enumerate(CELLS)]))
+    space = make_space(2, 'S', 'M.S', spaces=children)
+    return {'id': 1, 'name': 'M', 'fullname': 'M', 'repr': 'M',
+            'type': 'Model', 'spaces': make_container([space]),
+            'refs': make_container([])}
+
+
+def bench(spaces):
+    payload = cloudpickle.dumps(make_tree(spaces))
+    nodes = spaces * (len(CELLS) + 1) + 2
+
+    tracemalloc.start()
+    data = cloudpickle.loads(payload)
+    data_size = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    item = ModelItem(data)
+    elapsed = time.perf_counter() - start
+    items_size = tracemalloc.get_traced_memory()[0] - data_size
+    tracemalloc.stop()
+    del item
+
+    print("%8d nodes  data %6.0f B  items %6.0f B  build %6.2f us" % (
+        nodes, data_size / nodes, items_size / nodes, elapsed / nodes * 1e6))
+
+
+def main(*counts):
+    for spaces in counts or (1000, 10000):
+        bench(spaces)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure scrolling and expanding MxTreeModel by the number of items
+
+Usage::
+
+    python benchmarks/bench_mxtreemodel.py [spaces ...]
+
+A model with a space of the given numbers of child spaces, each with
+one cells, is shown in a QTreeView. *parent* is the time of
+``MxTreeModel.parent`` per call on the cells in the last child spaces,
+which Qt calls for every painted index.
+*expand* is the time to expand all the items and paint the last page,
+and *scroll* is the time to paint the pages while scrolling
+from the top to the bottom, both per child spaces.
+Set ``QT_QPA_PLATFORM=offscreen`` to run without a display.
+"""
+
+import sys
+import time
+
+from qtpy.QtCore import QModelIndex
+from qtpy.QtWidgets import QApplication, QTreeView
+
+from spyder_modelx.widgets.mxtreemodel import MxTreeModel, ModelItem
+
+
+def make_container(nodes):
+    return {'items': {node['name']: node for node in nodes},
+            'keys': [node['name'] for node in nodes],
+            'type': 'View'}
+
+
+def make_space(id_, name, fullname, spaces=(), cells=()):
+    return {'id': id_, 'name': name, 'fullname': fullname, 'repr': name,
+            'namedid': name, 'type': 'UserSpace', 'parameters': None,
+            '_named_itemspaces': make_container([]),
+            'named_spaces': make_container(spaces),
+            'cells': make_container(cells),
+            'refs': make_container([])}
+
+
+def make_tree(spaces):
+    children = [
+        make_space(10 + 2 * i, 'S%d' % i, 'M.S.S%d' % i, cells=[
+            {'id': 11 + 2 * i, 'name': 'x', 'fullname': 'M.S.S%d.x' % i,
+             'repr': 'x', 'type': 'Cells', 'parameters': ('t',)}])
+        for i in range(spaces)]
+    space = make_space(2, 'S', 'M.S', spaces=children)
+    return {'id': 1, 'name': 'M', 'fullname': 'M', 'repr': 'M',
+            'type': 'Model', 'spaces': make_container([space]),
+            'refs': make_container([])}
+
+
+def bench(view, spaces, samples=1000):
+    model = MxTreeModel(ModelItem(make_tree(spaces)))
+    view.setModel(model)
+    space = model.index(0, 0, QModelIndex())
+    indexes = [model.index(0, 0, model.index(row, 0, space))
+               for row in range(max(spaces - samples, 0), spaces)]
+
+    start = time.perf_counter()
+    for index in indexes:
+        model.parent(index)
+    parent = (time.perf_counter() - start) / len(indexes)
+
+    start = time.perf_counter()
+    view.expandAll()
+    view.scrollToBottom()
+    view.viewport().repaint()
+    expand = time.perf_counter() - start
+
+    view.scrollToTop()
+    bar = view.verticalScrollBar()
+    start = time.perf_counter()
+    for value in range(bar.minimum(), bar.maximum() + 1, bar.pageStep()):
+        bar.setValue(value)
+        view.viewport().repaint()
+    scroll = time.perf_counter() - start
+
+    print("%8d spaces  parent %8.2f us  expand %8.2f us  scroll %8.2f us" % (
+        spaces, parent * 1e6, expand / spaces * 1e6, scroll / spaces * 1e6))
+
+
+def main(*counts):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    view = QTreeView()
+    view.resize(600, 800)
+    view.show()
+    app.processEvents()     # Lay out the view before timing
+    for spaces in counts or (500, 5000, 20000):
+        bench(view, spaces)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
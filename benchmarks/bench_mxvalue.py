@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare mxcodec with cloudpickle on values for MxDataViewer
+
+Usage::
+
+    python benchmarks/bench_mxvalue.py [megabytes]
+
+A float DataFrame and an array of the given size are decoded
+from the payloads as received from the kernel. The peak is the memory
+allocated while decoding, on top of the payload itself.
+"""
+
+import sys
+import time
+import tracemalloc
+import cloudpickle
+import numpy as np
+import pandas as pd
+
+from spyder_modelx.utility import mxcodec
+
+
+def bench(name, dumps, loads, value):
+    payload = dumps(value)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = loads(payload)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print("%-12s %10d bytes  loads %8.2f ms  peak %8.1f MB" % (
+        name, len(payload), elapsed * 1000, peak / 1e6))
+
+
+def main(megabytes=200):
+    rows = megabytes * 10 ** 6 // (8 * 20)
+    values = [
+        ('DataFrame', pd.DataFrame(np.random.rand(rows, 20),
+                                   columns=['c%d' % i for i in range(20)])),
+        ('ndarray', np.random.rand(rows, 20))
+    ]
+    for title, value in values:
+        print("%s of %d MB" % (title, megabytes))
+        bench('cloudpickle', cloudpickle.dumps, cloudpickle.loads, value)
+        bench('mxcodec', mxcodec.encode, mxcodec.decode, value)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
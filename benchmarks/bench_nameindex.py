@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Measure searching NameIndex by the number of names
+
+Usage::
+
+    python benchmarks/bench_nameindex.py [spaces ...]
+
+The names of a model with a space of the given numbers of child spaces,
+each with the same cells, are indexed as by the search of the explorer.
+*build* is the time to index all the names, and the other columns
+are the times of searching the texts.
+"""
+
+import sys
+import time
+
+from spyder_modelx.utility.nameindex import NameIndex
+
+CELLS = ('premium', 'claims', 'expenses', 'reserve', 'pv_cashflow')
+TEXTS = ('p', 'pr', 'prem', 'S1234', 'zzz')
+
+
+def make_names(spaces):
+    names = ['S']
+    for i in range(spaces):
+        names.append('S%d' % i)
+        names.extend(CELLS)
+    return names
+
+
+def bench(spaces):
+    names = make_names(spaces)
+    index = NameIndex()
+    start = time.perf_counter()
+    for key, name in enumerate(names):
+        index.add(key, name)
+    build = time.perf_counter() - start
+
+    times = []
+    for text in TEXTS:
+        start = time.perf_counter()
+        index.search(text)
+        times.append(time.perf_counter() - start)
+
+    print("%8d names  build %7.1f ms  " % (len(names), build * 1e3) + "  ".join(
+        "%s %6.2f ms" % (text, t * 1e3) for text, t in zip(TEXTS, times)))
+
+
+def main(*counts):
+    for spaces in counts or (1000, 17000):
+        bench(spaces)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
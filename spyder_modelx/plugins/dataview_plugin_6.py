@@ -62,8 +62,10 @@ from spyder.api.fonts import SpyderFontType
 from spyder_modelx.widgets.mxdataviewer import (
     MxDataFrameViewer,
     MxArrayViewer,
-    MxCollectionsViewer
+    MxCollectionsViewer,
+    MxRemoteDataFrameViewer
 )
+from spyder_modelx.widgets.mxdataviewer.remoteframe import RemoteFrame
 
 from spyder_modelx.widgets.mxtoolbar import MxToolBarMixin
 from spyder_modelx.widgets.mxlineedit import MxPyExprLineEdit
@@ -213,22 +215,40 @@ class MxDataViewWidget(QWidget):
         )
 
     def update_data(self):
+        self.request_data(
+            calc=self.plugin.get_container().calc_on_update_action.isChecked())
+
+    def request_data(self, calc):
 
         argtxt = self.argbox.get_expr()
         args = "(" + argtxt + ("," if argtxt else "") + ")"
         # assert
         ast.literal_eval(args)
 
-        calc = self.plugin.get_container().calc_on_update_action.isChecked()
-
-        val, is_calculated = self.shellwidget.update_mxdataview(
+        self.shellwidget.update_mxdataview(
             obj=self.attrdict["fullname"],
             args=args,
-            calc=calc
+            calc=calc,
+            callback=self._process_data,
+            pane=self
         )
+
+    def _process_data(self, is_error, result):
+
+        if is_error:
+            self.msgbox.setText("%s: %s" % result)
+            return
+
+        val, is_calculated = result
         self.update_value(val)
         if is_calculated:
-            self.shellwidget.update_mx_widgets({})
+            self.shellwidget.schedule_mx_widgets_update({})
+
+    def set_refreshing(self, refreshing):
+        if refreshing:
+            self.msgbox.setText(_("Refreshing..."))
+        elif self.msgbox.text() == _("Refreshing..."):
+            self.msgbox.setText("")
 
     def update_value(self, data):
 
@@ -236,7 +256,12 @@ class MxDataViewWidget(QWidget):
         import numpy as np
         import numpy.ma
 
-        if isinstance(data, (pd.DataFrame, pd.Index, pd.Series)):
+        if isinstance(data, RemoteFrame):
+            self.widget.deleteLater()
+            self.widget = MxRemoteDataFrameViewer(self)
+            self.widget.setup_and_check(data)
+            self.msgbox.setText(data.type)
+        elif isinstance(data, (pd.DataFrame, pd.Index, pd.Series)):
             self.widget.deleteLater()
             self.widget = MxDataFrameViewer(self)
             self.widget.setup_and_check(data)
@@ -211,7 +211,17 @@ class ModelxConfigPage(PluginConfigPage):
         return _('modelx')
 
     def setup_page(self):
-        pass
+        delay_spin = self.create_spinbox(
+            _("Delay to refresh the modelx widgets after "
+              "the kernel state changes:"), _(" ms"),
+            'refresh_delay', default=200, min_=0, max_=5000, step=50,
+            tip=_("Kernel state changes within the delay are coalesced "
+                  "into one refresh. 0 refreshes without delay."))
+
+        layout = QVBoxLayout()
+        layout.addWidget(delay_spin)
+        layout.addStretch(1)
+        self.setLayout(layout)
 
 
 class ModelxPlugin(SpyderDockablePlugin):
@@ -27,6 +27,7 @@ from spyder.api.plugins import Plugins
 from spyder.api.shellconnect.mixins import ShellConnectPluginMixin
 from spyder.api.plugins import SpyderDockablePlugin
 from spyder.api.plugin_registration.decorators import on_plugin_available
+from spyder.api.config.decorators import on_conf_change
 from spyder.plugins.mainmenu.api import (
     ApplicationMenus, ConsolesMenuSections)
 
@@ -54,6 +55,7 @@ from .mxplugin_5_base import (
     MxConsoleWidgetTabsContextMenuSections
 )
 from spyder_modelx.widgets.mxexplorer import MxMainWidget
+from spyder_modelx.widgets.mxshell import MxShellWidget
 
 class MxPluginMainWidget(MxConsoleAPI_6_0, MxShellConnectMainWidget):
 
@@ -176,6 +178,18 @@ class MxPluginMainWidget(MxConsoleAPI_6_0, MxShellConnectMainWidget):
         """
         pass
 
+    def create_new_widget(self, shellwidget):
+        shellwidget.mx_refresh_delay = self.get_conf(
+            'refresh_delay', default=MxShellWidget.mx_refresh_delay)
+        return super().create_new_widget(shellwidget)
+
+    @on_conf_change(option='refresh_delay')
+    def on_refresh_delay_update(self, value):
+        for widget in self._shellwidgets.values():
+            shellwidget = getattr(widget, 'shellwidget', None)
+            if shellwidget is not None:
+                shellwidget.mx_refresh_delay = value
+
 
 class ModelxPlugin(SpyderDockablePlugin, ShellConnectPluginMixin):
     """modelx plugin."""
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from spyder_modelx.utility.attrdictcache import AttrDictCache
+
+
+def test_attrdictcache():
+
+    cache = AttrDictCache(maxsize=2)
+    kwargs = {'fullname': 'M.S.foo', 'attrs': ['formula'],
+              'recursive': False}
+
+    gen = cache.generation
+    cache.set_versions({'M': 1}, gen)
+    cache.put(kwargs, {'formula': 'foo'}, gen)
+    assert cache.get(kwargs) == {'formula': 'foo'}
+
+    # Unknown versions after the kernel state changes
+    cache.expire()
+    with pytest.raises(KeyError):
+        cache.get(kwargs)
+
+    # Replies to requests sent before the expiry are ignored
+    cache.set_versions({'M': 1}, gen)
+    assert cache.versions is None
+
+    cache.set_versions({'M': 1}, cache.generation)
+    assert cache.get(kwargs) == {'formula': 'foo'}
+
+    # New version of the model
+    cache.expire()
+    cache.set_versions({'M': 2}, cache.generation)
+    with pytest.raises(KeyError):
+        cache.get(kwargs)
+
+    # Recursive attrdicts are not cached
+    recursive = dict(kwargs, recursive=True)
+    cache.put(recursive, {}, cache.generation)
+    with pytest.raises(KeyError):
+        cache.get(recursive)
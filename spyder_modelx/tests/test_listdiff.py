@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import random
+import pytest
+
+from spyder_modelx.utility.listdiff import (
+    get_runs, get_lis, get_moves, move_items)
+
+
+def test_get_runs():
+    assert get_runs([1, 2, 3, 5, 7, 8]) == [(1, 3), (5, 1), (7, 2)]
+    assert get_runs([]) == []
+
+
+def test_get_lis():
+    seq = [3, 1, 4, 1, 5, 9, 2, 6]
+    lis = get_lis(seq)
+    assert len(lis) == 4
+    assert all(seq[i] < seq[j] for i, j in zip(lis, lis[1:]))
+
+
+@pytest.mark.parametrize("target, count", [
+    (list('abcdef'), 0),
+    (list('fabcde'), 1),
+    (list('bcdefa'), 1),
+    (list('defabc'), 1),
+    (list('acbdef'), 1),
+    (list('fedcba'), 5)
+])
+def test_get_moves(target, count):
+
+    source = list('abcdef')
+    moves = get_moves(source, target)
+    assert len(moves) == count
+
+    for move in moves:
+        move_items(source, *move)
+    assert source == target
+
+
+def test_get_moves_random():
+
+    rand = random.Random(0)
+    for _ in range(100):
+        source = list(range(rand.randint(0, 30)))
+        target = source[:]
+        rand.shuffle(target)
+        moves = get_moves(source, target)
+        for move in moves:
+            move_items(source, *move)
+        assert source == target
+
+
+def test_get_moves_limit():
+    assert get_moves(list('abcdef'), list('fedcba'), limit=4) is None
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+from spyder_modelx.utility.modelchanges import (
+    ModelChanges, NEW, FORMULA, CLEAR, VALUES)
+
+
+def test_modelchanges():
+
+    changes = ModelChanges()
+    assert not changes
+
+    changes.update([('M', VALUES, ['M.S.foo']),
+                    ('M', CLEAR, ['M.S.bar']),
+                    ('N', FORMULA, ['N.T.baz'])])
+
+    assert changes
+    assert not changes.is_structural()
+    assert changes.is_changed('M.S.foo')
+    assert not changes.is_changed('M.S.foo', [CLEAR, FORMULA])
+    assert not changes.is_changed('M.S')
+    assert changes.get_objects('M') == ['M.S.bar', 'M.S.foo']
+    assert changes.get_objects('M', [CLEAR]) == ['M.S.bar']
+
+    changes.add('N', NEW, ['N.T'])
+    assert changes.is_structural()
+    assert changes.is_structural('N')
+    assert not changes.is_structural('M')
+    assert changes.is_changed('N.T.qux')     # Child of the new space
+
+    taken = changes.take()
+    assert not changes
+    assert set(taken.models) == {'M', 'N'}
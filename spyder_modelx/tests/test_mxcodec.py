@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import cloudpickle
+import numpy as np
+import pandas as pd
+import pytest
+
+from spyder_modelx.utility import mxcodec
+
+
+def make_attrdict(n):
+    items = {'Cells%d' % i: {'type': 'Cells', 'name': 'Cells%d' % i,
+                             'parameters': ('t',), '__len__': i}
+             for i in range(n)}
+    return {'type': 'UserSpace', 'name': 'Space1', 'bases': [],
+            'cells': {'type': 'CellsView', 'items': items}}
+
+
+@pytest.mark.parametrize("n, flag", [(1, mxcodec.RAW), (200, mxcodec.ZLIB)])
+def test_round_trip(n, flag):
+
+    data = [(False, make_attrdict(n)), (True, ('KeyError', 'x'))]
+    encoded = mxcodec.encode(data)
+
+    assert mxcodec.is_encoded(encoded)
+    assert encoded[len(mxcodec.MAGIC):len(mxcodec.MAGIC) + 1] == flag
+    assert mxcodec.decode(encoded) == data
+
+
+def test_not_encoded():
+
+    data = cloudpickle.dumps({'type': 'Model'})
+    assert not mxcodec.is_encoded(data)
+    with pytest.raises(ValueError):
+        mxcodec.decode(data)
+
+
+def test_buffers():
+
+    array = np.arange(1000, dtype=float).reshape(100, 10)
+    df = pd.DataFrame(array, columns=list('abcdefghij'))
+    encoded = mxcodec.encode([(False, [array, False]), (False, [df, True])])
+    assert encoded[len(mxcodec.MAGIC):len(mxcodec.MAGIC) + 1] == (
+        mxcodec.BUFFERS)
+
+    (_, (array2, _)), (_, (df2, _)) = mxcodec.decode(memoryview(encoded))
+
+    assert np.array_equal(array2, array)
+    assert df2.equals(df)
+    # The array is a view of the payload
+    assert np.shares_memory(array2, np.frombuffer(encoded, dtype=np.uint8))
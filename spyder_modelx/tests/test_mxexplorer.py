@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import types
+import pytest
+from qtpy.QtCore import QModelIndex
+from qtpy.QtWidgets import QWidget
+
+from spyder_modelx.tests.test_mxtreemodel import (
+    make_cells, make_space, make_model)
+from spyder_modelx.utility.treedelta import get_node
+from spyder_modelx.widgets.mxexplorer.mxexplorer_6 import (
+    MxExplorer, MAX_CACHED_TREES)
+
+
+def make_tree(cells=('foo', 'bar'), model_id=1):
+    model = make_model([make_space(2, 'S', 'M', cells=[
+        make_cells(10 + i, name, 'M.S') for i, name in enumerate(cells)])])
+    model['id'] = model_id
+    return model
+
+
+@pytest.fixture
+def explorer(qtbot):
+    parent = QWidget()
+    parent.plugin = types.SimpleNamespace(get_container=lambda: None)
+    qtbot.addWidget(parent)
+    explorer = MxExplorer(parent)
+    yield explorer
+    explorer.close_worker()
+
+
+def wait_updates(qtbot, explorer):
+    qtbot.waitUntil(lambda: not explorer._tree_updates)
+
+
+def get_names(item):
+    return [child.itemData['name'] for child in item.childItems]
+
+
+def test_tree_worker(qtbot, explorer):
+
+    explorer.process_remote_view(make_tree())
+    wait_updates(qtbot, explorer)
+    model = explorer.treeview.model()
+    assert get_names(model.rootItem) == ['S']
+
+    # Spaces not loaded in the tree are pruned in the worker
+    space = model.rootItem.child(0)
+    assert space.itemData['cells'] == ('foo', 'bar')
+    assert explorer.get_loaded_spaces('M') == set()
+
+    # An error in the worker is shown and the next updates are applied
+    def decode(data):
+        raise ValueError('boom')
+
+    explorer.process_remote_view(None, decode=decode)
+    explorer.process_remote_view(make_tree(cells=('foo', 'bar', 'baz')))
+    wait_updates(qtbot, explorer)
+
+    assert explorer.status.text() == 'ValueError: boom'
+    assert explorer.status.isVisibleTo(explorer)
+    assert explorer.treeview.model() is model
+    assert model.rootItem.child(0) is space
+    assert space.itemData['cells'] == ('foo', 'bar', 'baz')
+
+    explorer.close_worker()
+    explorer.process_remote_view(make_tree(cells=()))
+    assert not explorer._tree_updates
+    assert space.itemData['cells'] == ('foo', 'bar', 'baz')
+
+
+def test_tree_cache(qtbot, explorer):
+
+    view = explorer.treeview
+    view.shell = types.SimpleNamespace(
+        fetch_modeltree_children=lambda model, item: model.loadChildren(
+            item, get_node(make_tree(model_id=model.modelid),
+                           item.getPath())))
+
+    explorer.process_remote_view(make_tree(model_id=1))
+    wait_updates(qtbot, explorer)
+    model = view.model()
+    sindex = model.index(0, 0, QModelIndex())
+    model.fetchMore(sindex)
+    model.version = 7
+    view.expand(sindex)
+    view.setCurrentIndex(model.index(1, 0, sindex))
+
+    explorer.process_remote_view(make_tree(model_id=2))
+    wait_updates(qtbot, explorer)
+    assert view.model() is not model
+    assert list(explorer._tree_cache) == [1]
+
+    # The cached tree is shown with its view state and version
+    explorer.select_tree(1)
+    wait_updates(qtbot, explorer)
+    assert view.model() is model
+    assert view.isExpanded(sindex)
+    assert view.currentIndex().internalPointer().itemData['name'] == 'bar'
+    assert explorer.get_tree_version('M') == 7
+    assert list(explorer._tree_cache) == [2]
+
+    # Trees of other models are not selected
+    explorer.select_tree(3)
+    wait_updates(qtbot, explorer)
+    assert view.model() is model
+
+    # The least recently shown trees are dropped
+    for model_id in range(10, 10 + MAX_CACHED_TREES):
+        explorer.process_remote_view(make_tree(model_id=model_id))
+    wait_updates(qtbot, explorer)
+    assert list(explorer._tree_cache) == [1] + list(
+        range(10, 10 + MAX_CACHED_TREES - 1))
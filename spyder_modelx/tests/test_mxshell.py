@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of the requests of MxShellWidget to the kernel
+
+``ShellWidget.call_kernel`` is replaced with :class:`FakeKernel`,
+which calls the kernel methods given to it in place of the kernel.
+"""
+
+import hashlib
+from unittest import mock
+import cloudpickle
+import pytest
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QWidget
+
+from spyder_modelx.utility.requestqueue import (
+    PRIORITY_EDIT, PRIORITY_VISIBLE, PRIORITY_PREFETCH)
+from spyder_modelx.widgets.mxshell.mxshell_6 import (
+    MxShellWidget, ShellWidget, _PICKLED_REPLIES)
+
+
+class CommError(Exception):
+    pass
+
+
+class FakeKernel:
+    """Kernel methods called by the fake of ``ShellWidget.call_kernel``
+
+    The replies to non-blocking calls are held in ``deferred``
+    until :meth:`reply` is called if ``deferred`` is a list.
+    The methods in ``missing`` raise the error of Spyder for
+    the methods not registered in the kernel.
+    """
+
+    def __init__(self):
+        self.methods = {}
+        self.missing = set()
+        self.calls = []     # Pairs of the method names and the settings
+        self.snapshots = []     # Queries passed to mx_get_snapshot
+        self.deferred = None
+
+    def call_kernel(self, shell, interrupt=False, blocking=False,
+                    callback=None, timeout=None, display_error=False):
+        # Spyder passes timeout * 1000 to QTimer.start taking only ints
+        assert timeout is None or type(timeout) is int
+        settings = dict(interrupt=interrupt, blocking=blocking,
+                        callback=callback, timeout=timeout)
+        return _Call(self, settings)
+
+    def run(self, name, args, kwargs):
+        if name in self.missing:
+            raise CommError("No such spyder call type: %s" % name)
+        elif name == 'mx_get_snapshot':
+            replies = []
+            self.snapshots.append(cloudpickle.loads(args[0]))
+            for method, margs, mkwargs in self.snapshots[-1]:
+                try:
+                    replies.append((False, self.run(method, margs, mkwargs)))
+                except Exception as e:
+                    replies.append((True, (type(e).__name__, str(e))))
+            return cloudpickle.dumps(replies)
+        elif name not in self.methods:
+            raise CommError("No such spyder call type: %s" % name)
+
+        value = self.methods[name](*args, **kwargs)
+        if name in _PICKLED_REPLIES:
+            value = cloudpickle.dumps(value)
+        return value
+
+    def get_hashed(self, query, digest):
+        """Fake of ``mx_get_hashed`` of the kernel"""
+        value = self.run(*query)
+        hash_ = hashlib.sha1(repr(value).encode()).hexdigest()
+        return [hash_, None if hash_ == digest else value]
+
+    def reply(self):
+        """Call the callbacks of the deferred replies"""
+        deferred, self.deferred[:] = list(self.deferred), []
+        for callback in deferred:
+            callback()
+
+    def get_calls(self):
+        return [name for name, _settings in self.calls]
+
+
+class _Call:
+
+    def __init__(self, kernel, settings):
+        self.kernel = kernel
+        self.settings = settings
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            kernel = self.kernel
+            kernel.calls.append((name, self.settings))
+            if self.settings['blocking']:
+                return kernel.run(name, args, kwargs)
+
+            try:
+                reply = kernel.run(name, args, kwargs)
+            except Exception:   # Not replied
+                return
+            callback = self.settings['callback']
+            if callback is None:
+                return
+            elif kernel.deferred is None:
+                callback(reply)
+            else:
+                kernel.deferred.append(lambda: callback(reply))
+        return call
+
+
+@pytest.fixture
+def kernel(monkeypatch):
+    kernel = FakeKernel()
+    monkeypatch.setattr(ShellWidget, 'call_kernel', kernel.call_kernel)
+    return kernel
+
+
+@pytest.fixture
+def shell(qtbot, kernel):
+    shell = MxShellWidget(mock.MagicMock(), {}, {})
+    qtbot.addWidget(shell)
+    return shell
+
+
+@pytest.fixture
+def widgets(shell):
+    """Set the mocks of the modelx widgets to shell"""
+    shell.mxmodelselector = mock.Mock(
+        **{'get_selected_model.return_value': 'Model1'})
+    shell.mxexplorer = mock.Mock(**{
+        'get_tree_version.return_value': None,
+        'get_loaded_spaces.return_value': ()})
+    shell.mxdatalist = mock.Mock()
+    shell.mxproperty = mock.Mock(objectId=None)
+    tab = mock.Mock(attrdict=None)
+    tab.object_radio.isChecked.return_value = False
+    tab.expr_radio.isChecked.return_value = False
+    shell.mxanalyzer = mock.Mock(tabs={'precedents': tab, 'succs': tab})
+
+    shell._mx_snapshot_supported = True
+    shell._mx_notify_supported = True
+    shell._mx_versions_supported = False
+    shell.mx_refresh_delay = 0
+    return shell
+
+
+def get_methods(queries):
+    return [method for method, args, kwargs in queries]
+
+
+def test_timeout_after_give_up(shell, kernel):
+
+    kernel.methods['mx_get_value'] = lambda *args: 1
+    kernel.deferred = []
+    shell._mx_snapshot_supported = True
+    replies = []
+    shell.get_snapshot([('mx_get_value', ('x', (), False), {})],
+                       callback=replies.append)
+    assert shell._mx_pending is not None
+
+    shell._on_mx_request_timeout()
+    assert shell._mx_pending is None
+    assert shell.mx_rpc_stats.get_latency('mx_get_snapshot', 95) is None
+
+    # Late replies are ignored
+    kernel.reply()
+    assert replies == []
+
+    shell.mx_rpc_stats.record('mx_get_snapshot', None, 8.2, 0, 0)
+    assert shell._get_timeout('mx_get_snapshot') == 33
+    assert shell.get_snapshot(
+        [('mx_get_value', ('x', (), False), {})]) == [(False, 1)]
+
+
+def test_inflight_send_error(shell, kernel, monkeypatch):
+
+    kernel.methods['mx_get_value'] = lambda *args: 1
+    shell._mx_snapshot_supported = True
+    query = ('mx_get_value', ('x', (), False), {})
+    with monkeypatch.context() as m:
+        m.setattr(shell, '_get_snapshot',
+                  mock.Mock(side_effect=RuntimeError('closed')))
+        with pytest.raises(RuntimeError):
+            shell.get_snapshot([query], callback=lambda replies: None)
+
+    assert shell._mx_pending is None
+    assert shell._mx_inflight == {}
+    assert shell.get_snapshot([query]) == [(False, 1)]
+
+
+def test_inflight_late_reply(shell, kernel):
+
+    kernel.methods['mx_get_value'] = lambda *args: 1
+    kernel.deferred = []
+    shell._mx_snapshot_supported = True
+    query = ('mx_get_value', ('x', (), False), {})
+    replies = []
+
+    shell.get_snapshot([query], callback=replies.append)
+    shell._on_mx_request_timeout()
+    assert shell._mx_inflight == {}
+
+    shell.get_snapshot([query], callback=replies.append)
+    assert len(shell._mx_inflight) == 1
+
+    # The reply to the given-up request leaves the waiters of the new one
+    kernel.deferred.pop(0)()
+    assert replies == []
+    assert len(shell._mx_inflight) == 1
+
+    kernel.reply()
+    assert replies == [[(False, 1)]]
+    assert shell._mx_inflight == {}
+
+
+def test_inflight_wait_timeout(shell, kernel, monkeypatch):
+
+    kernel.methods['mx_get_value'] = lambda *args: 1
+    kernel.deferred = []
+    shell._mx_snapshot_supported = True
+    query = ('mx_get_value', ('x', (), False), {})
+
+    shell.get_snapshot([query], callback=lambda replies: None)
+    monkeypatch.setattr(shell, '_get_timeout', lambda method: 0)
+    assert shell.get_snapshot([query]) == [
+        (True, ('TimeoutError', 'No reply from the kernel'))]
+
+
+def test_snapshot(shell, kernel):
+
+    kernel.methods['mx_get_modellist'] = lambda: ['Model1']
+    kernel.methods['mx_get_value'] = lambda obj, args, calc: {'value': 1}
+    queries = [('mx_get_modellist', (), {}),
+               ('mx_get_value', ('Model1.Space1.foo', (), False), {}),
+               ('mx_get_codelist', ('Model1.Space1.cells',), {})]
+
+    replies = shell.get_snapshot(queries)
+    assert kernel.get_calls() == ['mx_get_snapshot']
+    assert shell._mx_snapshot_supported is True
+    assert replies[:2] == [(False, ['Model1']), (False, {'value': 1})]
+    assert replies[2][0] is True and replies[2][1][0] == 'CommError'
+
+
+def test_snapshot_fallback(shell, kernel):
+
+    kernel.methods['mx_get_modellist'] = lambda: ['Model1']
+    kernel.methods['mx_get_value'] = lambda obj, args, calc: {'value': 1}
+    kernel.missing.add('mx_get_snapshot')
+    queries = [('mx_get_modellist', (), {}),
+               ('mx_get_value', ('Model1.Space1.foo', (), False), {})]
+
+    expected = [(False, ['Model1']), (False, {'value': 1})]
+    assert shell.get_snapshot(queries) == expected
+    assert shell._mx_snapshot_supported is False
+    assert kernel.get_calls() == [
+        'mx_get_snapshot', 'mx_get_modellist', 'mx_get_value']
+
+    # Not tried again, and the callback is called without blocking
+    kernel.calls.clear()
+    replies = []
+    shell.get_snapshot(queries, callback=replies.append)
+    assert replies == [expected]
+    assert kernel.get_calls() == ['mx_get_modellist', 'mx_get_value']
+
+
+def test_stale_replies(shell, kernel):
+
+    kernel.methods['mx_get_value'] = lambda obj, args, calc: obj
+    kernel.deferred = []
+    shell._mx_snapshot_supported = True
+    pane = mock.Mock()
+    results = []
+
+    def request(obj):
+        shell.send_mx_requests(
+            [(pane, 'value', ('mx_get_value', (obj, (), False), {}))],
+            lambda replies, panes: results.append(replies['value']))
+
+    request('x')    # Sent
+    request('y')    # Queued and superseded before sent
+    request('z')    # Queued
+    assert len(kernel.snapshots) == 1
+
+    # The reply to the superseded request is not passed
+    kernel.reply()
+    assert results == []
+    assert pane.set_refreshing.call_args_list[-1] == mock.call(True)
+
+    kernel.reply()
+    assert results == [(False, 'z')]
+    assert len(kernel.snapshots) == 2
+    assert pane.set_refreshing.call_args_list[-1] == mock.call(False)
+    assert shell._mx_pane_requests == {}
+
+
+def test_priority(shell, kernel):
+
+    kernel.methods['mx_get_value'] = lambda obj, args, calc: obj
+    kernel.deferred = []
+    shell._mx_snapshot_supported = True
+    results = []
+
+    for obj, priority in [('pending', PRIORITY_VISIBLE),
+                          ('prefetch', PRIORITY_PREFETCH),
+                          ('visible', PRIORITY_VISIBLE),
+                          ('edit', PRIORITY_EDIT)]:
+        shell.get_snapshot(
+            [('mx_get_value', (obj, (), False), {})],
+            callback=lambda replies: results.append(replies[0][1]),
+            priority=priority)
+
+    while kernel.deferred:
+        kernel.reply()
+    assert results == ['pending', 'edit', 'visible', 'prefetch']
+
+
+def test_inflight_dedup(shell, kernel):
+
+    kernel.methods['mx_get_value'] = lambda obj, args, calc: obj
+    kernel.deferred = []
+    shell._mx_snapshot_supported = True
+    x = ('mx_get_value', ('x', (), False), {})
+    y = ('mx_get_value', ('y', (), False), {})
+
+    # Identical queries are sent once
+    results = []
+    shell.get_snapshot([x, x], callback=results.append)
+    assert kernel.snapshots == [[x]]
+
+    # The blocking call waits for the reply to x being sent
+    QTimer.singleShot(0, kernel.reply)
+    assert shell.get_snapshot([y, x]) == [(False, 'y'), (False, 'x')]
+    assert kernel.snapshots == [[x], [y]]
+    assert results == [[(False, 'x'), (False, 'x')]]
+    assert shell._mx_inflight == {}
+
+
+def test_models_changed(shell, kernel, widgets):
+
+    kernel.methods.update({
+        'mx_get_modellist': lambda: [],
+        'mx_get_tree_delta': lambda **kwargs: {},
+        'mx_get_value_info': lambda model: {},
+        'mx_get_hashed': kernel.get_hashed,
+        'mx_get_attrdict': lambda **kwargs: {'fullname': kwargs['fullname']}
+    })
+    path = ('spaces', 'Space1', 'cells', 'foo')
+    shell.mxexplorer.get_leaf_paths.return_value = {'Model1.Space1.foo': path}
+
+    # Kernel states without changes do not refresh the widgets
+    shell.schedule_mx_widgets_update({})
+    assert kernel.snapshots == []
+
+    # Only the changed node is requested
+    shell.handle_mx_models_changed(
+        [('Model1', 'values', ['Model1.Space1.foo'])])
+    assert [get_methods(queries) for queries
+            in kernel.snapshots] == [['mx_get_attrdict']]
+    shell.mxexplorer.process_remote_nodes.assert_called_once_with(
+        'Model1', [('attrs', path, {'fullname': 'Model1.Space1.foo'})])
+    assert not shell._mx_changes
+
+    # Structural changes refresh the model list, the tree and the data list
+    kernel.snapshots.clear()
+    shell.handle_mx_models_changed([('Model1', 'new', ['Model1.Space2'])])
+    assert [get_methods(queries) for queries in kernel.snapshots] == [
+        ['mx_get_modellist', 'mx_get_tree_delta', 'mx_get_hashed']]
+    shell.mxexplorer.process_remote_delta.assert_called_once_with({})
+    shell.mxdatalist.process_remote_view.assert_called_once_with({})
+
+
+def test_hidden_pane(shell, kernel, widgets, qtbot):
+
+    kernel.methods.update({
+        'mx_get_modellist': lambda: [],
+        'mx_get_tree_delta': lambda **kwargs: {},
+        'mx_get_value_info': lambda model: {'x': 1},
+        'mx_get_hashed': kernel.get_hashed
+    })
+    pane = QWidget()
+    qtbot.addWidget(pane)
+    shell.set_mx_pane('datalist', pane)
+
+    shell.update_mx_widgets({})
+    assert get_methods(kernel.snapshots[0]) == [
+        'mx_get_modellist', 'mx_get_tree_delta']
+    assert shell._mx_dirty == {'datalist'}
+    shell.mxdatalist.process_remote_view.assert_not_called()
+
+    # Updated when shown
+    pane.show()
+    qtbot.waitUntil(lambda: shell.mxdatalist.process_remote_view.called)
+    shell.mxdatalist.process_remote_view.assert_called_once_with({'x': 1})
+    assert get_methods(kernel.snapshots[1]) == ['mx_get_hashed']
+    assert shell._mx_dirty == set()
+
+
+def test_hashed_query(shell, kernel, widgets):
+
+    info = {'x': 1}
+    kernel.methods.update({
+        'mx_get_value_info': lambda model: dict(info),
+        'mx_get_hashed': kernel.get_hashed
+    })
+    process = shell.mxdatalist.process_remote_view
+
+    shell.update_datalist()
+    process.assert_called_once_with({'x': 1})
+    query = ('mx_get_value_info', ('Model1',), {})
+    assert kernel.snapshots[-1] == [('mx_get_hashed', (query, None), {})]
+
+    # The unchanged reply is omitted and not shown again
+    shell.update_datalist()
+    (method, (_query, digest), _kwargs), = kernel.snapshots[-1]
+    assert digest is not None
+    assert process.call_count == 1
+
+    info['y'] = 2
+    shell.update_datalist()
+    assert process.call_count == 2
+    process.assert_called_with({'x': 1, 'y': 2})
+
+
+def test_hashed_query_unsupported(shell, kernel, widgets):
+
+    kernel.methods['mx_get_value_info'] = lambda model: {'x': 1}
+    kernel.missing.add('mx_get_hashed')
+
+    # Requested again without the hash
+    shell.update_datalist()
+    assert get_methods(kernel.snapshots[0]) == ['mx_get_hashed']
+    assert get_methods(kernel.snapshots[1]) == ['mx_get_value_info']
+    assert shell._mx_hash_supported is False
+    shell.mxdatalist.process_remote_view.assert_called_once_with({'x': 1})
+
+
+def test_error_reply(shell, kernel, widgets):
+
+    def get_codelist(objname):
+        raise ValueError("no such object: %s" % objname)
+
+    kernel.methods['mx_get_codelist'] = get_codelist
+    shell.mxcodelist = mock.Mock()
+
+    # Shown in the status line of the explorer without raising
+    shell.update_codelist('Model1.Space1')
+    shell.mxcodelist.process_remote_view.assert_not_called()
+    shell.mxexplorer.update_status.assert_called_once_with(
+        False, "ValueError: no such object: Model1.Space1.cells")
+
+
+def test_refreshing_after_give_up(shell, kernel):
+
+    kernel.methods['mx_get_value'] = lambda obj, args, calc: obj
+    kernel.deferred = []
+    shell._mx_snapshot_supported = True
+    pane = mock.Mock()
+    callback = mock.Mock()
+
+    shell.send_mx_requests(
+        [(pane, 'value', ('mx_get_value', ('x', (), False), {}))], callback)
+    pane.set_refreshing.assert_called_once_with(True)
+
+    shell._on_mx_request_timeout()
+    pane.set_refreshing.assert_called_with(False)
+    kernel.reply()
+    callback.assert_not_called()
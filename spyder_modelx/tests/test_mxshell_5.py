@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of MxShellWidget for Spyder 5, skipped with newer Spyder"""
+
+from unittest import mock
+import pytest
+
+mxshell_5 = pytest.importorskip('spyder_modelx.widgets.mxshell.mxshell_5')
+
+
+class CommError(Exception):
+    pass
+
+
+SOURCE = "lambda x: 2 * x"
+ARGS = ('Model1.Space1.foo', SOURCE)
+
+
+def make_shell(error=None):
+    """Make the mock of the shell whose kernel calls raise error"""
+    shell = mock.Mock(_mx_missing=set())
+    shell._call_kernel_timed.side_effect = error
+    return shell
+
+
+def call_or_exec(shell):
+    mxshell_5.MxShellWidget._call_or_exec(
+        shell, 'mx_set_formula', ARGS, lambda: 'code')
+
+
+def test_call():
+
+    shell = make_shell()
+    call_or_exec(shell)
+    shell._call_kernel_timed.assert_called_once_with('mx_set_formula', *ARGS)
+    shell._mx_wait_reply.assert_not_called()
+
+
+@pytest.mark.parametrize("error", [
+    CommError("No such spyder call type: mx_set_formula"),
+    TypeError("MxKernel.mx_set_formula() takes 2 positional arguments "
+              "but 3 were given")
+])
+def test_exec_with_older_kernel(error):
+
+    shell = make_shell(error)
+    call_or_exec(shell)
+    shell._mx_wait_reply.assert_called_once_with(
+        None, shell.sig_mxupdated, 'code')
+
+    # The method is not called afterwards
+    assert shell._mx_missing == {'mx_set_formula'}
+    call_or_exec(shell)
+    assert shell._call_kernel_timed.call_count == 1
+    assert shell._mx_wait_reply.call_count == 2
+
+
+def test_error():
+
+    shell = make_shell(TypeError("unsupported operand type(s) for *"))
+    with pytest.raises(TypeError):
+        call_or_exec(shell)
+    shell._mx_wait_reply.assert_not_called()
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import pytest
+from qtpy.QtCore import QModelIndex, QPersistentModelIndex, Qt
+
+from spyder_modelx.utility.treedelta import hash_tree, get_tree_delta
+from spyder_modelx.widgets.mxtreemodel import (
+    MxTreeModel, ModelItem, CellsItem, ItemSpaceMapItem,
+    MAX_MOVE_SIGNALS, ITEMSPACE_PAGE_SIZE,
+    get_space_containers, get_child_spaces)
+
+
+def make_container(nodes):
+    return {'items': {node['name']: node for node in nodes},
+            'keys': [node['name'] for node in nodes],
+            'type': 'View'}
+
+
+def make_space(id_, name, parent, spaces=(), cells=(), itemspaces=()):
+    fullname = parent + '.' + name
+    namedid = fullname.split('.', 1)[1]
+    return {'id': id_, 'type': 'UserSpace', 'name': name,
+            'fullname': fullname, 'repr': name, 'namedid': namedid,
+            'parameters': None,
+            '_named_itemspaces': make_container(itemspaces),
+            'named_spaces': make_container(spaces),
+            'cells': make_container(cells),
+            'refs': make_container([])}
+
+
+def make_cells(id_, name, parent):
+    return {'id': id_, 'type': 'Cells', 'name': name,
+            'fullname': parent + '.' + name, 'repr': name,
+            'parameters': ('x',), '_is_derived': False, '__len__': 0}
+
+
+def make_model(spaces):
+    return {'id': 1, 'type': 'Model', 'name': 'M', 'fullname': 'M',
+            'repr': 'M', 'spaces': make_container(spaces),
+            'refs': make_container([])}
+
+
+def test_space_lists():
+
+    inner = make_space(4, 'C', 'M.S.B')
+    child = make_space(3, 'B', 'M.S', spaces=[inner])
+    model = make_model([make_space(2, 'S', 'M', spaces=[child])])
+
+    assert get_space_containers(model) == ['M', 'M.S', 'M.S.B', 'M.S.B.C']
+    assert get_child_spaces(model) == ['S', 'S.B', 'S.B.C']
+
+    # Unloaded spaces have the names of their child spaces
+    space = model['spaces']['items']['S']
+    space['named_spaces'] = ('B',)
+    assert get_space_containers(model) == ['M', 'M.S', 'M.S.B']
+    assert get_child_spaces(model) == ['S', 'S.B']
+    assert ModelItem(model).getChildSpaceList() == ['S', 'S.B']
+
+
+def test_item_children(qtmodeltester):
+
+    space = make_space(2, 'S', 'M', cells=[make_cells(10, 'foo', 'M.S')])
+    model = MxTreeModel(ModelItem(make_model([space])))
+    spaceitem = model.rootItem.child(0)
+    cellsitem = spaceitem.child(0)
+    assert cellsitem.childItems == ()
+    assert not hasattr(cellsitem, '__dict__')
+    with pytest.raises(AttributeError):
+        cellsitem.name
+
+    # Unloaded spaces get their child items by loadChildren
+    space['cells'] = ('foo',)
+    model = MxTreeModel(ModelItem(make_model([space])))
+    spaceitem = model.rootItem.child(0)
+    assert spaceitem.childItems == () and spaceitem.canFetchMore()
+
+    loaded = make_space(2, 'S', 'M', cells=[make_cells(10, 'foo', 'M.S')])
+    model.loadChildren(spaceitem, loaded)
+    assert [c.itemData['name'] for c in spaceitem.childItems] == ['foo']
+    qtmodeltester.check(model)
+
+
+def test_update_by_hashes(qtbot, qtmodeltester):
+
+    spaces = [make_space(2 + i, name, 'M', cells=[
+        make_cells(10 + i * 10 + j, c, 'M.' + name)
+        for j, c in enumerate(('foo', 'bar'))]) for i, name in enumerate('ST')]
+    old = make_model(spaces)
+    hash_tree(old)
+    model = MxTreeModel(ModelItem(old))
+    qtmodeltester.check(model)
+
+    new = copy.deepcopy(old)
+    new['spaces']['items']['T']['cells']['items']['bar']['__len__'] = 3
+    hash_tree(new)
+
+    # Rows of the unchanged branches are not compared
+    new['spaces']['items']['S']['repr'] = 'S(x)'
+
+    with qtbot.waitSignal(model.dataChanged) as blocker:
+        assert model.updateItem(QModelIndex(), ModelItem(new))
+
+    index = blocker.args[0]
+    assert index.internalPointer().itemData['fullname'] == 'M.T.bar'
+    assert model.data(index.sibling(index.row(), 4), Qt.DisplayRole) == '3'
+    assert model.data(model.index(0, 0, QModelIndex()), Qt.DisplayRole) == 'S'
+    assert not model.updateItem(QModelIndex(), ModelItem(new))
+    qtmodeltester.check(model)
+
+
+def make_cells_tree(names):
+    ids = {name: 10 + i for i, name in enumerate(sorted(names))}
+    return make_model([make_space(2, 'S', 'M', cells=[
+        make_cells(ids[name], name, 'M.S') for name in names])])
+
+
+def get_names(item):
+    return [child.itemData['name'] for child in item.childItems]
+
+
+def test_item_rows(qtmodeltester):
+
+    model = MxTreeModel(ModelItem(make_cells_tree(['a', 'b', 'c', 'd'])))
+    qtmodeltester.check(model)
+    space = model.rootItem.child(0)
+    sindex = model.index(0, 0, QModelIndex())
+
+    model.removeRows(1, 2, sindex)
+    assert get_names(space) == ['a', 'd']
+    assert [child.row() for child in space.childItems] == [0, 1]
+
+    model.beginInsertRows(sindex, 1, 2)
+    space.insertChildren(1, [CellsItem(make_cells(20 + i, name, 'M.S'))
+                             for i, name in enumerate('xy')])
+    model.endInsertRows()
+    assert get_names(space) == ['a', 'x', 'y', 'd']
+    assert [child.rowIndex for child in space.childItems] == [0, 1, 2, 3]
+
+    # Rows are renumbered if the child items are changed directly
+    space.childItems.reverse()
+    assert [child.row() for child in space.childItems] == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("count, moved", [(10, True), (100, False)])
+def test_reorder_children(qtmodeltester, count, moved):
+
+    names = ['c%d' % i for i in range(count)]
+    old = make_cells_tree(names)
+    model = MxTreeModel(ModelItem(old))
+    qtmodeltester.check(model)
+    space = model.rootItem.child(0)
+    sindex = model.index(0, 0, QModelIndex())
+    cells = space.child(3)
+    persistent = QPersistentModelIndex(model.index(3, 0, sindex))
+
+    signals = []
+    model.rowsMoved.connect(lambda *args: signals.append('moved'))
+    model.layoutChanged.connect(lambda *args: signals.append('layout'))
+    model.rowsInserted.connect(lambda *args: signals.append('inserted'))
+    model.rowsRemoved.connect(lambda *args: signals.append('removed'))
+
+    new = make_cells_tree(names[::-1])
+    model.applyChanges(get_tree_delta(old, new))
+
+    assert get_names(space) == names[::-1]
+    assert space.child(count - 4) is cells
+    assert QModelIndex(persistent).internalPointer() is cells
+    assert persistent.row() == count - 4
+    if moved:
+        assert set(signals) == {'moved'}
+        assert len(signals) <= MAX_MOVE_SIGNALS
+    else:
+        assert signals == ['layout']
+
+
+def test_apply_changes(qtbot, qtmodeltester):
+
+    old = make_cells_tree(['a', 'b', 'c'])
+    model = MxTreeModel(ModelItem(old))
+    qtmodeltester.check(model)
+    space = model.rootItem.child(0)
+    kept = space.childItems[:]
+
+    # Items are matched by their keys and ids
+    new = make_cells_tree(['a', 'c', 'd'])
+    new['spaces']['items']['S']['cells']['items']['c']['id'] = 12
+    new['spaces']['items']['S']['cells']['items']['a']['__len__'] = 5
+    changed = []
+    model.dataChanged.connect(
+        lambda topLeft, bottomRight: changed.append(
+            topLeft.internalPointer().itemData['name']))
+    model.applyChanges(get_tree_delta(old, new))
+
+    assert get_names(space) == ['a', 'c', 'd']
+    assert space.child(0) is kept[0] and space.child(1) is kept[2]
+    assert changed == ['a']
+    assert model.data(model.index(0, 4, model.index(0, 0, QModelIndex())),
+                      Qt.DisplayRole) == '5'
+
+    # The rows of the parents are emitted for their attributes changes
+    model.applyChanges([('attrs', ('spaces', 'S'), dict(
+        space.getAttrs(), repr='S(x)'))])
+    assert model.rootItem.itemData['spaces']['items']['S']['repr'] == 'S(x)'
+    assert changed == ['a', 'S']
+
+
+def make_itemspaces_tree(count):
+    itemspaces = []
+    for i in range(count):
+        space = make_space(100 + i, '__Space%d' % i, 'M.S')
+        space['argvalues'] = (i, 'x')
+        itemspaces.append(space)
+    model = make_model([make_space(2, 'S', 'M', itemspaces=itemspaces)])
+    model['spaces']['items']['S']['parameters'] = ('i', 'j')
+    return model
+
+
+def test_itemspace_pages(qtmodeltester):
+
+    count = ITEMSPACE_PAGE_SIZE * 2 + 10
+    old = make_itemspaces_tree(count)
+    model = MxTreeModel(ModelItem(old))
+    sindex = model.index(0, 0, QModelIndex())
+    index = model.index(0, 0, sindex)
+    item = model.getItem(index)
+    assert isinstance(item, ItemSpaceMapItem)
+    assert model.data(index.sibling(0, 4), Qt.DisplayRole) == str(count)
+    assert model.data(index.sibling(0, 2), Qt.DisplayRole) == 'i, j'
+    assert model.rowCount(index) == ITEMSPACE_PAGE_SIZE
+    assert model.canFetchMore(index)
+
+    model.fetchMore(index)
+    assert model.rowCount(index) == ITEMSPACE_PAGE_SIZE * 2
+
+    # The pages shown are kept as the item spaces change
+    new = make_itemspaces_tree(count + 1)
+    model.applyChanges(get_tree_delta(old, new))
+    assert model.rowCount(index) == ITEMSPACE_PAGE_SIZE * 2
+    assert model.data(index.sibling(0, 4), Qt.DisplayRole) == str(count + 1)
+
+    model.fetchMore(index)
+    assert model.rowCount(index) == count + 1
+    assert not model.canFetchMore(index)
+    qtmodeltester.check(model)
+
+
+def test_seek_itemspace(qtmodeltester):
+
+    model = MxTreeModel(ModelItem(
+        make_itemspaces_tree(ITEMSPACE_PAGE_SIZE * 2)))
+    index = model.index(0, 0, model.index(0, 0, QModelIndex()))
+    item = model.getItem(index)
+
+    assert item.findItemSpace((3,)) == '__Space3'
+    assert item.findItemSpace((3, 'x')) == '__Space3'
+    assert item.findItemSpace((3, 'y')) is None
+
+    # Item spaces not in the pages are shown after them
+    key = '__Space%d' % (ITEMSPACE_PAGE_SIZE + 5)
+    found = model.seekItemSpace(index, (ITEMSPACE_PAGE_SIZE + 5,))
+    assert found.row() == ITEMSPACE_PAGE_SIZE
+    assert found.internalPointer().itemData['name'] == key
+    assert model.rowCount(index) == ITEMSPACE_PAGE_SIZE + 1
+
+    found = model.seekItemSpace(index, (5,))
+    assert found.row() == 5
+    assert model.rowCount(index) == ITEMSPACE_PAGE_SIZE + 1
+    assert model.seekItemSpace(index, (-1,)) is None
+
+    # The sought item spaces are shown once in the next pages
+    model.fetchMore(index)
+    assert model.rowCount(index) == ITEMSPACE_PAGE_SIZE * 2
+    assert [child.itemData['name'] for child in item.childItems].count(
+        key) == 1
+    qtmodeltester.check(model)
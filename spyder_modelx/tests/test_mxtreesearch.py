@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+from qtpy.QtCore import QModelIndex
+from qtpy.QtWidgets import QTreeView
+
+from spyder_modelx.tests.test_mxtreemodel import (
+    make_cells, make_space, make_model)
+from spyder_modelx.widgets.mxtreemodel import MxTreeModel, ModelItem
+from spyder_modelx.widgets.mxtreesearch import MxTreeSearch, MxTreeFilterProxy
+
+
+def make_tree():
+    # S1 is loaded and S2 is not
+    s1 = make_space(2, 'S1', 'M', cells=[make_cells(10, 'foo', 'M.S1')])
+    s2 = make_space(3, 'S2', 'M', cells=[make_cells(20, 'foo', 'M.S2')])
+    s2['cells'] = ('foo',)
+    return make_model([s1, s2])
+
+
+def get_fullnames(search, ids):
+    return sorted(search.items[key].itemData['fullname']
+                  for key in ids if key in search.items)
+
+
+def test_proxy_does_not_fetch(qtbot, qtmodeltester):
+
+    model = MxTreeModel(ModelItem(make_tree()))
+    fetched = []
+    model.sig_fetch_requested.connect(fetched.append)
+
+    search = MxTreeSearch(model)
+    proxy = MxTreeFilterProxy()
+    proxy.setSourceModel(model)
+    view = QTreeView()
+    qtbot.addWidget(view)
+    view.setModel(proxy)
+
+    proxy.setAccepted(search.search('S'))
+    view.expandAll()
+    assert not fetched
+    assert proxy.rowCount(QModelIndex()) == 2
+    s2 = proxy.index(1, 0, QModelIndex())
+    assert not proxy.hasChildren(s2)
+    assert model.hasChildren(proxy.mapToSource(s2))
+    qtmodeltester.check(proxy)
+
+
+def test_index_signals(qtbot):
+
+    model = MxTreeModel(ModelItem(make_tree()))
+    search = MxTreeSearch(model)
+
+    # Full names are indexed
+    found = search.search('s1.foo')
+    assert get_fullnames(search, found) == ['M.S1', 'M.S1.foo']
+    assert search.search('s2.foo') == set()
+
+    # Rows inserted
+    s2 = model.rootItem.child(1)
+    loaded = make_space(3, 'S2', 'M', cells=[make_cells(20, 'foo', 'M.S2')])
+    with qtbot.waitSignal(search.sig_index_changed):
+        model.loadChildren(s2, loaded)
+    assert get_fullnames(search, search.search('s2.foo')) == [
+        'M.S2', 'M.S2.foo']
+
+    # Data changed
+    attrs = dict(make_cells(20, 'foo', 'M.S2'), fullname='M.S2.bar')
+    with qtbot.waitSignal(search.sig_index_changed):
+        model.applyChanges([('attrs', ('spaces', 'S2', 'cells', 'foo'), attrs)])
+    assert search.search('s2.foo') == set()
+    assert get_fullnames(search, search.search('s2.bar')) == [
+        'M.S2', 'M.S2.bar']
+
+    # Rows removed
+    with qtbot.waitSignal(search.sig_index_changed):
+        model.applyChanges(
+            [('items', ('spaces', 'S2'), 'cells', {}, [], {})])
+    assert search.search('s2.bar') == set()
+    assert 'M.S2' in get_fullnames(search, search.items)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import random
+import pytest
+
+from spyder_modelx.utility.nameindex import NameIndex
+
+
+@pytest.fixture
+def index():
+    index = NameIndex()
+    for key, name in enumerate(
+            ['Premium', 'claims', 'PV_Premium', 'x', 'Space1', 'premium']):
+        index.add(key, name)
+    return index
+
+
+@pytest.mark.parametrize("text, keys", [
+    ("prem", {0, 2, 5}),
+    ("PREMIUM", {0, 2, 5}),
+    ("pv_", {2}),
+    ("m", {0, 1, 2, 5}),
+    ("x", {3}),
+    ("cla", {1}),
+    ("claimsx", set()),
+    ("", {0, 1, 2, 3, 4, 5})
+])
+def test_search(index, text, keys):
+    assert index.search(text) == keys
+
+
+def test_remove(index):
+    index.remove(0)
+    index.remove(5)
+    index.remove(99)
+    assert index.search("prem") == {2}
+    assert 0 not in index
+    assert len(index) == 4
+
+    index.remove(2)
+    assert index.search("prem") == set()
+    assert not index._grams.get("pre")
+
+
+def test_rename(index):
+    index.add(1, "premium2")
+    assert index.search("prem") == {0, 1, 2, 5}
+    assert index.search("claims") == set()
+
+
+def test_search_random():
+
+    rand = random.Random(0)
+    names = {}
+    index = NameIndex()
+    for _ in range(500):
+        key = rand.randrange(100)
+        if rand.random() < 0.3:
+            names.pop(key, None)
+            index.remove(key)
+        else:
+            names[key] = ''.join(rand.choice('abc') for _ in range(
+                rand.randint(1, 6)))
+            index.add(key, names[key])
+
+    for text in ['a', 'ab', 'abc', 'bca', 'abca', 'cc']:
+        assert index.search(text) == {
+            key for key, name in names.items() if text in name}
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+from spyder_modelx.utility.projection import project_attrdict
+
+
+def test_project_attrdict():
+
+    cells = {'type': 'Cells', 'name': 'foo', 'formula': 'def foo(): pass'}
+    space = {'type': 'UserSpace', 'name': 'S', 'bases': [],
+             'cells': {'type': 'CellsView', 'items': {'foo': cells}}}
+
+    fields = {'UserSpace': ['type', 'name', 'cells'],
+              'Cells': ['type', 'name']}
+
+    assert project_attrdict(space, fields) == {
+        'type': 'UserSpace', 'name': 'S',
+        'cells': {'type': 'CellsView',
+                  'items': {'foo': {'type': 'Cells', 'name': 'foo'}}}}
+
+    # Types not in fields are kept whole
+    assert project_attrdict(space, {'Cells': ['name']})['bases'] == []
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+from spyder_modelx.utility.requestqueue import (
+    RequestQueue, PRIORITY_EDIT, PRIORITY_VISIBLE, PRIORITY_PREFETCH)
+
+
+def test_requestqueue():
+
+    queue = RequestQueue()
+    queue.push('prefetch', PRIORITY_PREFETCH)
+    queue.push('visible1', PRIORITY_VISIBLE)
+    queue.push('edit', PRIORITY_EDIT)
+    queue.push('visible2', PRIORITY_VISIBLE)
+
+    result = []
+    while queue:
+        result.append(queue.pop())
+
+    assert result == ['edit', 'visible1', 'visible2', 'prefetch']
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import csv
+import pytest
+
+from spyder_modelx.utility.rpcstats import RpcStats, get_size
+
+
+def test_rpcstats():
+
+    stats = RpcStats(maxlen=3)
+    stats.record('mx_get_snapshot', 'modeltree', 0.2, 10, 100)
+    stats.record('mx_get_snapshot', 'modeltree', 0.1, 10, 200)
+    stats.record('mx_get_snapshot', 'modeltree', 0.3, 10, 300)
+    stats.record('mx_del_object', 'explorer', None, 20, 0, is_error=True)
+
+    # The oldest record is dropped
+    assert len(stats.records) == 3
+
+    del_object, snapshot = stats.summarize()
+    assert snapshot.calls == 2
+    assert (snapshot.p50, snapshot.p95) == (0.1, 0.3)
+    assert snapshot.reply_bytes == 500
+    assert del_object.errors == 1 and del_object.p50 is None
+
+    f = io.StringIO()
+    stats.write_csv(f)
+    rows = list(csv.reader(io.StringIO(f.getvalue())))
+    assert rows[0][1:3] == ['method', 'origin']
+    assert len(rows) == 4
+
+
+def test_get_size():
+    assert get_size(b'abc') == 3
+    assert get_size(('abc', {'a': b'xy'})) == 6
+
+
+def test_get_latency():
+
+    stats = RpcStats()
+    assert stats.get_latency('mx_get_snapshot', 95) is None
+
+    for i in range(1, 21):
+        stats.record('mx_get_snapshot', None, i / 10, 0, 0)
+
+    assert stats.get_latency('mx_get_snapshot', 95) == 1.9
+
+
+@pytest.mark.parametrize("latencies, timeout", [
+    ((), 30),
+    ((0.1,), 30),
+    ((8.2,), 33),       # 4 * 8.2 = 32.8 rounded up
+    ((1000,), 600),
+])
+def test_get_timeout(latencies, timeout):
+
+    stats = RpcStats()
+    for latency in latencies:
+        stats.record('mx_get_snapshot', None, latency, 0, 0)
+
+    result = stats.get_timeout('mx_get_snapshot', 30, 4, 600)
+    assert result == timeout
+    assert type(result) is int
+
+
+def test_no_latency_recorded():
+
+    # Calls without replies, such as given up ones, are not latencies
+    stats = RpcStats()
+    stats.record('mx_get_snapshot', None, None, 0, 0, is_error=True)
+    assert stats.get_latency('mx_get_snapshot', 95) is None
+    assert stats.get_timeout('mx_get_snapshot', 30, 4, 600) == 30
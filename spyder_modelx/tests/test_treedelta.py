@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import pytest
+
+from spyder_modelx.utility.treedelta import (
+    get_tree_delta, apply_tree_delta, get_node, get_loaded, prune_tree,
+    find_paths, hash_tree, HASH_KEY)
+
+
+def make_node(id_, name, **containers):
+    node = {'id': id_, 'name': name, 'fullname': name, 'repr': name}
+    for key, items in containers.items():
+        node[key] = {'items': {item['name']: item for item in items},
+                     'keys': [item['name'] for item in items],
+                     'type': 'View'}
+    return node
+
+
+def make_tree(cells=('foo', 'bar'), refs=('x',), space_id=2):
+    cellslist = [make_node(10 + i, c) for i, c in enumerate(cells)]
+    reflist = [make_node(20 + i, r) for i, r in enumerate(refs)]
+    space = make_node(space_id, 'S', cells=cellslist, refs=reflist)
+    return make_node(1, 'M', spaces=[space], refs=[])
+
+
+@pytest.mark.parametrize("new", [
+    make_tree(),
+    make_tree(cells=('foo',)),
+    make_tree(cells=('bar', 'foo')),
+    make_tree(cells=('foo', 'bar', 'baz')),
+    make_tree(refs=()),
+    make_tree(space_id=3)
+])
+def test_apply_delta(new):
+
+    old = make_tree()
+    tree = copy.deepcopy(old)
+    space = get_node(tree, ('spaces', 'S'))
+
+    changes = get_tree_delta(old, new)
+    assert apply_tree_delta(tree, changes) == new
+
+    if new == old:
+        assert not changes
+
+    if new['spaces']['items']['S']['id'] == old['spaces']['items']['S']['id']:
+        # Nodes are updated in place
+        assert get_node(tree, ('spaces', 'S')) is space
+
+
+def test_attrs_change():
+
+    old = make_tree()
+    new = make_tree()
+    new['spaces']['items']['S']['cells']['items']['foo']['repr'] = 'foo(x)'
+
+    changes = get_tree_delta(old, new)
+    assert changes == [('attrs', ('spaces', 'S', 'cells', 'foo'),
+                        {'id': 10, 'name': 'foo', 'fullname': 'foo',
+                         'repr': 'foo(x)'})]
+
+
+def test_hash_delta():
+
+    old = make_tree(cells=('foo', 'bar', 'baz'))
+    new = make_tree(cells=('foo', 'bar', 'baz'))
+    assert hash_tree(old) == hash_tree(new)
+    assert get_tree_delta(old, new) == []
+
+    new['spaces']['items']['S']['cells']['items']['foo']['repr'] = 'foo(x)'
+    assert hash_tree(old) != hash_tree(new)
+
+    # Unchanged branches are compared only by the hashes
+    bar = get_node(old, ('spaces', 'S', 'cells', 'bar'))
+    bar['repr'] = 'bar(y)'
+    changes = get_tree_delta(old, new)
+    assert [change[1] for change in changes] == [
+        ('spaces', 'S', 'cells', 'foo')]
+    assert HASH_KEY not in changes[0][2]
+
+    # The hashes of the changed node and its ancestors are removed
+    apply_tree_delta(old, changes)
+    assert HASH_KEY not in old
+    assert HASH_KEY not in get_node(old, ('spaces', 'S'))
+    assert HASH_KEY not in get_node(old, ('spaces', 'S', 'cells', 'foo'))
+    assert HASH_KEY in get_node(old, ('spaces', 'S', 'cells', 'baz'))
+
+    # Nodes without the hashes are compared by their contents
+    bar['repr'] = 'bar'
+    new['spaces']['items']['S']['cells']['items']['baz']['repr'] = 'baz(z)'
+    hash_tree(new)
+    assert get_tree_delta(old, new) == [
+        ('attrs', ('spaces', 'S', 'cells', 'baz'),
+         {'id': 12, 'name': 'baz', 'fullname': 'baz', 'repr': 'baz(z)'})]
+
+
+def test_load_children():
+
+    full = make_tree()
+    tree = prune_tree(copy.deepcopy(full), set())
+
+    assert get_node(tree, ('spaces', 'S'))['cells'] == ('foo', 'bar')
+    assert get_loaded(tree) == set()
+
+    space = get_node(tree, ('spaces', 'S'))
+    changes = get_tree_delta(space, get_node(full, ('spaces', 'S')),
+                             ('spaces', 'S'))
+    assert apply_tree_delta(tree, changes) == full
+    assert get_loaded(tree) == {'S'}
+
+
+def test_prune_unloaded():
+
+    full = make_tree()
+    unloaded = {}
+    tree = prune_tree(copy.deepcopy(full), set(), unloaded)
+
+    assert list(unloaded) == ['S']
+    assert unloaded['S'] == get_node(full, ('spaces', 'S'))
+
+    # The stored node loads the children of the pruned one
+    space = get_node(tree, ('spaces', 'S'))
+    changes = get_tree_delta(space, prune_tree(unloaded.pop('S'), set()),
+                             ('spaces', 'S'))
+    assert apply_tree_delta(tree, changes) == full
+
+
+def test_find_paths():
+
+    tree = make_tree()
+    assert find_paths(tree, {'S', 'bar', 'y'}) == {
+        'S': ('spaces', 'S'), 'bar': ('spaces', 'S', 'cells', 'bar')}
+
+    prune_tree(tree, set())
+    assert find_paths(tree, {'S', 'bar'}) == {'S': ('spaces', 'S')}
+
+
+@pytest.mark.parametrize("values", [(-1, -2), (1, 1.0, True), (0, False)])
+def test_hash_collision(values):
+
+    hashes = set()
+    for value in values:
+        tree = make_tree(cells=('foo',))
+        tree['spaces']['items']['S']['cells']['items']['foo']['value'] = value
+        hashes.add(hash_tree(tree))
+    assert len(hashes) == len(values)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cache of attrdicts in the client
+
+``mx_get_versions`` of the kernel returns a dict mapping the names of
+the models to their versions, which the kernel increments
+when the models may have changed. The attrdicts returned by
+``mx_get_attrdict`` are cached with the versions of their models,
+and discarded when the versions change.
+
+The versions are known to be current only from when they are received
+until the kernel runs code again, so :meth:`AttrDictCache.expire`
+is called when the kernel state changes, and no entries are returned
+until new versions are received. The generation given to
+:meth:`AttrDictCache.set_versions` and :meth:`AttrDictCache.put`
+is the value of :attr:`AttrDictCache.generation` when the request is
+sent, so that replies to requests sent before the expiry are ignored.
+"""
+
+from collections import OrderedDict
+
+
+def get_model_name(fullname):
+    return fullname.split('.', 1)[0]
+
+
+class AttrDictCache:
+    """LRU cache of attrdicts tagged with the versions of their models
+
+    The keys are the kwargs of ``mx_get_attrdict``.
+    The cached attrdicts are shared and must not be modified.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.versions = None    # None while the versions are not known
+        self.generation = 0
+
+    @staticmethod
+    def get_key(kwargs):
+        """Get the key from kwargs, or None if kwargs is not cached"""
+        fullname = kwargs.get('fullname')
+        if not fullname or kwargs.get('recursive'):
+            return None
+
+        attrs = kwargs.get('attrs')
+        fields = kwargs.get('fields')
+        return (
+            fullname,
+            tuple(attrs) if attrs is not None else None,
+            tuple(sorted((k, tuple(v)) for k, v in fields.items()))
+            if fields is not None else None
+        )
+
+    def expire(self, model=None):
+        """Mark the versions unknown
+
+        If model is given, the entries of the model are also removed.
+        """
+        self.versions = None
+        self.generation += 1
+        if model is not None:
+            for key in [key for key in self.entries
+                        if get_model_name(key[0]) == model]:
+                del self.entries[key]
+
+    def set_versions(self, versions, generation):
+        """Set the current versions and remove outdated entries"""
+        if generation != self.generation:
+            return
+        self.versions = dict(versions)
+        for key, (version, _) in list(self.entries.items()):
+            if self.versions.get(get_model_name(key[0])) != version:
+                del self.entries[key]
+
+    def get(self, kwargs):
+        """Get the attrdict for kwargs or raise KeyError"""
+        key = self.get_key(kwargs)
+        if key is None or self.versions is None:
+            raise KeyError(key)
+
+        version, value = self.entries[key]
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, kwargs, value, generation):
+        key = self.get_key(kwargs)
+        if (key is None or self.versions is None
+                or generation != self.generation):
+            return
+
+        version = self.versions.get(get_model_name(key[0]))
+        if version is None:
+            return
+
+        self.entries[key] = (version, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Differences between lists of unique keys
+
+The differences are given as the operations on the rows of
+``QAbstractItemModel``, so that the rows of a tree item are matched with
+its new children by as few signals as possible.
+The removed and inserted rows are grouped into runs of consecutive rows.
+The moves keep in place the longest increasing subsequence of
+the rows in the new order, and move the other rows by blocks.
+"""
+
+import bisect
+
+
+def get_runs(rows):
+    """Group sorted rows into a list of pairs of start and count"""
+    runs = []
+    for row in rows:
+        if runs and runs[-1][0] + runs[-1][1] == row:
+            runs[-1][1] += 1
+        else:
+            runs.append([row, 1])
+    return [tuple(run) for run in runs]
+
+
+def get_lis(seq):
+    """Return the indexes of a longest increasing subsequence of seq"""
+    tails = []      # Last values of the subsequences by their lengths
+    tail_indexes = []
+    prev = [None] * len(seq)
+    for i, value in enumerate(seq):
+        n = bisect.bisect_left(tails, value)
+        if n == len(tails):
+            tails.append(value)
+            tail_indexes.append(i)
+        else:
+            tails[n] = value
+            tail_indexes[n] = i
+        prev[i] = tail_indexes[n - 1] if n else None
+
+    result = []
+    i = tail_indexes[-1] if tail_indexes else None
+    while i is not None:
+        result.append(i)
+        i = prev[i]
+    result.reverse()
+    return result
+
+
+def move_items(items, index_to, index_from, length):
+    """Move length items at index_from to before index_to
+
+    index_to is given as ``destinationChild`` of
+    ``QAbstractItemModel.beginMoveRows``, i.e. the row before the move.
+    Return the range of the changed indexes.
+    """
+    block = items[index_from:index_from + length]
+    if index_to < index_from:
+        items[index_to:index_from + length] = (
+            block + items[index_to:index_from])
+        return index_to, index_from + length
+    else:
+        items[index_from:index_to] = (
+            items[index_from + length:index_to] + block)
+        return index_from, index_to
+
+
+def get_moves(source, target, limit=None):
+    """Return the moves to reorder source into target
+
+    source and target must have the same unique keys.
+    The moves are triples of the arguments to :func:`move_items`,
+    to be applied in order. If more than limit moves are needed,
+    None is returned.
+    """
+    positions = {key: i for i, key in enumerate(source)}
+    stable = set(target[i] for i in get_lis(
+        [positions[key] for key in target]))
+
+    current = list(source)
+    moves = []
+    i = len(target) - 1
+    while i >= 0:
+        if target[i] in stable:
+            i -= 1
+            continue
+
+        # Find the run of the unstable keys ending at i
+        # in the same order in the current list
+        j = i
+        while (j > 0 and target[j - 1] not in stable
+               and positions[target[j - 1]] == positions[target[j]] - 1):
+            j -= 1
+
+        first = positions[target[j]]
+        length = i - j + 1
+        if i + 1 < len(target):
+            dest = positions[target[i + 1]]
+        else:
+            dest = len(current)
+
+        if dest != first + length:
+            if limit is not None and len(moves) == limit:
+                return None
+            moves.append((dest, first, length))
+            start, stop = move_items(current, dest, first, length)
+            for k in range(start, stop):
+                positions[current[k]] = k
+        i = j - 1
+
+    return moves
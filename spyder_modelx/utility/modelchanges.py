@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Changes of models notified by the kernel
+
+Kernels supporting notifications reply True to
+``mx_subscribe_changes()``, and then call the handler
+``mx_models_changed`` of the client over the Spyder comm with
+a list of ``(model, kind, objects)`` tuples, where ``model`` is
+the name of the model, ``objects`` is the list of the full names of
+the changed objects, and ``kind`` is one of:
+
+``'new'``
+    The objects are created. ``objects`` is ``[model]``
+    for a new model.
+``'delete'``
+    The objects are deleted. ``objects`` is ``[model]``
+    for a deleted model.
+``'formula'``
+    The formulas of the objects are changed.
+``'clear'``
+    The values of the objects are cleared, including the values
+    cleared because the objects depend on other changed objects.
+``'values'``
+    The objects have new values calculated.
+
+The kernel sends the changes made by each execution or call of
+the kernel methods in one message after it finishes, so that
+a calculation of many values results in one small message.
+The kernel must be subscribed again when it is restarted.
+"""
+
+KINDS = NEW, DELETE, FORMULA, CLEAR, VALUES = (
+    'new', 'delete', 'formula', 'clear', 'values')
+
+STRUCTURAL = {NEW, DELETE}
+
+
+def get_ancestors(fullname):
+    """Get the full names of the parents of fullname from the model"""
+    names = fullname.split('.')
+    return ['.'.join(names[:i]) for i in range(1, len(names))]
+
+
+class ModelChanges:
+    """Accumulated changes notified by the kernel"""
+
+    def __init__(self):
+        self.models = {}    # model -> set of kinds
+        self.objects = {}   # fullname -> set of kinds
+
+    def __bool__(self):
+        return bool(self.models)
+
+    def add(self, model, kind, objects):
+        self.models.setdefault(model, set()).add(kind)
+        for fullname in objects:
+            self.objects.setdefault(fullname, set()).add(kind)
+
+    def update(self, changes):
+        for model, kind, objects in changes:
+            self.add(model, kind, objects)
+
+    def take(self):
+        """Return the changes and clear them"""
+        result = ModelChanges()
+        result.models, self.models = self.models, {}
+        result.objects, self.objects = self.objects, {}
+        return result
+
+    def is_structural(self, model=None):
+        """Check if objects are created or deleted in model or any model"""
+        if model is None:
+            return any(kinds & STRUCTURAL for kinds in self.models.values())
+        return bool(self.models.get(model, set()) & STRUCTURAL)
+
+    def is_changed(self, fullname, kinds=None):
+        """Check if the object or its parents are changed by kinds
+
+        Objects not notified can be changed by the creation or
+        deletion of their parents, and new formulas or values of
+        other objects in the same model can change their values.
+        Only changes that are notified for the object itself or
+        its parents are reported here.
+        """
+        return any(
+            name in self.objects
+            and (kinds is None or self.objects[name] & set(kinds))
+            for name in get_ancestors(fullname) + [fullname])
+
+    def get_objects(self, model, kinds=None):
+        """Get the full names of the changed objects in model"""
+        prefix = model + '.'
+        return sorted(
+            name for name, obj_kinds in self.objects.items()
+            if (name == model or name.startswith(prefix))
+            and (kinds is None or obj_kinds & set(kinds)))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Index of names searched by substrings
+
+:class:`NameIndex` maps keys to names, and finds the keys whose names
+contain a text, ignoring case. The distinct names are indexed by their
+trigrams, as many objects in a model share the same names, such as
+the cells of the spaces created from the same base space.
+A text of three or more characters is searched among the names
+having all its trigrams. Shorter texts are searched among all
+the distinct names.
+"""
+
+
+def get_trigrams(name):
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+class NameIndex:
+    """Index of the names of keys updated by adding and removing keys"""
+
+    def __init__(self):
+        self._keys = {}     # key -> name
+        self._names = {}    # name -> set of keys
+        self._grams = {}    # trigram -> set of names
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def add(self, key, name):
+        """Add key with name, replacing the name if key is added"""
+        name = name.lower()
+        if key in self._keys:
+            if self._keys[key] == name:
+                return
+            self.remove(key)
+
+        self._keys[key] = name
+        keys = self._names.get(name)
+        if keys is None:
+            keys = self._names[name] = set()
+            for gram in get_trigrams(name):
+                self._grams.setdefault(gram, set()).add(name)
+        keys.add(key)
+
+    def remove(self, key):
+        """Remove key if it is added"""
+        name = self._keys.pop(key, None)
+        if name is None:
+            return
+
+        keys = self._names[name]
+        keys.discard(key)
+        if not keys:
+            del self._names[name]
+            for gram in get_trigrams(name):
+                names = self._grams[gram]
+                names.discard(name)
+                if not names:
+                    del self._grams[gram]
+
+    def clear(self):
+        self._keys.clear()
+        self._names.clear()
+        self._grams.clear()
+
+    def search(self, text):
+        """Return the set of the keys whose names contain text"""
+        text = text.lower()
+        if len(text) < 3:
+            names = [name for name in self._names if text in name]
+        else:
+            postings = []
+            for gram in get_trigrams(text):
+                names = self._grams.get(gram)
+                if not names:
+                    return set()
+                postings.append(names)
+            postings.sort(key=len)
+            names = postings[0].intersection(*postings[1:])
+            if len(text) > 3:
+                names = [name for name in names if text in name]
+
+        result = set()
+        for name in names:
+            result.update(self._names[name])
+        return result
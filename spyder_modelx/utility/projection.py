@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Field projection of attrdicts
+
+``fields`` given to ``mx_get_attrdict`` maps the type names of objects,
+such as ``'UserSpace'`` and ``'Cells'``, to the lists of the keys
+to keep in their attrdicts. The attrdicts of the types not in ``fields``
+are kept whole. The kernel applies the projection to all the attrdicts
+it returns, including the ones of child objects.
+"""
+
+from spyder_modelx.utility.treedelta import is_container
+
+
+def project_attrdict(data, fields):
+    """Return a copy of attrdict data with only the fields of its type"""
+    if not isinstance(data, dict):
+        return data
+
+    keys = fields.get(data.get('type'))
+    result = {}
+    for k, v in data.items():
+        if keys is not None and k not in keys:
+            continue
+        if is_container(v):
+            v = dict(v, items={name: project_attrdict(item, fields)
+                               for name, item in v['items'].items()})
+        result[k] = v
+
+    return result
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Queue of requests to the kernel by priority
+
+The requests are taken in the order of the priority classes below,
+and in the order of arrival in each class.
+
+:data:`PRIORITY_EDIT`
+    Requests following edits made by the user.
+:data:`PRIORITY_VISIBLE`
+    Refreshes of the widgets shown to the user.
+:data:`PRIORITY_PREFETCH`
+    Requests in background whose results are not waited for.
+"""
+
+import heapq
+import itertools
+
+PRIORITIES = PRIORITY_EDIT, PRIORITY_VISIBLE, PRIORITY_PREFETCH = range(3)
+
+
+class RequestQueue:
+
+    def __init__(self):
+        self._heap = []
+        self._count = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, request, priority=PRIORITY_VISIBLE):
+        heapq.heappush(self._heap, (priority, next(self._count), request))
+
+    def pop(self):
+        """Remove and return the next request or raise IndexError"""
+        return heapq.heappop(self._heap)[2]
+
+    def clear(self):
+        self._heap.clear()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Statistics of the calls to the kernel
+
+:class:`RpcStats` keeps the last :data:`MAX_RECORDS` calls to
+the ``mx_*`` methods of the kernel in a ring buffer.
+Each record has the method, the widget that triggered the call,
+the time from sending the call to receiving the reply, and
+the sizes of the arguments and the reply.
+
+The sizes are estimated by :func:`get_size` without pickling
+the values again. Bytes, such as the pickled replies of the kernel,
+are counted by their lengths and other values by their contents,
+so the sizes are close to the sizes of the messages.
+
+The last :data:`LATENCY_SAMPLES` latencies of each method are also kept
+to adapt the timeouts of the calls to the observed latencies.
+"""
+
+import csv
+import math
+import pickle
+import time
+from collections import deque, namedtuple
+
+MAX_RECORDS = 10000
+LATENCY_SAMPLES = 100
+
+RpcRecord = namedtuple(
+    'RpcRecord',
+    ['time', 'method', 'origin', 'latency',
+     'request_bytes', 'reply_bytes', 'is_error'])
+
+RpcSummary = namedtuple(
+    'RpcSummary',
+    ['method', 'origin', 'calls', 'errors', 'p50', 'p95',
+     'request_bytes', 'reply_bytes'])
+
+_SCALAR_SIZE = 8
+
+
+def get_size(value):
+    """Estimate the size of value in a message in bytes"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return _SCALAR_SIZE
+    elif isinstance(value, (bytes, bytearray)):
+        return len(value)
+    elif isinstance(value, memoryview):
+        return value.nbytes
+    elif isinstance(value, str):
+        return len(value.encode('utf-8', 'replace'))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        return sum(get_size(v) for v in value)
+    elif isinstance(value, dict):
+        return sum(get_size(k) + get_size(v) for k, v in value.items())
+    else:
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return 0
+
+
+def get_percentile(values, percent):
+    """Get the percentile of sorted values by the nearest-rank method"""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+class RpcStats:
+    """Ring buffer of the records of the calls to the kernel"""
+
+    def __init__(self, maxlen=MAX_RECORDS):
+        self.records = deque(maxlen=maxlen)
+        self.latencies = {}
+
+    def record(self, method, origin, latency, request_bytes, reply_bytes,
+               is_error=False):
+        """Add a record
+
+        ``latency`` is in seconds, or None if the call has no reply.
+        """
+        self.records.append(RpcRecord(
+            time.time(), method, origin, latency,
+            request_bytes, reply_bytes, is_error))
+
+        if latency is not None:
+            self.latencies.setdefault(
+                method, deque(maxlen=LATENCY_SAMPLES)).append(latency)
+
+    def clear(self):
+        self.records.clear()
+        self.latencies.clear()
+
+    def get_latency(self, method, percent):
+        """Get the percentile of the recent latencies of method or None
+
+        The latencies of the calls replied with errors are included,
+        and the calls given up without replies are not.
+        """
+        return get_percentile(
+            sorted(self.latencies.get(method, ())), percent)
+
+    def get_timeout(self, method, minimum, factor, maximum):
+        """Get the timeout of method in seconds adapted to its latencies
+
+        The timeout is factor times the 95th percentile of the latencies,
+        but not less than minimum or more than maximum. It is minimum
+        if no latencies are recorded. The timeout is rounded up to an int,
+        as Spyder passes it multiplied by 1000 to ``QTimer.start``,
+        which takes only ints.
+        """
+        latency = self.get_latency(method, 95)
+        if latency is None:
+            timeout = minimum
+        else:
+            timeout = min(max(minimum, factor * latency), maximum)
+        return int(math.ceil(timeout))
+
+    def summarize(self):
+        """Get :class:`RpcSummary` by method and origin
+
+        The latencies are in seconds and the sizes are the totals.
+        """
+        groups = {}
+        for rec in self.records:
+            groups.setdefault((rec.method, rec.origin), []).append(rec)
+
+        result = []
+        for (method, origin), recs in sorted(
+                groups.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            latencies = sorted(
+                rec.latency for rec in recs if rec.latency is not None)
+            result.append(RpcSummary(
+                method, origin, len(recs),
+                sum(1 for rec in recs if rec.is_error),
+                get_percentile(latencies, 50),
+                get_percentile(latencies, 95),
+                sum(rec.request_bytes for rec in recs),
+                sum(rec.reply_bytes for rec in recs)))
+
+        return result
+
+    def write_csv(self, file):
+        """Write the records to a file object as CSV"""
+        writer = csv.writer(file)
+        writer.writerow(RpcRecord._fields)
+        for rec in self.records:
+            writer.writerow(rec)
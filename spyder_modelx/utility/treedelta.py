@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Changes between model trees
+
+A model tree is the nested dict returned by ``mx_get_attrdict``
+with ``recursive=True``. The child objects of a node are held in
+containers, which are the values of the node that are dicts
+having an ``items`` dict, such as ``spaces``, ``cells`` and ``refs``.
+The path of a node is a tuple of alternating container names and
+item keys from the root, such as ``('spaces', 'S', 'cells', 'foo')``.
+
+Changes are listed in a list of tuples below, parents before children:
+
+``('attrs', path, attrs)``
+    The values other than the containers of the node at ``path``
+    are replaced with ``attrs``.
+
+``('items', path, container, meta, keys, added)``
+    The items of ``container`` of the node at ``path`` are changed to
+    the items of ``keys`` in this order. ``added`` maps keys to
+    the new items, and the items not in ``keys`` are removed.
+    The values of the container other than ``items`` are replaced
+    with ``meta``.
+
+``mx_get_tree_delta`` of the kernel returns the changes since
+the version of the tree the client has.
+
+The containers of a node can be left unloaded. In this case, they are
+tuples of the item keys, as returned by ``mx_get_attrdict`` with
+``recursive=False``, and the ``items`` change above loads them.
+
+:func:`hash_tree` sets the hash of the subtree of each node to the node
+by :data:`HASH_KEY`, so that :func:`get_tree_delta` descends only into
+the nodes whose hashes differ. :func:`apply_tree_delta` removes
+the hashes of the changed nodes and their ancestors, and the nodes
+without the hashes are always descended into.
+"""
+
+import hashlib
+
+# Key of the subtree hash of a node, which is not an attribute of the node
+HASH_KEY = '_treehash'
+
+
+def is_container(value):
+    return isinstance(value, dict) and isinstance(value.get('items'), dict)
+
+
+def get_node(tree, path):
+    """Get the node at path"""
+    node = tree
+    for container, key in zip(path[::2], path[1::2]):
+        node = node[container]['items'][key]
+    return node
+
+
+def find_paths(tree, fullnames, path=()):
+    """Get a dict mapping the full names to the paths of their nodes
+
+    Only the nodes loaded in tree are searched.
+    """
+    result = {}
+    _, containers = _split_node(tree)
+    for name, container in containers.items():
+        for key, node in container['items'].items():
+            subpath = path + (name, key)
+            if node.get('fullname') in fullnames:
+                result[node['fullname']] = subpath
+            result.update(find_paths(node, fullnames, subpath))
+    return result
+
+
+def _split_node(node):
+    attrs, containers = {}, {}
+    for k, v in node.items():
+        if is_container(v):
+            containers[k] = v
+        elif k != HASH_KEY:
+            attrs[k] = v
+    return attrs, containers
+
+
+def hash_tree(tree):
+    """Set the hashes of the subtrees to the nodes in tree
+
+    The hash of a node is the digest of the reprs of its attributes
+    and the hashes of its child nodes, and is set to the node by
+    :data:`HASH_KEY`. Nodes equal in content have the same hash,
+    except for the order of their keys. Unlike the builtin ``hash``,
+    values such as -1 and -2, or 1, 1.0 and True, give different hashes.
+    Return the hash of the root.
+    """
+    parts = []
+    for k, v in tree.items():
+        if is_container(v):
+            parts.append(k)
+            for name, value in v.items():
+                if name == 'items':
+                    parts.extend((key, hash_tree(node))
+                                 for key, node in value.items())
+                else:
+                    parts.append((name, repr(value)))
+        elif k != HASH_KEY:
+            parts.append((k, type(v).__name__, repr(v)))
+
+    result = hashlib.blake2b(
+        repr(parts).encode('utf-8'), digest_size=16).digest()
+    tree[HASH_KEY] = result
+    return result
+
+
+def is_same_tree(old, new):
+    """Check if the nodes old and new have the same hashes
+
+    Return False if either node has no hash.
+    """
+    oldhash = old.get(HASH_KEY)
+    return oldhash is not None and oldhash == new.get(HASH_KEY)
+
+
+def get_tree_delta(old, new, path=()):
+    """Get the changes to update the tree ``old`` to ``new``
+
+    ``old`` and ``new`` must be the trees of the same object.
+    ``path`` is prepended to the paths in the changes if given.
+    Only the nodes whose hashes differ or are not set are compared.
+    """
+    changes = []
+    if not is_same_tree(old, new):
+        _diff_node(old, new, path, changes)
+    return changes
+
+
+def _diff_node(old, new, path, changes):
+
+    old_attrs, old_containers = _split_node(old)
+    new_attrs, new_containers = _split_node(new)
+
+    if old_attrs != new_attrs:
+        changes.append(('attrs', path, new_attrs))
+
+    kept = []
+    for name, container in new_containers.items():
+        oldcontainer = old_containers.get(name, {'items': {}})
+        olditems = oldcontainer['items']
+        newitems = container['items']
+        keys = list(newitems)
+        added = {k: newitems[k] for k in keys
+                 if k not in olditems
+                 or olditems[k].get('id') != newitems[k].get('id')}
+        meta = {k: v for k, v in container.items() if k != 'items'}
+        old_meta = {k: v for k, v in oldcontainer.items() if k != 'items'}
+
+        if keys != list(olditems) or added or meta != old_meta:
+            changes.append(('items', path, name, meta, keys, added))
+
+        kept.extend((name, k) for k in keys if k not in added)
+
+    for name, k in kept:
+        olditem = old_containers[name]['items'][k]
+        newitem = new_containers[name]['items'][k]
+        if not is_same_tree(olditem, newitem):
+            _diff_node(olditem, newitem, path + (name, k), changes)
+
+
+def apply_tree_delta(tree, changes):
+    """Apply changes to tree in place
+
+    The dicts of the nodes and the containers kept in the tree
+    are updated in place, so references to them remain valid.
+    The hashes of the changed nodes and their ancestors are removed.
+    """
+    for change in changes:
+        kind, path = change[:2]
+        node = tree
+        node.pop(HASH_KEY, None)
+        for container, key in zip(path[::2], path[1::2]):
+            node = node[container]['items'][key]
+            node.pop(HASH_KEY, None)
+
+        if kind == 'attrs':
+            attrs = change[2]
+            for k in [k for k, v in node.items()
+                      if not is_container(v) and k not in attrs]:
+                del node[k]
+            node.update(attrs)
+
+        elif kind == 'items':
+            name, meta, keys, added = change[2:]
+            if not is_container(node.get(name)):
+                node[name] = {'items': {}}
+            container = node[name]
+            items = container['items']
+            newitems = {k: added[k] if k in added else items[k]
+                        for k in keys}
+            items.clear()
+            items.update(newitems)
+            for k in [k for k in container if k != 'items']:
+                del container[k]
+            container.update(meta)
+
+        else:
+            raise ValueError("invalid change: %s" % kind)
+
+    return tree
+
+
+def get_loaded(tree):
+    """Get the full names of the nodes below the root with loaded children"""
+    result = set()
+    _, containers = _split_node(tree)
+    for container in containers.values():
+        for node in container['items'].values():
+            if _split_node(node)[1]:
+                result.add(node['fullname'])
+                result.update(get_loaded(node))
+    return result
+
+
+def prune_tree(tree, loaded, unloaded=None, _is_root=True):
+    """Unload the children of the nodes not in loaded
+
+    The root is kept loaded.
+    ``tree`` is pruned in place and returned, and is to be hashed
+    by :func:`hash_tree` after pruning.
+    If ``unloaded`` is given, copies of the pruned nodes with their
+    children are put in it by their full names.
+    """
+    _, containers = _split_node(tree)
+    if containers and not _is_root and tree['fullname'] not in loaded:
+        if unloaded is not None:
+            unloaded[tree['fullname']] = dict(tree)
+        for name, container in containers.items():
+            tree[name] = tuple(container['items'])
+    else:
+        for container in containers.values():
+            for node in container['items'].values():
+                prune_tree(node, loaded, unloaded, _is_root=False)
+    return tree
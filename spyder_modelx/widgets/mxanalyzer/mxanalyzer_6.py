@@ -531,6 +531,12 @@ class MxAnalyzerTab(QSplitter):
         self.objbox.setText('')
         self.replace_model(None)
 
+    def set_refreshing(self, refreshing):
+        if refreshing:
+            self.status.setText(_("Refreshing..."))
+        elif self.status.text() == _("Refreshing..."):
+            self.status.setText("")
+
 
 def _has_param(data):
     type_ = data["type"]
@@ -682,9 +688,13 @@ class MxAnalyzerTree(QTreeView):
                 #     Tree.Pane.Tab.Tabwiget
                 tab = self.analyzer_widget.tabs[adjacency]
                 sw = tab.shellwidget
-                tab.attrdict = obj = sw.get_attrdict(
-                    item.node['obj']['fullname'],
-                    attrs=['_evalrepr']) # to update objbox/argbox
+                with sw.mx_rpc_origin('analyzer'):
+                    tab.attrdict = obj = sw.get_attrdict(
+                        item.node['obj']['fullname'],
+                        attrs=['_evalrepr'],
+                        fields={'Cells': ['type', 'fullname', '_evalrepr',
+                                          'parameters']}
+                    ) # to update objbox/argbox
                 tab.objbox.setText(obj['_evalrepr'])
                 tab.argbox.setText(", ".join(repr(arg) for arg in item.node['args']))
 
@@ -709,7 +719,8 @@ class MxAnalyzerTree(QTreeView):
             obj = item.node['obj']['fullname']
             args = str(item.node['args'])
 
-            data, _ = self.shell.get_obj_value(obj, args)
+            with self.shell.mx_rpc_origin('analyzer'):
+                data, _ = self.shell.get_obj_value(obj, args)
 
             if isinstance(data, (pd.DataFrame, pd.Index, pd.Series)):
                 dialog = DataFrameEditor(self)
@@ -160,6 +160,9 @@ class MxCodeListWidget(QScrollArea):
         self.setWidget(self.codelist)
         self.setWidgetResizable(True)
 
+    def set_refreshing(self, refreshing):
+        self._parent.set_refreshing(self, refreshing)
+
     def setModel_(self, model):
         self.model_ = model
         self.updateList()
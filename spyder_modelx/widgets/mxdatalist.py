@@ -189,6 +189,9 @@ class MxDataListWidget(QSplitter):
         self.datalist = MxDataListView(self)
         self.dataattrs = MxDataAttrsView(self)
 
+    def set_refreshing(self, refreshing):
+        self._parent.set_refreshing(self, refreshing)
+
     def process_remote_view(self, data):
         if data:
             model = self.datalist.model()
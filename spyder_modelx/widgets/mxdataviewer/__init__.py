@@ -5,7 +5,8 @@ if spyder.version_info > (6,):
     from .compat60 import (
         MxDataFrameViewer,
         MxArrayViewer,
-        MxCollectionsViewer
+        MxCollectionsViewer,
+        MxRemoteDataFrameViewer
     )
 elif spyder.version_info > (5, 1):
     from .compat51 import (
@@ -44,4 +44,5 @@
 
 from .dataframeviewer import MxDataFrameViewer
 from .arrayviewer import MxArrayViewer
-from .collectionsviewer import MxCollectionsViewer
\ No newline at end of file
+from .collectionsviewer import MxCollectionsViewer
+from .remotedataframeviewer import MxRemoteDataFrameViewer
@@ -602,6 +602,10 @@ class DataFrameModel(QAbstractTableModel, SpyderFontsMixin):
         """Return data"""
         return self.df
 
+    def get_frame(self, rows, cols):     # mx_change
+        """Return the part of the DataFrame in the ranges of rows and cols"""
+        return self.df.iloc[slice(*rows), slice(*cols)]
+
     def rowCount(self, index=QModelIndex()):
         """DataFrame row number"""
         # Avoid a "Qt exception in virtual methods" generated in our
@@ -986,9 +990,8 @@ class DataFrameView(QTableView, SpyderWidgetMixin):
         # Copy index and header too (equal True).
         # See spyder-ide/spyder#11096
         index = header = True
-        df = self.model().df
-        obj = df.iloc[slice(row_min, row_max + 1),
-                      slice(col_min, col_max + 1)]
+        obj = self.model().get_frame((row_min, row_max + 1),    # mx_change
+                                     (col_min, col_max + 1))
         output = io.StringIO()
         try:
             obj.to_csv(output, sep='\t', index=index, header=header)
@@ -1729,6 +1732,7 @@ class MxDataFrameViewer(QWidget, SpyderWidgetMixin):    # mx_change
     https://github.com/wavexx/gtabview/blob/master/gtabview/viewer.py
     """
     CONF_SECTION = 'variable_explorer'
+    data_view_class = DataFrameView     # mx_change
 
     def __init__(
         self,
@@ -1889,7 +1893,12 @@ class MxDataFrameViewer(QWidget, SpyderWidgetMixin):    # mx_change
             data = pd.DataFrame(data)
 
         # Create the model and view of the data
-        self.dataModel = DataFrameModel(data, parent=self)
+        return self.set_model_and_check(    # mx_change
+            DataFrameModel(data, parent=self))
+
+    def set_model_and_check(self, model) -> bool:    # mx_change
+        """Display the data of model in the editor."""
+        self.dataModel = model
         # self.dataModel.dataChanged.connect(self.save_and_close_enable)    # mx_change
         self.dataTable.setModel(self.dataModel)
 
@@ -2062,10 +2071,9 @@ class MxDataFrameViewer(QWidget, SpyderWidgetMixin):    # mx_change
 
     def create_data_table(self):
         """Create the QTableView that will hold the data model."""
-        self.dataTable = DataFrameView(self, self.dataModel,
-                                       self.table_header.horizontalHeader(),
-                                       self.hscroll, self.vscroll,
-                                       self.data_function)
+        self.dataTable = self.data_view_class(    # mx_change
+            self, self.dataModel, self.table_header.horizontalHeader(),
+            self.hscroll, self.vscroll, self.data_function)
         self.dataTable.verticalHeader().hide()
         self.dataTable.horizontalHeader().hide()
         self.dataTable.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
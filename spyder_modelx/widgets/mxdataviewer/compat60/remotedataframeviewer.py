@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""DataFrame viewer of frames kept in the kernel
+
+:class:`RemoteDataFrameModel` displays a
+:class:`~spyder_modelx.widgets.mxdataviewer.remoteframe.RemoteFrame`.
+The cells and labels are fetched from the kernel by blocks of
+``ROWS_TO_LOAD`` rows and ``COLS_TO_LOAD`` columns when they are
+displayed, and at most :data:`MAX_BLOCKS` blocks are kept.
+Copying takes the blocks kept and fetches the others together,
+up to :data:`MAX_COPY_SIZE` cells.
+Sorting and the maximums and minimums of the columns for
+the background colors are computed in the kernel.
+The frame is read-only.
+"""
+
+from collections import OrderedDict
+
+from qtpy.compat import to_qvariant
+from qtpy.QtCore import QAbstractTableModel, Qt, Signal
+from qtpy.QtWidgets import QMessageBox
+from spyder_kernels.utils.lazymodules import pandas as pd
+
+from spyder.config.base import _
+
+from spyder_modelx.widgets.mxdataviewer.remoteframe import (
+    RemoteFrame, REMOTE_MIN_SIZE)
+from .dataframeviewer import (
+    DataFrameModel, DataFrameView, MxDataFrameViewer, DEFAULT_FORMAT,
+    ROWS_TO_LOAD, COLS_TO_LOAD)
+
+MAX_BLOCKS = 64
+
+# Number of the cells that can be copied at a time
+MAX_COPY_SIZE = REMOTE_MIN_SIZE
+
+
+class RemoteDataFrameModel(DataFrameModel):
+    """DataFrame Table Model of a frame kept in the kernel
+
+    ``self.df`` is the :class:`RemoteFrame`.
+    """
+    sig_window_loaded = Signal()
+
+    def __init__(self, frame, format_spec=DEFAULT_FORMAT, parent=None):
+        self._blocks = OrderedDict()
+        self._labels = ({}, {})     # Column and index labels by blocks
+        self._pending = set()
+        self._failed = set()
+        self._version = 0
+        self._sorting = False
+        super().__init__(frame, format_spec=format_spec, parent=parent)
+        self._add_block(frame.window)
+
+    # ---- Blocks of the frame ----
+    def _add_block(self, window):
+        key = (window['rows'][0] // ROWS_TO_LOAD,
+               window['cols'][0] // COLS_TO_LOAD)
+        frame = window['frame']
+        self._blocks[key] = frame
+        self._labels[0][key[1]] = frame.columns.tolist()
+        self._labels[1][key[0]] = frame.index.tolist()
+        while len(self._blocks) > MAX_BLOCKS:
+            self._blocks.popitem(last=False)
+        return key
+
+    def _clear_blocks(self):
+        self._version += 1
+        self._blocks.clear()
+        self._labels[0].clear()
+        self._labels[1].clear()
+        self._pending.clear()
+        self._failed.clear()
+
+    def _get_block(self, row, column):
+        key = (row // ROWS_TO_LOAD, column // COLS_TO_LOAD)
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+        else:
+            self._request_block(key)
+        return block
+
+    def _get_block_range(self, key):
+        """Get the pair of the ranges of the rows and columns of a block"""
+        rb, cb = key
+        return ((rb * ROWS_TO_LOAD,
+                 min((rb + 1) * ROWS_TO_LOAD, self.total_rows)),
+                (cb * COLS_TO_LOAD,
+                 min((cb + 1) * COLS_TO_LOAD, self.total_cols)))
+
+    def _request_block(self, key):
+        if self._sorting or key in self._pending or key in self._failed:
+            return
+
+        rows, cols = self._get_block_range(key)
+        version = self._version
+
+        self._pending.add(key)
+        self.df.get_window(
+            rows, cols,
+            callback=lambda is_error, value: self._process_window(
+                version, key, is_error, value))
+
+    def _process_window(self, version, key, is_error, value):
+        if version != self._version:
+            return
+
+        self._pending.discard(key)
+        if is_error:
+            self._failed.add(key)
+            return
+
+        self._add_block(value)
+        rows, cols = value['rows'], value['cols']
+        last_row = min(rows[1], self.rowCount()) - 1
+        last_col = min(cols[1], self.columnCount()) - 1
+        if last_row >= rows[0] and last_col >= cols[0]:
+            self.dataChanged.emit(self.index(rows[0], cols[0]),
+                                  self.index(last_row, last_col))
+        self.sig_window_loaded.emit()
+
+    def _get_label(self, axis, x):
+        size = COLS_TO_LOAD if axis == 0 else ROWS_TO_LOAD
+        labels = self._labels[axis].get(x // size)
+        if labels is None:
+            self._request_block(
+                (0, x // size) if axis == 0 else (x // size, 0))
+            return None
+        return labels[x % size]
+
+    # ---- DataFrameModel methods ----
+    @property
+    def header_shape(self):
+        """Return the levels for the columns and rows of the dataframe."""
+        return self.df.header_shape
+
+    def header(self, axis, x, level=0):
+        """
+        Return the values of the labels for the header of columns or rows.
+
+        An empty string is returned while the labels are fetched.
+        """
+        label = self._get_label(axis, x)
+        if label is None:
+            return ''
+        elif self.df.header_shape[axis] > 1:
+            return label[level]
+        else:
+            return label
+
+    def name(self, axis, level):
+        """Return the labels of the levels if any."""
+        names = self.df.names[axis]
+        if self.df.header_shape[axis] > 1:
+            return names[level]
+        elif names[0]:
+            return names[0]
+
+    def max_min_col_update(self):
+        """Take the maximums and minimums computed in the kernel"""
+        if self.df.shape[0] == 0:
+            return
+        self.max_min_col = self.df.max_min_col
+
+    def get_value(self, row, column):
+        """Return the value of the cell, or None if not fetched yet"""
+        block = self._get_block(row, column)
+        if block is None:
+            return None
+
+        row, column = row % ROWS_TO_LOAD, column % COLS_TO_LOAD
+        try:
+            value = block.iat[row, column]
+        except pd._libs.tslib.OutOfBoundsDatetime:
+            value = block.iloc[:, column].astype(str).iat[row]
+        except:
+            value = block.iloc[row, column]
+        return value
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Cell content"""
+        if (role in (Qt.DisplayRole, Qt.EditRole) and index.isValid()
+                and self._get_block(index.row(), index.column()) is None):
+            return to_qvariant()
+        return super().data(index, role)
+
+    def recalculate_index(self):
+        """The index and the shape do not change in the client."""
+        pass
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the frame in the kernel"""
+        self._sorting = True
+        self._clear_blocks()
+        self.reset()
+        self.df.sort(column, order == Qt.AscendingOrder,
+                     callback=self._process_sort)
+        return True
+
+    def _process_sort(self, is_error, error):
+        self._sorting = False
+        self._clear_blocks()
+        if is_error:
+            QMessageBox.critical(self.dialog, _("Error"), "%s: %s" % error)
+        else:
+            self._add_block(self.df.window)
+        self.reset()
+        self.sig_window_loaded.emit()
+
+    def flags(self, index):
+        """Set flags"""
+        return QAbstractTableModel.flags(self, index)
+
+    def setData(self, index, value, role=Qt.EditRole, change_type=None):
+        """Cells are not editable"""
+        return False
+
+    def get_frame(self, rows, cols):
+        """Return the part of the frame in the ranges of rows and cols
+
+        The part is put together from the blocks. The blocks not kept
+        are fetched from the kernel by one call, and are not kept.
+        """
+        row_blocks = range(rows[0] // ROWS_TO_LOAD,
+                           (rows[1] - 1) // ROWS_TO_LOAD + 1)
+        col_blocks = range(cols[0] // COLS_TO_LOAD,
+                           (cols[1] - 1) // COLS_TO_LOAD + 1)
+        keys = [(rb, cb) for rb in row_blocks for cb in col_blocks]
+
+        blocks = {key: self._blocks[key] for key in keys
+                  if key in self._blocks}
+        missing = [key for key in keys if key not in blocks]
+        if missing:
+            windows = self.df.get_windows(
+                [self._get_block_range(key) for key in missing])
+            blocks.update(zip(missing, (w['frame'] for w in windows)))
+
+        frame = pd.concat([
+            pd.concat([blocks[(rb, cb)] for cb in col_blocks], axis=1)
+            for rb in row_blocks])
+        row_start = row_blocks[0] * ROWS_TO_LOAD
+        col_start = col_blocks[0] * COLS_TO_LOAD
+        return frame.iloc[rows[0] - row_start:rows[1] - row_start,
+                          cols[0] - col_start:cols[1] - col_start]
+
+
+class RemoteDataFrameView(DataFrameView):
+    """Data Frame view class of frames kept in the kernel"""
+
+    def copy(self):
+        """Copy text to clipboard
+
+        Selections of more than :data:`MAX_COPY_SIZE` cells are not
+        copied. The size is taken from the selection ranges, as listing
+        the selected indexes of a large frame is slow.
+        """
+        ranges = self.selectionModel().selection()
+        if ranges.isEmpty():
+            return
+
+        rows = max(r.bottom() for r in ranges) - min(r.top() for r in ranges)
+        cols = max(r.right() for r in ranges) - min(r.left() for r in ranges)
+        if (rows + 1) * (cols + 1) > MAX_COPY_SIZE:
+            QMessageBox.warning(
+                self, _("Warning"),
+                _("The selection is too large to copy. "
+                  "Select %d cells or fewer.") % MAX_COPY_SIZE)
+            return
+
+        try:
+            super().copy()
+        except Exception as e:
+            QMessageBox.critical(
+                self, _("Error"), "%s: %s" % (type(e).__name__, e))
+
+    def refresh_menu(self):
+        """Refresh context menu"""
+        super().refresh_menu()
+        for action in [self.edit_action, self.insert_action_above,
+                       self.insert_action_below, self.insert_action_after,
+                       self.insert_action_before, self.duplicate_row_action,
+                       self.duplicate_col_action, self.remove_row_action,
+                       self.remove_col_action]:
+            action.setEnabled(False)
+        self.convert_to_menu.setEnabled(False)
+
+    def edit_header_item(self):
+        """The header is not editable"""
+        pass
+
+
+class MxRemoteDataFrameViewer(MxDataFrameViewer):
+    """Viewer of DataFrame, Series and Index kept in the kernel"""
+
+    data_view_class = RemoteDataFrameView
+
+    def set_data_and_check(self, data) -> bool:
+        """
+        Checks whether data is a RemoteFrame and display it in the viewer.
+
+        The frame in the kernel is released when the viewer is destroyed.
+        """
+        if not isinstance(data, RemoteFrame):
+            return False
+
+        self._selection_rec = False
+        self._model = None
+        self.is_series = data.is_series
+
+        model = RemoteDataFrameModel(data, parent=self)
+        model.sig_window_loaded.connect(self._update_headers)
+        self.destroyed.connect(lambda: data.close())
+
+        return self.set_model_and_check(model)
+
+    def _update_headers(self):
+        self.table_header.viewport().update()
+        self.table_index.viewport().update()
+
+    def edit_header_item(self, header=None):
+        """The header is not editable"""
+        pass
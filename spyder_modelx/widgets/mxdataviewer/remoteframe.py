@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+"""DataFrames kept in the kernel
+
+A DataFrame, Series or Index with :data:`REMOTE_MIN_SIZE` cells or more
+is not transferred to MxDataViewer as a whole. The kernel keeps the value
+and sends the windows of it to be displayed.
+The kernel methods below are called through ``mx_get_snapshot``.
+
+``mx_open_frame(fullname, argstr, calc, min_size, rows, cols)``
+    Same as ``mx_get_value`` except that the reply is
+    ``[value, is_calculated, frame]``. If the value is a DataFrame,
+    Series or Index of ``min_size`` cells or more, the kernel keeps
+    the value as a DataFrame, ``value`` is None and
+    ``frame`` is a dict of:
+
+    * ``id``: The key to the frame in the kernel
+    * ``type``: ``'DataFrame'``, ``'Series'`` or ``'Index'``
+    * ``shape``: The shape of the frame
+    * ``header_shape``: The numbers of the levels of the columns and index
+    * ``names``: The pair of the lists of the level names
+      of the columns and index
+    * ``max_min_col``: The list of ``[max, min]`` or None of the columns
+      as computed by ``DataFrameModel.max_min_col_update``
+    * ``window``: The window of ``rows`` and ``cols`` as returned by
+      ``mx_get_frame_window``
+
+    Otherwise ``frame`` is None.
+
+``mx_get_frame_window(frame_id, rows, cols)``
+    A dict of ``rows`` and ``cols``, the pairs of the start and stop
+    of the rows and columns, and ``frame``, the DataFrame sliced
+    by ``iloc`` with them.
+
+``mx_sort_frame(frame_id, column, ascending)``
+    Sort the frame in the kernel by the column at ``column``, or by
+    the index if ``column`` is -1, and return the frame dict
+    as ``mx_open_frame`` does.
+
+``mx_close_frame(frame_id)``
+    Release the frame.
+"""
+
+REMOTE_MIN_SIZE = 500000    # Same as LARGE_SIZE of the DataFrame viewer
+WINDOW_ROWS = 500           # Same as ROWS_TO_LOAD
+WINDOW_COLS = 40            # Same as COLS_TO_LOAD
+
+
+class RemoteFrame:
+    """DataFrame, Series or Index kept in the kernel"""
+
+    def __init__(self, shell, frame):
+        self.shell = shell
+        self.update(frame)
+
+    def update(self, frame):
+        self.id = frame['id']
+        self.type = frame['type']
+        self.shape = tuple(frame['shape'])
+        self.header_shape = tuple(frame['header_shape'])
+        self.names = frame['names']
+        self.max_min_col = frame['max_min_col']
+        self.window = frame['window']
+
+    @property
+    def is_series(self):
+        return self.type == 'Series'
+
+    def get_window(self, rows, cols, callback=None):
+        return self.shell.get_frame_window(self.id, rows, cols, callback)
+
+    def get_windows(self, windows):
+        return self.shell.get_frame_windows(self.id, windows)
+
+    def sort(self, column, ascending, callback=None):
+        """Sort the frame in the kernel
+
+        ``callback`` is called with the error flag and
+        the error or None after the frame is updated.
+        """
+        def process(is_error, value):
+            if not is_error:
+                self.update(value)
+                value = None
+            if callback:
+                callback(is_error, value)
+
+        self.shell.sort_frame(self.id, column, ascending, process)
+
+    def close(self):
+        self.shell.close_frame(self.id)
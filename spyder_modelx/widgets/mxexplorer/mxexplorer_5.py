@@ -68,6 +68,7 @@ from spyder_modelx.widgets.mxtreemodel import (
     MxTreeModel, ModelItem, ItemSpaceItem,
     ViewItem, SpaceItem, CellsItem, RefItem)
 from spyder_modelx.widgets.mxdatalist import MxDataListWidget
+from spyder_modelx.utility.treedelta import hash_tree, is_same_tree
 
 
 class MxTreeView(QTreeView):
@@ -385,23 +386,25 @@ class MxTreeView(QTreeView):
                 if isinstance(item, ViewItem) or isinstance(item, ItemSpaceItem):
                     pass
                 else:
+                    name = item.itemData['name']
                     if index.parent().isValid():
-                        parent = index.parent().internalPointer().fullname
+                        parent = index.parent().internalPointer().itemData[
+                            'fullname']
                     else:
                         parent = self.container.current_widget().model_selector.get_selected_model()
                     assert parent
 
                     answer = QMessageBox.question(
                         self, _("Delete Selected"),
-                        _("Do you want to delete %s?" % item.name),
+                        _("Do you want to delete %s?" % name),
                         QMessageBox.Yes | QMessageBox.No)
 
                     if answer == QMessageBox.Yes:
-                        self.shell.del_object(parent, item.name)
+                        self.shell.del_object(parent, name)
 
                         QMessageBox.information(
                             self, "Notice",
-                            "'%s' is deleted from '%s'" % (item.name, parent))
+                            "'%s' is deleted from '%s'" % (name, parent))
 
 
 class MxExplorer(QWidget):
@@ -424,10 +427,11 @@ class MxExplorer(QWidget):
 
     def process_remote_view(self, data):
         if data:
+            hash_tree(data)     # For updateRoot to compare by the hashes
             model = self.treeview.model()
             if model:
                 if model.modelid == data['id']:
-                    if model.rootItem.itemData != data:
+                    if not is_same_tree(model.rootItem.itemData, data):
                         model.updateRoot(ModelItem(data))
                 else:
                     self.treeview.setModel(MxTreeModel(ModelItem(data)))
@@ -44,13 +44,18 @@
 
 """modelx Widget."""
 import sys, os
+import ast
 import keyword
-from qtpy.QtCore import Signal, Slot, Qt, QStringListModel, QEventLoop
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from qtpy.QtCore import (Signal, Slot, Qt, QStringListModel, QEventLoop,
+                         QModelIndex, QPersistentModelIndex, QTimer)
 from qtpy.QtWidgets import (QHBoxLayout, QLabel, QMenu, QMessageBox, QAction,
                             QToolButton, QVBoxLayout, QWidget, QTreeView,
                             QSplitter, QComboBox, QSizePolicy, QDialog,
                             QGridLayout, QListWidget, QPushButton,
-                            QDialogButtonBox, QLineEdit, QCheckBox, QTabWidget)
+                            QDialogButtonBox, QLineEdit, QCheckBox, QTabWidget,
+                            QInputDialog)
 from qtpy.QtGui import QPalette
 from qtpy.compat import getexistingdirectory, getopenfilename
 import spyder
@@ -64,9 +69,45 @@ from spyder_modelx.widgets.mxcodeeditor import BaseCodePane
 from spyder_modelx.widgets.mxproperty import MxPropertyWidget
 from spyder_modelx.widgets.mxtreemodel import (
     TreeCol,
-    MxTreeModel, ModelItem, ItemSpaceItem,
-    ViewItem, SpaceItem, CellsItem, RefItem)
+    MxTreeModel, ModelItem, ItemSpaceItem, ItemSpaceMapItem,
+    ViewItem, SpaceItem, CellsItem, RefItem,
+    get_space_containers, get_child_spaces)
+from spyder_modelx.widgets.mxtreesearch import (
+    MxTreeSearch, MxTreeFilterProxy)
 from spyder_modelx.widgets.mxdatalist import MxDataListWidget
+from spyder_modelx.widgets.mxperformance import MxPerformanceWidget
+from spyder_modelx.utility.treedelta import (
+    get_tree_delta, get_loaded, prune_tree, find_paths, get_node, hash_tree)
+
+# Types of the nodes without children in the tree
+_LEAF_TYPES = ('Cells', 'Reference')
+
+# Number of the tree models of the models not shown kept in MxExplorer
+MAX_CACHED_TREES = 4
+
+# Milliseconds to wait for typing to stop before searching the tree
+SEARCH_DELAY = 200
+
+
+def _prepare_tree(model, data, unloaded=None):
+    """Get what updates the tree of model to data
+
+    The changes are returned if model shows the same model as data,
+    otherwise the item of the new tree is returned.
+    The nodes pruned from data are put in unloaded if given, and
+    the pruned data is hashed so that only the changed branches
+    are compared now and next time.
+    Called in the worker thread of :class:`MxExplorer`.
+    """
+    if not data:
+        return None
+    elif model and model.modelid == data['id']:
+        prune_tree(data, get_loaded(model.rootItem.itemData), unloaded)
+        hash_tree(data)
+        return get_tree_delta(model.rootItem.itemData, data)
+    else:
+        hash_tree(prune_tree(data, set(), unloaded))
+        return ModelItem(data)
 
 
 class MxTreeView(QTreeView):
@@ -111,6 +152,9 @@ class MxTreeView(QTreeView):
         self.action_update_formulas = self.contextMenu.addAction(
             "Show Formulas"
         )
+        self.action_seek_itemspace = self.contextMenu.addAction(
+            "Find Item Space"
+        )
         self.action_new_model = self.contextMenu.addAction(
             "Create New Model"
         )
@@ -133,6 +177,91 @@ class MxTreeView(QTreeView):
             "Delete Model"
         )
 
+    def get_view_state(self):
+        """Get the expanded items, the current item and the scroll position
+
+        The items are held by persistent indexes of the model
+        so that they follow the changes to the model.
+        """
+        model = self.model()
+        expanded = []
+        parents = [QModelIndex()]
+        while parents:
+            parent = parents.pop()
+            for row in range(model.rowCount(parent)):
+                index = model.index(row, 0, parent)
+                if self.isExpanded(index):
+                    expanded.append(QPersistentModelIndex(index))
+                    parents.append(index)
+
+        return (expanded, QPersistentModelIndex(self.currentIndex()),
+                self.horizontalScrollBar().value(),
+                self.verticalScrollBar().value())
+
+    def set_view_state(self, state):
+        """Restore the state returned by get_view_state"""
+        expanded, current, x, y = state
+        for index in expanded:
+            if index.isValid():
+                self.setExpanded(QModelIndex(index), True)
+        if current.isValid():
+            self.setCurrentIndex(QModelIndex(current))
+
+        # Lay out the expanded items to set the ranges of the scroll bars
+        self.executeDelayedItemsLayout()
+        self.horizontalScrollBar().setValue(x)
+        self.verticalScrollBar().setValue(y)
+
+    def seek_itemspace(self):
+        """Select the item space of the arguments entered by the user
+
+        The item space is searched among the item spaces
+        of the current ItemSpaces node, or the parent of the current
+        item space. The arguments can be given only partly from the first.
+        """
+        index = self.currentIndex()
+        if index.isValid() and isinstance(
+                index.internalPointer(), ItemSpaceItem):
+            index = index.parent()
+        if not index.isValid() or not isinstance(
+                index.internalPointer(), ItemSpaceMapItem):
+            return
+
+        text, ok = QInputDialog.getText(
+            self, _("Find Item Space"), _("Arguments:"))
+        if not ok or not text.strip():
+            return
+
+        try:
+            args = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            QMessageBox.critical(
+                self, "Error", "Invalid arguments: %s" % text)
+            return
+        if not isinstance(args, tuple):
+            args = (args,)
+
+        found = self.model().seekItemSpace(index, args)
+        if found is None:
+            QMessageBox.information(
+                self, _("Find Item Space"), "No item space found.")
+        else:
+            self.setCurrentIndex(found)
+            self.scrollTo(found)
+
+    def get_space_tree(self):
+        """Get the tree data of the spaces in the model shown
+
+        The spaces are requested from the kernel, as only the spaces
+        loaded so far are in the tree. The data of the tree is
+        returned if the request fails.
+        """
+        data = self.model().rootItem.itemData
+        try:
+            return self.shell.get_space_tree(data['fullname']) or data
+        except Exception:
+            return data
+
     def get_current_item(self):
         if self.currentIndex().isValid():
             return self.currentIndex().internalPointer()
@@ -185,6 +314,9 @@ class MxTreeView(QTreeView):
 
                 self.shell.update_codelist(item.itemData['fullname'])
 
+        elif action == self.action_seek_itemspace:
+            self.seek_itemspace()
+
         elif action == self.action_update_properties:
             index = self.currentIndex()
             if index.isValid():
@@ -259,7 +391,7 @@ class MxTreeView(QTreeView):
 
         elif action == self.action_new_space:
             if self.model():
-                parentList = self.model().rootItem.getSpaceContainerList()
+                parentList = get_space_containers(self.get_space_tree())
             else:
                 parentList = []
 
@@ -299,7 +431,7 @@ class MxTreeView(QTreeView):
 
         elif action == self.action_new_cells:
             if self.model():
-                parentList = self.model().rootItem.getChildSpaceList()
+                parentList = get_child_spaces(self.get_space_tree())
             else:
                 parentList = []
 
@@ -394,28 +526,33 @@ class MxTreeView(QTreeView):
                 if isinstance(item, ViewItem) or isinstance(item, ItemSpaceItem):
                     pass
                 else:
+                    name = item.itemData['name']
                     if index.parent().isValid():
-                        parent = index.parent().internalPointer().fullname
+                        parent = index.parent().internalPointer().itemData[
+                            'fullname']
                     else:
                         parent = self.container.current_widget().model_selector.get_selected_model()
                     assert parent
 
                     answer = QMessageBox.question(
                         self, _("Delete Selected"),
-                        _("Do you want to delete %s?" % item.name),
+                        _("Do you want to delete %s?" % name),
                         QMessageBox.Yes | QMessageBox.No)
 
                     if answer == QMessageBox.Yes:
-                        self.shell.del_object(parent, item.name)
+                        self.shell.del_object(parent, name)
 
                         QMessageBox.information(
                             self, "Notice",
-                            "'%s' is deleted from '%s'" % (item.name, parent))
+                            "'%s' is deleted from '%s'" % (name, parent))
 
 
 class MxExplorer(QWidget):
     """modelx widget."""
 
+    # Emitted from the worker thread when an update of the tree is prepared
+    sig_tree_prepared = Signal()
+
     def __init__(self, parent):
         QWidget.__init__(self, parent)
 
@@ -425,25 +562,309 @@ class MxExplorer(QWidget):
 
         self.treeview = treeview = MxTreeView(self)
 
+        # The items found by the search box are shown
+        # in place of the tree with their ancestors.
+        self.search_edit = QLineEdit(self)
+        self.search_edit.setPlaceholderText(_("Search"))
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_proxy = MxTreeFilterProxy(self)
+        self.search_view = QTreeView(self)
+        self.search_view.setModel(self.search_proxy)
+        self.search_view.setVisible(False)
+        self.search_view.activated.connect(self.select_search_result)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY)
+        self._search_timer.timeout.connect(self.search)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+
+        # Shown while the tree is waiting for the kernel
+        self.status = QLabel(_("Refreshing..."), parent=self)
+        self.status.setVisible(False)
+
+        # Updates of the tree applied in order. Whole trees are pruned
+        # and compared with the tree in the worker thread.
+        self._tree_updates = deque()
+        self._tree_worker = ThreadPoolExecutor(max_workers=1)
+        self.sig_tree_prepared.connect(self._run_tree_updates)
+
+        # Tree models of the models shown before with their view states,
+        # keyed by the ids of the models, the least recently shown first
+        self._tree_cache = OrderedDict()
+
         # Main layout
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.search_edit)
         layout.addWidget(self.treeview)
+        layout.addWidget(self.search_view)
+        layout.addWidget(self.status)
         self.setLayout(layout)
 
-    def process_remote_view(self, data):
-        if data:
+    def set_refreshing(self, refreshing):
+        self.status.setText(_("Refreshing..."))
+        self.status.setVisible(refreshing)
+
+    def update_status(self, success, msg=''):
+        """Show msg in the status line if loading the tree failed"""
+        self.status.setText(msg)
+        self.status.setVisible(not success)
+
+    def search(self):
+        """Show the items whose full names contain the text of the search box
+
+        The names are indexed for each tree model when first searched,
+        and the index is updated as the tree changes. Only the items
+        loaded in the tree are searched, and expanding the results
+        does not load more items.
+        """
+        text = self.search_edit.text().strip()
+        model = self.treeview.model()
+        if not text or model is None:
+            self.search_proxy.setSourceModel(None)
+            self.search_view.setVisible(False)
+            self.treeview.setVisible(True)
+            return
+
+        search = model.findChild(MxTreeSearch)
+        if search is None:
+            search = MxTreeSearch(model)
+            search.sig_index_changed.connect(self._on_search_index_changed)
+
+        if self.search_proxy.sourceModel() is not model:
+            self.search_proxy.setSourceModel(model)
+        self.search_proxy.setAccepted(search.search(text))
+        self.search_view.expandAll()
+        self.treeview.setVisible(False)
+        self.search_view.setVisible(True)
+
+    def _on_search_index_changed(self):
+        if self.search_view.isVisible():
+            self._search_timer.start()
+
+    def select_search_result(self, index):
+        """Select the item of index in the tree, clearing the search"""
+        index = self.search_proxy.mapToSource(index.sibling(index.row(), 0))
+        self.search_edit.clear()
+        self._search_timer.stop()
+        self.search()
+
+        parent = index.parent()
+        while parent.isValid():
+            self.treeview.expand(parent)
+            parent = parent.parent()
+        self.treeview.setCurrentIndex(index)
+        self.treeview.scrollTo(index)
+        self.treeview.activated_callback(index)
+
+    def _queue_tree_update(self, apply, prepare=None):
+        """Apply an update of the tree after the updates queued before
+
+        If prepare is given, it is called in the worker thread with
+        the model of the tree when the update comes first in the queue,
+        and its result is passed to apply. The tree is not changed
+        while prepare is running as the other updates wait in the queue.
+        If prepare raises an error, the error is shown in the status line
+        in place of apply, and the next updates are applied.
+        Nothing is queued after :meth:`close_worker` is called.
+        """
+        if self._tree_worker is None:
+            return
+        self._tree_updates.append([apply, prepare, None])
+        self._run_tree_updates()
+
+    def _run_tree_updates(self):
+
+        while self._tree_updates:
+            update = self._tree_updates[0]
+            apply, prepare, future = update
+            if prepare is None:
+                self._tree_updates.popleft()
+                apply()
+            elif future is None:
+                update[2] = self._tree_worker.submit(
+                    prepare, self.treeview.model())
+                update[2].add_done_callback(self._on_tree_prepared)
+                return
+            elif future.done():
+                self._tree_updates.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.update_status(
+                        False, "%s: %s" % (type(e).__name__, e))
+                else:
+                    apply(result)
+            else:
+                return
+
+    def _on_tree_prepared(self, future):
+        # Called in the worker thread
+        if self._tree_worker is not None:
+            self.sig_tree_prepared.emit()
+
+    def close_worker(self):
+        """Shut down the worker thread, dropping the queued updates"""
+        if self._tree_worker is not None:
+            self._tree_updates.clear()
+            self._tree_worker.shutdown(wait=False, cancel_futures=True)
+            self._tree_worker = None
+
+    def _apply_tree(self, result, version=None):
+        """Apply the result of :func:`_prepare_tree` to the tree"""
+        if result is None:
+            self.set_model(None)
+        elif isinstance(result, ModelItem):
+            self.set_tree_model(result)
+        elif result:
+            self.treeview.model().applyChanges(result)
+
+        model = self.treeview.model()
+        if model and version is not None:
+            model.version = version
+
+    def process_remote_view(self, data, decode=None):
+        """Update the tree by the whole tree data
+
+        Only the spaces loaded in the current tree are kept loaded.
+        The other spaces are kept in ``unloadedNodes`` of the tree model
+        to load their children from when expanded.
+        If decode is given, data is passed to decode
+        in the worker thread to get the tree data.
+        """
+        def prepare(model):
+            unloaded = {}
+            return unloaded, _prepare_tree(
+                model, decode(data) if decode else data, unloaded)
+
+        def apply(result):
+            unloaded, result = result
+            self._apply_tree(result)
             model = self.treeview.model()
             if model:
-                if model.modelid == data['id']:
-                    if model.rootItem.itemData != data:
-                        model.updateRoot(ModelItem(data))
-                else:
-                    self.treeview.setModel(MxTreeModel(ModelItem(data)))
+                model.unloadedNodes = unloaded
+
+        self._queue_tree_update(apply, prepare)
+
+    def set_tree_model(self, item):
+        model = MxTreeModel(item)
+        model.sig_fetch_requested.connect(
+            lambda item: self.treeview.shell.fetch_modeltree_children(
+                model, item)
+        )
+        self.set_model(model)
+
+    def set_model(self, model):
+        """Show model in the tree, keeping the model shown before
+
+        The model shown before is cached with the state of the view
+        to be shown again by :meth:`select_tree`.
+        """
+        current = self.treeview.model()
+        if current is not None:
+            self._tree_cache[current.modelid] = (
+                current, self.treeview.get_view_state())
+            self._tree_cache.move_to_end(current.modelid)
+            while len(self._tree_cache) > MAX_CACHED_TREES:
+                self._tree_cache.popitem(last=False)
+
+        if model is not None:
+            self._tree_cache.pop(model.modelid, None)
+        self.treeview.setModel(model)
+        if self.search_edit.text():
+            self._search_timer.start()
+
+    def select_tree(self, modelid):
+        """Show the cached tree of the model of modelid if any
+
+        The tree is shown with the items expanded and the position scrolled
+        as it was last shown. The tree keeps its version so that
+        only the changes since then are requested.
+        """
+        def apply():
+            model = self.treeview.model()
+            if modelid in self._tree_cache and not (
+                    model and model.modelid == modelid):
+                cached, state = self._tree_cache.pop(modelid)
+                self.set_model(cached)
+                self.treeview.set_view_state(state)
+
+        self._queue_tree_update(apply)
+
+    def process_remote_children(self, model, item, data):
+
+        def apply():
+            if data:
+                model.loadChildren(item, data)
             else:
-                self.treeview.setModel(MxTreeModel(ModelItem(data)))
+                model.fetchFailed(item)
+
+        self._queue_tree_update(apply)
+
+    def process_remote_delta(self, delta):
+        """Update the tree by the reply of mx_get_tree_delta
+
+        The reply has the whole tree if the kernel cannot tell the changes
+        since the version of the tree, such as when the model is replaced.
+        """
+        if delta is None:
+            self._queue_tree_update(lambda: self.set_model(None))
+        elif 'tree' in delta:
+            self._queue_tree_update(
+                lambda result: self._apply_tree(result, delta['version']),
+                lambda model: _prepare_tree(model, delta['tree']))
         else:
-            self.treeview.setModel(None)
+            self._queue_tree_update(
+                lambda: self._apply_tree(delta['changes'], delta['version']))
+
+    def get_tree_version(self, name):
+        """Get the version of the tree if the tree shows the model
+
+        None is returned while the tree is being updated,
+        as the version is not the one the next reply is applied to.
+        """
+        model = self.treeview.model()
+        if (model and not self._tree_updates
+                and model.rootItem.itemData['fullname'] == name):
+            return model.version
+        return None
+
+    def get_loaded_spaces(self, name):
+        """Get the full names of the spaces with their children loaded"""
+        model = self.treeview.model()
+        if model and model.rootItem.itemData['fullname'] == name:
+            return get_loaded(model.rootItem.itemData)
+        return set()
+
+    def get_leaf_paths(self, name, fullnames):
+        """Get the paths of the loaded Cells and References in fullnames
+
+        None is returned while the tree is being updated,
+        as the paths may not be found in the updated tree.
+        """
+        model = self.treeview.model()
+        if self._tree_updates:
+            return None
+        elif model and model.rootItem.itemData['fullname'] == name:
+            tree = model.rootItem.itemData
+            return {fullname: path for fullname, path
+                    in find_paths(tree, set(fullnames)).items()
+                    if get_node(tree, path)['type'] in _LEAF_TYPES}
+        return {}
+
+    def process_remote_nodes(self, name, changes):
+        """Update the nodes by the attrs changes without the tree version
+
+        The changes are also included in the next reply of
+        mx_get_tree_delta, which is harmless as they are replaced again.
+        """
+        def apply():
+            model = self.treeview.model()
+            if model and model.rootItem.itemData['fullname'] == name:
+                model.applyChanges(changes)
+
+        self._queue_tree_update(apply)
 
 
 class MxMainWidget(QWidget):
@@ -477,6 +898,7 @@ class MxMainWidget(QWidget):
         self.codelist = MxCodeListWidget(self)
         self.propwidget = MxPropertyWidget(self, orientation=Qt.Vertical)
         self.datalist = MxDataListWidget(self, orientation=Qt.Vertical)
+        self.perfwidget = MxPerformanceWidget(self)
 
         # Create splitter
         self.splitter = QSplitter(self)
@@ -490,6 +912,7 @@ class MxMainWidget(QWidget):
         MxMainWidget.IdxProperties = self.tabwidget.addTab(self.propwidget, "Properties")
         MxMainWidget.IdxFormulas = self.tabwidget.addTab(self.codelist, "Formulas")
         MxMainWidget.IdxDataList = self.tabwidget.addTab(self.datalist, "Data")
+        MxMainWidget.IdxPerformance = self.tabwidget.addTab(self.perfwidget, "Performance")
 
         # Layout management
         self.splitter.addWidget(self.explorer)
@@ -500,6 +923,10 @@ class MxMainWidget(QWidget):
 
         self.setFocusPolicy(Qt.ClickFocus)
 
+    def closeEvent(self, event):
+        # Called when the console is closed
+        self.explorer.close_worker()
+        super().closeEvent(event)
 
     def set_shellwidget(self, shellwidget):
         """Bind shellwidget instance to namespace browser"""
@@ -508,10 +935,22 @@ class MxMainWidget(QWidget):
         self.shellwidget.set_mxcodelist(self.codelist)
         self.shellwidget.set_mxproperty(self.propwidget)
         self.shellwidget.set_mxdatalist(self.datalist)
+        self.shellwidget.set_mxperformance(self.perfwidget)
 
     def raise_tab(self, widget):
         self.tabwidget.setCurrentWidget(widget)
 
+    def set_refreshing(self, widget, refreshing):
+        """Mark the tab title of widget while it is waiting for the kernel"""
+        idx = self.tabwidget.indexOf(widget)
+        title = self.tabwidget.tabText(idx)
+        suffix = " " + _("(refreshing)")
+        if title.endswith(suffix):
+            title = title[:-len(suffix)]
+        if refreshing:
+            title += suffix
+        self.tabwidget.setTabText(idx, title)
+
 
 class MxModelSelector(QComboBox):
 
@@ -526,6 +965,15 @@ class MxModelSelector(QComboBox):
         self.modellist = []
 
 
+    def get_selected_modelid(self):
+        """Gets the id of the selected model."""
+
+        idx = self.currentIndex()
+        if idx < 0 or not self.modellist[idx]:
+            return None
+        else:
+            return self.modellist[idx]["id"]
+
     def get_selected_model(self, modellist=None):
         """Gets the name of the selected model."""
 
@@ -952,7 +1400,7 @@ class NewSpaceDialog(QDialog):
             selected = []
 
         if self.treeview.model():
-            allItems = self.treeview.model().rootItem.getChildSpaceList()
+            allItems = get_child_spaces(self.treeview.get_space_tree())
         else:
             allItems = []
 
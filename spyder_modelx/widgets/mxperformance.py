@@ -0,0 +1,133 @@
+from qtpy.QtCore import Qt, QTimer
+from qtpy.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+)
+from qtpy.compat import getsavefilename
+
+from spyder.config.base import _
+from spyder.utils.misc import getcwd_or_home
+
+COL_HEADER = ("Method", "Widget", "Calls", "Errors", "p50 (ms)", "p95 (ms)",
+              "Sent (KB)", "Received (KB)")
+
+REFRESH_INTERVAL = 1000     # milliseconds
+
+
+def _format_latency(seconds):
+    return "" if seconds is None else "%.1f" % (seconds * 1000)
+
+
+def _format_size(size):
+    return "%.1f" % (size / 1024)
+
+
+class _StatItem(QTableWidgetItem):
+    """Table item sorted by the value in UserRole"""
+
+    def __lt__(self, other):
+        return self.data(Qt.UserRole) < other.data(Qt.UserRole)
+
+
+class MxPerformanceWidget(QWidget):
+    """Statistics of the calls to the kernel by method and widget
+
+    The table shows ``mx_rpc_stats`` of the shell, and is refreshed
+    every :data:`REFRESH_INTERVAL` milliseconds while it is visible.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.shell = None   # To be set by MxShellWidget
+
+        self.table = QTableWidget(0, len(COL_HEADER), self)
+        self.table.setHorizontalHeaderLabels(COL_HEADER)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents)
+
+        self.label = QLabel(self)
+        refresh_button = QPushButton(_("Refresh"), self)
+        refresh_button.clicked.connect(self.refresh)
+        clear_button = QPushButton(_("Clear"), self)
+        clear_button.clicked.connect(self.clear)
+        export_button = QPushButton(_("Export CSV..."), self)
+        export_button.clicked.connect(self.export_csv)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.label)
+        button_layout.addStretch(1)
+        for button in [refresh_button, clear_button, export_button]:
+            button_layout.addWidget(button)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(button_layout)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if self.shell is None:
+            return
+
+        stats = self.shell.mx_rpc_stats
+        summary = stats.summarize()
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(summary))
+        for row, rec in enumerate(summary):
+            values = [
+                (rec.method, rec.method),
+                (rec.origin or "", rec.origin or ""),
+                (str(rec.calls), rec.calls),
+                (str(rec.errors), rec.errors),
+                (_format_latency(rec.p50), rec.p50 or 0),
+                (_format_latency(rec.p95), rec.p95 or 0),
+                (_format_size(rec.request_bytes), rec.request_bytes),
+                (_format_size(rec.reply_bytes), rec.reply_bytes)
+            ]
+            for col, (text, key) in enumerate(values):
+                item = _StatItem(text)
+                item.setData(Qt.UserRole, key)
+                if col >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+
+        self.label.setText(
+            _("%d calls recorded") % len(stats.records))
+
+    def clear(self):
+        if self.shell is not None:
+            self.shell.mx_rpc_stats.clear()
+        self.refresh()
+
+    def export_csv(self):
+        if self.shell is None:
+            return
+
+        filename, _selfilter = getsavefilename(
+            self, _("Export CSV"), getcwd_or_home(), "CSV (*.csv)")
+        if not filename:
+            return
+
+        try:
+            with open(filename, 'w', newline='', encoding='utf-8') as f:
+                self.shell.mx_rpc_stats.write_csv(f)
+        except OSError as e:
+            QMessageBox.critical(self, _("Error"), str(e))
@@ -355,6 +355,9 @@ class MxPropertyWidget(QSplitter):
             self.view.setModel(None)
             self.formulaPane.clearCode()
 
+    def set_refreshing(self, refreshing):
+        self._parent.set_refreshing(self, refreshing)
+
     @property
     def objectId(self):
         model = self.view.model()
@@ -49,7 +49,7 @@ import uuid
 import time
 from collections import namedtuple
 import cloudpickle
-from qtpy.QtCore import Signal, Slot, Qt, QEventLoop
+from qtpy.QtCore import Signal, Slot, Qt, QEventLoop, QTimer
 from qtpy.QtWidgets import QMessageBox
 # from spyder.widgets.reporterror import SpyderErrorDialog
 
@@ -63,6 +63,9 @@ from spyder.utils import encoding
 from spyder.py3compat import to_text_string
 
 from spyder_modelx.utility.tupleencoder import TupleEncoder, hinted_tuple_hook
+from spyder_modelx.utility.rpcstats import RpcStats, get_size
+from spyder_modelx.utility.requestqueue import (
+    RequestQueue, PRIORITY_VISIBLE)
 from spyder_modelx.utility.formula import (
     is_funcdef, is_lambda, replace_funcname, get_funcname)
 
@@ -73,6 +76,13 @@ if spyder.version_info > (4,):
 
 logger = logging.getLogger(__name__)
 
+# The timeouts of the calls to the kernel in seconds are
+# TIMEOUT_FACTOR times the 95th percentiles of the latencies of
+# the methods, but not less than CALL_KERNEL_TIMEOUT or more than
+# MAX_CALL_TIMEOUT.
+TIMEOUT_FACTOR = 4
+MAX_CALL_TIMEOUT = 600
+
 def _quote_string(arg):
     if arg:
         return "'%s'" % arg
@@ -80,6 +90,44 @@ def _quote_string(arg):
         return ""
 
 
+# Attributes requested by each widget in addition to the default ones
+_MODELTREE_ATTRS = ['_is_derived', '__len__', '_evalrepr']
+_PROPERTY_ATTRS = ['formula', '_evalrepr', 'allow_none', 'parameters']
+
+
+def _is_missing_handler(error):
+    """Check if error is raised because the kernel lacks the called method"""
+    return (type(error).__name__ == 'CommError'
+            and 'No such spyder call type' in str(error))
+
+
+def _is_signature_error(error, method):
+    """Check if error is raised because the kernel's method takes other args
+
+    The methods of older kernels take fewer arguments, such as
+    ``mx_set_formula`` without the source and ``mx_new_cells``
+    without the formula.
+    """
+    message = str(error)
+    return (isinstance(error, TypeError) and '%s()' % method in message
+            and 'argument' in message)
+
+
+def _is_missing_reply(reply, method):
+    """Check if reply is an error because the kernel lacks method"""
+    is_error, value = reply
+    return is_error and value[0] in (
+        'CommError', 'AttributeError') and method in value[1]
+
+
+def _get_reply_value(reply):
+    """Get the value of a reply from get_snapshot or raise its error"""
+    is_error, value = reply
+    if is_error:
+        raise RuntimeError("%s: %s" % value)
+    return value
+
+
 class MxShellWidget(ShellWidget):
     """Custom shell widget for modelx"""
 
@@ -123,8 +171,242 @@ class MxShellWidget(ShellWidget):
     def __init__(self, *args, **kw):
 
         self._mx_exec = {}
+
+        # None until the first call of mx_get_snapshot tells
+        # whether the kernel supports it. False for older kernels.
+        self._mx_snapshot_supported = None
+
+        # Kernel methods called by comm if the kernel has them,
+        # and otherwise executed silently
+        self._mx_missing = set()
+
+        # Records of the calls to adapt the timeouts to
+        self.mx_rpc_stats = RpcStats()
+
+        # Requests waiting for the pending request to return
+        self._mx_queue = RequestQueue()
+        self._mx_pending = None
+
         super(MxShellWidget, self).__init__(*args, **kw)
 
+        self._mx_pending_timer = QTimer(self)
+        self._mx_pending_timer.setSingleShot(True)
+        self._mx_pending_timer.timeout.connect(self._on_mx_request_timeout)
+
+    # ---- Requests to the kernel (Spyder 4 or newer) ----
+    def _get_timeout(self, method):
+        """Get the timeout of method adapted to its latencies"""
+        return self.mx_rpc_stats.get_timeout(
+            method, CALL_KERNEL_TIMEOUT, TIMEOUT_FACTOR, MAX_CALL_TIMEOUT)
+
+    def _call_kernel_timed(self, method, *args, **kwargs):
+        """Call method of the kernel blocking and record the latency"""
+        start = time.monotonic()
+        try:
+            value = getattr(self.call_kernel(
+                interrupt=False,
+                blocking=True,
+                timeout=self._get_timeout(method)), method)(*args, **kwargs)
+        except Exception as e:
+            # The time waited for no reply is not a latency
+            self.mx_rpc_stats.record(
+                method, None,
+                None if isinstance(e, TimeoutError)
+                else time.monotonic() - start,
+                get_size(args), 0, is_error=True)
+            raise
+
+        self.mx_rpc_stats.record(
+            method, None, time.monotonic() - start,
+            get_size(args), get_size(value))
+        return value
+
+    def get_snapshot(self, queries, callback=None, priority=PRIORITY_VISIBLE):
+        """Call multiple kernel methods in one round trip
+
+        ``queries`` is a list of ``(method, args, kwargs)`` tuples.
+        Returns a list of ``(is_error, value)`` pairs, where ``value`` is
+        ``(error name, error message)`` if ``is_error`` is True.
+
+        If ``callback`` is given, the list is passed to ``callback``
+        instead of being returned. The call does not block
+        if the kernel is known to support ``mx_get_snapshot``.
+        Such requests are queued by ``priority`` and sent one at a time
+        after the previous one returns, without interrupting the kernel.
+        If the kernel does not reply in the timeout while it is idle,
+        the request is given up.
+
+        If the kernel does not have ``mx_get_snapshot``,
+        the methods are called one by one.
+        """
+        if callback is None:
+            return self._get_snapshot(queries)
+
+        self._mx_queue.push((queries, callback), priority)
+        self._dispatch_mx_requests()
+
+    def _dispatch_mx_requests(self):
+
+        while self._mx_pending is None and self._mx_queue:
+            queries, callback = self._mx_queue.pop()
+
+            if not self._mx_snapshot_supported:
+                callback(self._get_snapshot(queries))
+                continue
+
+            job = self._mx_pending = (queries, callback, time.monotonic())
+            self._mx_pending_timer.start(
+                int(self._get_timeout('mx_get_snapshot') * 1000))
+
+            self.call_kernel(
+                interrupt=False,
+                callback=lambda replies, job=job: self._on_mx_replies(
+                    job, replies)
+            ).mx_get_snapshot(cloudpickle.dumps(queries))
+
+    def _on_mx_replies(self, job, replies):
+
+        if self._mx_pending is not job:     # Given up
+            return
+
+        queries, callback, start = job
+        self.mx_rpc_stats.record(
+            'mx_get_snapshot', None, time.monotonic() - start,
+            get_size(queries), get_size(replies))
+        self._finish_mx_request()
+        try:
+            callback(self._decode_snapshot(replies))
+        finally:
+            self._dispatch_mx_requests()
+
+    def _finish_mx_request(self):
+        self._mx_pending = None
+        self._mx_pending_timer.stop()
+
+    def _on_mx_request_timeout(self):
+        """Give up the pending request unless the kernel is busy"""
+        if self._mx_pending is None:
+            return
+        elif self._executing:
+            self._mx_pending_timer.start()
+            return
+
+        # Recorded without the latency not to lengthen the next timeouts
+        queries = self._mx_pending[0]
+        self.mx_rpc_stats.record(
+            'mx_get_snapshot', None, None,
+            get_size(queries), 0, is_error=True)
+        self._finish_mx_request()
+        self._dispatch_mx_requests()
+
+    def _get_snapshot(self, queries):
+
+        if self._mx_snapshot_supported is not False:
+            try:
+                replies = self._call_kernel_timed(
+                    'mx_get_snapshot', cloudpickle.dumps(queries))
+                self._mx_snapshot_supported = True
+                return self._decode_snapshot(replies)
+            except Exception as e:
+                if not _is_missing_handler(e):
+                    raise
+                self._mx_snapshot_supported = False
+
+        return [self._call_one_by_one(method, args, kwargs)
+                for method, args, kwargs in queries]
+
+    def _decode_snapshot(self, replies):
+        """Unpickle the list of the replies
+
+        The values are not pickled by the methods of the kernels
+        for Spyder 5 or older.
+        """
+        return [(is_error, value) for is_error, value
+                in cloudpickle.loads(replies)]
+
+    def _call_one_by_one(self, method, args, kwargs):
+
+        try:
+            value = self._call_kernel_timed(method, *args, **kwargs)
+        except Exception as e:
+            return True, (type(e).__name__, str(e))
+
+        return False, value
+
+    def _call_or_exec(self, method, args, get_code):
+        """Call method by comm, or execute code if the kernel lacks method
+
+        ``get_code`` is called to get the code to execute silently
+        when Spyder is older than 4, or the kernel does not have ``method``
+        or has ``method`` not taking ``args``.
+        """
+        if spyder.version_info > (4,) and method not in self._mx_missing:
+            try:
+                return self._call_kernel_timed(method, *args)
+            except Exception as e:
+                if not (_is_missing_handler(e)
+                        or _is_signature_error(e, method)):
+                    raise
+                self._mx_missing.add(method)
+
+        self._mx_wait_reply(None, self.sig_mxupdated, get_code())
+
+    def update_mx_widgets(self, priority=PRIORITY_VISIBLE):
+        """Update the modelx widgets in one request
+
+        The model shown in the tree is the selected one before the
+        model list is updated. If the selection changes by the update,
+        the tree and the data list are updated again.
+        """
+        name = self.mxmodelselector.get_selected_model()
+
+        keys = ['modellist', 'modeltree']
+        queries = [('mx_get_modellist', (), {}),
+                   self._get_modeltree_query(name)]
+
+        if name:
+            keys.append('datalist')
+            queries.append(('mx_get_value_info', (name,), {}))
+
+        objid = self.mxproperty.objectId
+        if objid:
+            keys.append('property')
+            queries.append(self._get_mxproperty_query(objid))
+
+        for adj in ['precedents', 'succs']:
+            for key, query in self._get_mxanalyzer_queries(adj):
+                keys.append(key)
+                queries.append(query)
+
+        self.get_snapshot(
+            queries,
+            lambda replies: self._apply_mx_widgets_replies(
+                name, dict(zip(keys, replies))),
+            priority
+        )
+
+    def _apply_mx_widgets_replies(self, name, replies):
+
+        mlist = _get_reply_value(replies['modellist'])
+        newname = self.mxmodelselector.get_selected_model(mlist)
+
+        if newname == name:
+            self.mxexplorer.process_remote_view(
+                _get_reply_value(replies['modeltree']))
+            if 'datalist' in replies:
+                self.mxdatalist.process_remote_view(
+                    _get_reply_value(replies['datalist']))
+        else:
+            self.update_modeltree(newname)
+            self.update_datalist()
+
+        if 'property' in replies:
+            self.mxproperty.process_remote_view(
+                _get_reply_value(replies['property']))
+
+        for adj in ['precedents', 'succs']:
+            self._apply_mxanalyzer_replies(adj, replies)
+
     # ---- modelx browser ----
     def set_mxexplorer(self, mxexplorer, mxmodelselector):
         """Set namespace browser widget"""
@@ -175,7 +457,7 @@ class MxShellWidget(ShellWidget):
 
         if spyder.version_info > (4,):
             result = self.call_kernel(
-                interrupt=True,
+                interrupt=False,
                 blocking=True,
                 timeout=CALL_KERNEL_TIMEOUT).mx_get_value(
                 msgtype, obj, args, calc
@@ -232,11 +514,10 @@ class MxShellWidget(ShellWidget):
             return
 
         if spyder.version_info > (4,):
-            result = self.call_kernel(
-                interrupt=True,
-                blocking=True,
-                timeout=CALL_KERNEL_TIMEOUT).mx_get_value_info(model)
-            self.mxdatalist.process_remote_view(result)
+            self.get_snapshot(
+                [('mx_get_value_info', (model,), {})],
+                lambda replies: self.mxdatalist.process_remote_view(
+                    _get_reply_value(replies[0])))
         else:
             code = "get_ipython().kernel.mx_get_value_info('%s')" % model
             self.mx_silent_exec_method(code, msgtype='get_value_info')
@@ -250,9 +531,25 @@ class MxShellWidget(ShellWidget):
 
     def update_codelist(self, objname):
         """Update codelist"""
-        objname = '"' + objname + '.cells' + '"'
-        method = 'get_ipython().kernel.mx_get_codelist(%s)' % objname
-        self.mx_silent_exec_method(method, msgtype='codelist')
+        fullname = objname + '.cells'
+        code = 'get_ipython().kernel.mx_get_codelist("%s")' % fullname
+
+        if (spyder.version_info > (4,)
+                and 'mx_get_codelist' not in self._mx_missing):
+            self.get_snapshot(
+                [('mx_get_codelist', (fullname,), {})],
+                lambda replies: self._process_codelist_reply(
+                    code, replies[0]))
+        else:
+            self.mx_silent_exec_method(code, msgtype='codelist')
+
+    def _process_codelist_reply(self, code, reply):
+
+        if _is_missing_reply(reply, 'mx_get_codelist'):
+            self._mx_missing.add('mx_get_codelist')
+            self.mx_silent_exec_method(code, msgtype='codelist')
+        else:
+            self.mxcodelist.process_remote_view(_get_reply_value(reply))
 
     # ---- modelx analyzer ----
     def set_mxanalyzer(self, analyzer):
@@ -286,10 +583,8 @@ class MxShellWidget(ShellWidget):
     def get_attrdict(self, fullname=None, attrs=None, recursive=False):
 
         if spyder.version_info > (4,):
-            return self.call_kernel(
-                interrupt=True,
-                blocking=True,
-                timeout=CALL_KERNEL_TIMEOUT).mx_get_attrdict(
+            return self._call_kernel_timed(
+                'mx_get_attrdict',
                 fullname=fullname, attrs=attrs, recursive=recursive
             )
         else:
@@ -307,6 +602,23 @@ class MxShellWidget(ShellWidget):
 
         tab = self.mxanalyzer.tabs[adjacency]
 
+        if spyder.version_info > (4,):
+            if tab.object_radio.isChecked() and not tab.attrdict:
+                return
+
+            keys, queries = [], []
+            for key, query in self._get_mxanalyzer_queries(
+                    adjacency, update_attrdict):
+                keys.append(key)
+                queries.append(query)
+
+            if queries:
+                self.get_snapshot(
+                    queries,
+                    lambda replies: self._apply_mxanalyzer_replies(
+                        adjacency, dict(zip(keys, replies))))
+            return
+
         if tab.object_radio.isChecked():
             if not tab.attrdict:
                 return
@@ -324,37 +636,82 @@ class MxShellWidget(ShellWidget):
         elif tab.expr_radio.isChecked():
             self._update_mxanalyzer_expr(adjacency)
 
-    def _update_mxanalyzer_obj(self, adjacency, update_attrdict):
+    def _get_mxanalyzer_queries(self, adjacency, update_attrdict=True):
+        """Get keys and queries to update an analyzer tab"""
 
         tab = self.mxanalyzer.tabs[adjacency]
         msgtype = "analyze_" + adjacency + "_setnode"
-        obj = tab.attrdict['fullname']
-        argtxt = tab.argbox.get_expr()
-        args = "(" + argtxt + ("," if argtxt else "") + ")"
+        queries = []
 
-        if spyder.version_info > (4,):
+        if tab.object_radio.isChecked():
+            if not tab.attrdict:
+                return queries
 
-            try:
-                result = self.call_kernel(
-                    interrupt=True,
-                    blocking=True,
-                    timeout=CALL_KERNEL_TIMEOUT).mx_get_node(
-                    msgtype, obj, args
-                )
-                # logger.debug(f"_update_mxanalyzer_obj:args: {args}")
-                # logger.debug(f"_update_mxanalyzer_obj:reesults: {result}")
+            obj = tab.attrdict['fullname']
+            if update_attrdict:
+                queries.append((adjacency + '_attrdict',
+                                self._get_mxproperty_query(obj)))
+
+            argtxt = tab.argbox.get_expr()
+            args = "(" + argtxt + ("," if argtxt else "") + ")"
+            queries.append((adjacency + '_node', (
+                'mx_get_node', (msgtype, obj, args), {})))
+
+        elif tab.expr_radio.isChecked():
+            objexpr = tab.exprobjbox.get_expr()
+            argexpr = tab.exprargbox.get_expr()
+
+            # Contribution from bakerwy
+            # https://github.com/fumitoh/modelx/discussions/183#discussion-8668563
+
+            # Invalid expression
+            if objexpr and argexpr is not None:
+                argstr = "(" + argexpr + ("," if argexpr else "") + ")"
+                queries.append((adjacency + '_node', (
+                    'mx_eval_node', (objexpr, argstr), {})))
+
+        return queries
+
+    def _apply_mxanalyzer_replies(self, adjacency, replies):
+        """Update an analyzer tab by the replies"""
+
+        tab = self.mxanalyzer.tabs[adjacency]
+        if not any(key.startswith(adjacency) for key in replies):
+            return
+
+        key = adjacency + '_attrdict'
+        if key in replies:
+            tab.attrdict = _get_reply_value(replies[key])
+
+        if tab.object_radio.isChecked():
+            if not tab.attrdict:
+                tab.clear_obj()
+                return
+            tab.set_argbox()
+
+        key = adjacency + '_node'
+        if key in replies:
+            is_error, result = replies[key]
+            if is_error:
+                self.mxanalyzer.update_status(
+                    adjacency, False, "%s: %s" % result)
+            else:
                 self.mxanalyzer.update_status(adjacency, True)
                 self.sig_mxanalyzer.emit(adjacency, result)
-            except Exception as e:
-                msg = e.__class__.__name__ + ": " + str(e)
-                self.mxanalyzer.update_status(adjacency, False, msg)
 
-        else:
-            str1 = "get_ipython().kernel.mx_get_node"
-            str2 = "('%s', '%s', '%s')" % (msgtype, obj, args)
-            #Issue: need to double quote string args
+    def _update_mxanalyzer_obj(self, adjacency, update_attrdict):
+
+        tab = self.mxanalyzer.tabs[adjacency]
+        msgtype = "analyze_" + adjacency + "_setnode"
+        obj = tab.attrdict['fullname']
+        argtxt = tab.argbox.get_expr()
+        args = "(" + argtxt + ("," if argtxt else "") + ")"
 
-            self.mx_silent_exec_method(str1+str2, msgtype=msgtype)
+        str1 = "get_ipython().kernel.mx_get_node"
+        str2 = "('%s', '%s', '%s')" % (msgtype, obj, args)
+        #Issue: need to double quote string args
+
+        self.mx_silent_exec_method(str1+str2, msgtype=msgtype)
 
 
     def _update_mxanalyzer_expr(self, adjacency):
@@ -369,34 +726,15 @@ class MxShellWidget(ShellWidget):
             return
 
         if objexpr:
+            expr = objexpr + ".node(" + argexpr + ")"
+            msgtype = "analyze_" + adjacency + "_setnode"
+            msgtype_quotes = "\"" + msgtype + "\""
 
-            # Contribution from bakerwy
-            # https://github.com/fumitoh/modelx/discussions/183#discussion-8668563
-
-            if spyder.version_info > (4,):  # This part added
-
-                try:
-                    argstr = "(" + argexpr + ("," if argexpr else "") + ")"
-                    result = self.call_kernel(
-                        interrupt=True, blocking=True,
-                        timeout=CALL_KERNEL_TIMEOUT
-                    ).mx_eval_node(objexpr, argstr)
+            str1 = "get_ipython().kernel.mx_get_evalresult"
+            str2 = "(%s, %s." % (msgtype_quotes, expr)
+            str3 = "_get_attrdict(recursive=False, extattrs=['formula']))"
 
-                    self.mxanalyzer.update_status(adjacency, True)
-                    self.sig_mxanalyzer.emit(adjacency, result)
-                except Exception as e:
-                    self.mxanalyzer.update_status(
-                        adjacency, False, f"{type(e).__name__}: {e}")
-            else:
-                expr = objexpr + ".node(" + argexpr + ")"
-                msgtype = "analyze_" + adjacency + "_setnode"
-                msgtype_quotes = "\"" + msgtype + "\""
-
-                str1 = "get_ipython().kernel.mx_get_evalresult"
-                str2 = "(%s, %s." % (msgtype_quotes, expr)
-                str3 = "_get_attrdict(recursive=False, extattrs=['formula']))"
-
-                self.mx_silent_exec_method(str1+str2+str3, msgtype=msgtype)
+            self.mx_silent_exec_method(str1+str2+str3, msgtype=msgtype)
 
     def update_mxanalyzer_all(self):
         for adj in ['precedents', 'succs']:
@@ -409,7 +747,7 @@ class MxShellWidget(ShellWidget):
 
         if spyder.version_info > (4,):
             result = self.call_kernel(
-                interrupt=True,
+                interrupt=False,
                 blocking=True,
                 timeout=CALL_KERNEL_TIMEOUT).mx_get_adjacent(
                 msgtype, obj, jsonargs, adjacency
@@ -452,11 +790,23 @@ class MxShellWidget(ShellWidget):
             lambda data: self.mxproperty.process_remote_view(data))
 
     def update_mxproperty(self, objname):
+
+        if spyder.version_info > (4,):
+            self.get_snapshot(
+                [self._get_mxproperty_query(objname)],
+                lambda replies: self.mxproperty.process_remote_view(
+                    _get_reply_value(replies[0])))
+            return
+
         param = "'property', '%s', ['formula', '_evalrepr', 'allow_none', 'parameters']" % objname
         code = "get_ipython().kernel.mx_get_object(" + param + ")"
         val = self.mx_silent_exec_method(code, msgtype="property")
         return val
 
+    def _get_mxproperty_query(self, objname):
+        return ('mx_get_attrdict', (),
+                dict(fullname=objname, attrs=_PROPERTY_ATTRS, recursive=False))
+
     def reload_mxproperty(self):
         objid = self.mxproperty.objectId
         if objid:
@@ -490,10 +840,7 @@ class MxShellWidget(ShellWidget):
     def get_modellist(self):
 
         if spyder.version_info > (4,):
-            mlist = self.call_kernel(
-                interrupt=True,
-                blocking=True,
-                timeout=CALL_KERNEL_TIMEOUT).mx_get_modellist()
+            mlist = self._call_kernel_timed('mx_get_modellist')
         else:
             code = "get_ipython().kernel.mx_get_modellist()"
             mlist = self._mx_wait_reply(code, self.sig_mxmodellist)
@@ -502,6 +849,13 @@ class MxShellWidget(ShellWidget):
 
     def update_modeltree(self, name):
 
+        if spyder.version_info > (4,):
+            self.get_snapshot(
+                [self._get_modeltree_query(name)],
+                lambda replies: self.mxexplorer.process_remote_view(
+                    _get_reply_value(replies[0])))
+            return
+
         if name:
             arg = "'%s'" % name
         else:
@@ -515,6 +869,11 @@ class MxShellWidget(ShellWidget):
         )
         # self.update_mxdataview()    # TODO: Redundant?
 
+    def _get_modeltree_query(self, name):
+        return ('mx_get_attrdict', (),
+                dict(fullname=name or None, attrs=_MODELTREE_ATTRS,
+                     recursive=True))
+
     def new_model(self, name=None, define_var=False, varname=''):
 
         if spyder.version_info > (4,):
@@ -567,19 +926,22 @@ class MxShellWidget(ShellWidget):
 
     def new_space(self, model, parent, name, bases, define_var, varname):
 
-        paramlist = "'%s', '%s', '%s', '%s', %s, '%s'" % (
-            model, parent, name, bases, str(define_var), varname
-        )
-        code = "get_ipython().kernel.mx_new_space(" + paramlist + ")"
-        self._mx_wait_reply(
-                None,
-                self.sig_mxupdated,
-                code
+        def get_code():
+            paramlist = "'%s', '%s', '%s', '%s', %s, '%s'" % (
+                model, parent, name, bases, str(define_var), varname
             )
+            return "get_ipython().kernel.mx_new_space(" + paramlist + ")"
+
+        self._call_or_exec(
+            'mx_new_space',
+            (model, parent, name, bases, define_var, varname),
+            get_code
+        )
         self.refresh_namespacebrowser()
 
     def new_cells(self, model, parent, name, formula, define_var, varname):
 
+        source = formula    # Passed to the kernel as is by comm
         if formula:
 
             try:
@@ -598,34 +960,33 @@ class MxShellWidget(ShellWidget):
                 QMessageBox.critical(self, title="Error", text="Syntax error")
                 return
 
-        paramlist = "'%s', '%s', '%s', %s, '%s'" % (
-            model, parent, name, str(define_var), varname
-        )
-        code = "get_ipython().kernel.mx_new_cells(" + paramlist + ")"
-        code = formula + "\n" + code
+        def get_code():
+            paramlist = "'%s', '%s', '%s', %s, '%s'" % (
+                model, parent, name, str(define_var), varname
+            )
+            code = "get_ipython().kernel.mx_new_cells(" + paramlist + ")"
+            return formula + "\n" + code
 
-        self._mx_wait_reply(
-            None,
-            self.sig_mxupdated,
-            code
+        self._call_or_exec(
+            'mx_new_cells',
+            (model, parent, name, define_var, varname, source),
+            get_code
         )
         self.refresh_namespacebrowser()
 
     def set_formula(self, fullname, formula):
 
+        source = formula    # Passed to the kernel as is by comm
         if is_funcdef(formula):
             formula = replace_funcname(formula, "__mx_temp")
         elif is_lambda(formula):
             formula = "__mx_temp = " + formula.lstrip()
 
-        code = "get_ipython().kernel.mx_set_formula('%s')" % fullname
-        code = formula + "\n" + code
+        def get_code():
+            code = "get_ipython().kernel.mx_set_formula('%s')" % fullname
+            return formula + "\n" + code
 
-        self._mx_wait_reply(
-            None,
-            self.sig_mxupdated,
-            code
-        )
+        self._call_or_exec('mx_set_formula', (fullname, source), get_code)
         self.refresh_namespacebrowser()
 
     def del_object(self, parent, name):
@@ -740,12 +1101,7 @@ class MxShellWidget(ShellWidget):
             elif self.kernel_client.comm_channel is None:
                 return
             if self.namespacebrowser and self.spyder_kernel_comm.is_open():
-                mlist = self.get_modellist()
-                name = self.mxmodelselector.get_selected_model(mlist)
-                self.update_modeltree(name)
-                self.reload_mxproperty()
-                self.update_datalist()
-                self.update_mxanalyzer_all()
+                self.update_mx_widgets()
 
 
     # ---- Private API (defined by us) ------------------------------
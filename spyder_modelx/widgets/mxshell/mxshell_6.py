@@ -47,9 +47,12 @@ import logging
 import ast
 import uuid
 import time
+import functools
 from collections import namedtuple
+from contextlib import contextmanager
 import cloudpickle
-from qtpy.QtCore import Signal, Slot, Qt, QEventLoop
+from qtpy.QtCore import (
+    Signal, Slot, Qt, QEventLoop, QTimer, QObject, QEvent)
 from qtpy.QtWidgets import QMessageBox
 # from spyder.widgets.reporterror import SpyderErrorDialog
 
@@ -59,6 +62,17 @@ from spyder.plugins.ipythonconsole.widgets.client import ShellWidget
 from spyder.utils import encoding
 
 from spyder_modelx.utility.tupleencoder import TupleEncoder, hinted_tuple_hook
+from spyder_modelx.utility.treedelta import prune_tree
+from spyder_modelx.utility.projection import project_attrdict
+from spyder_modelx.utility import mxcodec
+from spyder_modelx.utility.attrdictcache import AttrDictCache, get_model_name
+from spyder_modelx.utility.rpcstats import RpcStats, get_size
+from spyder_modelx.utility.modelchanges import (
+    ModelChanges, NEW, DELETE, FORMULA, CLEAR)
+from spyder_modelx.utility.requestqueue import (
+    RequestQueue, PRIORITY_EDIT, PRIORITY_VISIBLE, PRIORITY_PREFETCH)
+from spyder_modelx.widgets.mxdataviewer.remoteframe import (
+    RemoteFrame, REMOTE_MIN_SIZE, WINDOW_ROWS, WINDOW_COLS)
 from spyder_modelx.utility.formula import (
     is_funcdef, is_lambda, replace_funcname, get_funcname)
 
@@ -69,6 +83,31 @@ from spyder.plugins.ipythonconsole.widgets.namespacebrowser import (
 
 logger = logging.getLogger(__name__)
 
+# The timeouts of the calls to the kernel in seconds are
+# TIMEOUT_FACTOR times the 95th percentiles of the latencies of
+# the methods, but not less than CALL_KERNEL_TIMEOUT or more than
+# MAX_CALL_TIMEOUT.
+TIMEOUT_FACTOR = 4
+MAX_CALL_TIMEOUT = 600
+
+# Maximum number of the tree nodes updated one by one by notified changes.
+# The tree is updated as a whole if more nodes are changed.
+MAX_NODE_UPDATES = 50
+
+# Kinds of the changes to refresh the data viewer tabs
+_DATAVIEW_KINDS = (NEW, DELETE, FORMULA, CLEAR)
+
+# Value of the replies omitted by the kernel as unchanged
+_UNCHANGED = object()
+
+# Reply to the queries given up without replies from the kernel
+_TIMEOUT_REPLY = (True, ('TimeoutError', 'No reply from the kernel'))
+
+# Requests queued by MxShellWidget.get_snapshot
+# get_queries returns the queries to send, or None if cancelled.
+_SnapshotJob = namedtuple(
+    '_SnapshotJob', ['get_queries', 'callback', 'on_error', 'origin'])
+
 def _quote_string(arg):
     if arg:
         return "'%s'" % arg
@@ -76,27 +115,1020 @@ def _quote_string(arg):
         return ""
 
 
+# Kernel methods whose return values are cloudpickled by the kernel.
+_PICKLED_REPLIES = [
+    'mx_get_attrdict',
+    'mx_get_value',
+    'mx_get_node',
+    'mx_eval_node',
+    'mx_get_adjacent',
+    'mx_get_tree_delta',
+    'mx_open_frame',
+    'mx_get_frame_window',
+    'mx_sort_frame'
+]
+
+
+# Attributes requested by each widget in addition to the default ones
+_MODELTREE_ATTRS = ['_is_derived', '__len__', '_evalrepr']
+_PROPERTY_ATTRS = ['formula', '_evalrepr', 'allow_none', 'parameters']
+
+# Fields of attrdicts rendered by each widget by object type.
+# See spyder_modelx.utility.projection
+_BASE_FIELDS = ['id', 'type', 'name', 'fullname', 'repr', '_evalrepr']
+_SPACE_TREE_FIELDS = _BASE_FIELDS + [
+    'namedid', 'parameters', '_is_derived',
+    '_named_itemspaces', 'named_spaces', 'cells', 'refs']
+
+_MODELTREE_FIELDS = {
+    'Model': _BASE_FIELDS + ['spaces', 'refs'],
+    'UserSpace': _SPACE_TREE_FIELDS,
+    'ItemSpace': _SPACE_TREE_FIELDS + ['argvalues'],
+    'DynamicSpace': _SPACE_TREE_FIELDS + ['argvalues'],
+    'Cells': _BASE_FIELDS + [
+        'namedid', 'parameters', '_is_derived', '__len__'],
+    'Reference': _BASE_FIELDS + ['namedid', '_is_derived', 'value_type']
+}
+
+# Fields of the tree of the spaces listed in the dialogs of the explorer
+_SPACE_LIST_FIELDS = {
+    'Model': ['type', 'fullname', 'spaces'],
+    'UserSpace': ['type', 'fullname', 'namedid', 'named_spaces']
+}
+
+_PROPERTY_FIELDS = {
+    'UserSpace': _BASE_FIELDS + [
+        'parameters', 'bases', 'allow_none', 'formula'],
+    'ItemSpace': _BASE_FIELDS + ['bases'],
+    'DynamicSpace': _BASE_FIELDS + [
+        'parameters', 'bases', 'allow_none', 'formula'],
+    'Cells': _BASE_FIELDS + ['parameters', 'allow_none', 'formula'],
+    'Reference': _BASE_FIELDS + ['value_type']
+}
+
+
+def _is_missing_handler(error):
+    """Check if error is raised because the kernel lacks the called method"""
+    return (type(error).__name__ == 'CommError'
+            and 'No such spyder call type' in str(error))
+
+
+def _is_missing_reply(reply, method):
+    """Check if reply is an error because the kernel lacks method"""
+    is_error, value = reply
+    return is_error and value[0] in (
+        'CommError', 'AttributeError') and method in value[1]
+
+
+def _is_fields_error(reply):
+    """Check if reply is an error because the kernel does not take fields"""
+    is_error, value = reply
+    return is_error and "unexpected keyword argument 'fields'" in value[1]
+
+
+def _has_fields(query):
+    method, args, kwargs = query
+    if method == 'mx_get_hashed':
+        return _has_fields(args[0])
+    return 'fields' in kwargs
+
+
+def _remove_fields(query):
+    """Remove fields from mx_get_attrdict query for older kernels"""
+    method, args, kwargs = query
+    if method == 'mx_get_attrdict':
+        kwargs = {k: v for k, v in kwargs.items() if k != 'fields'}
+    elif method == 'mx_get_hashed':
+        args = (_remove_fields(args[0]),) + tuple(args[1:])
+    return method, args, kwargs
+
+
+def _is_shareable(method):
+    """Check if the queries of method can share their replies"""
+    return method.startswith('mx_get_') or method == 'mx_eval_node'
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    else:
+        hash(value)
+        return value
+
+
+def _get_query_key(query):
+    """Get a hashable key of query, or None if the query is not shareable"""
+    method, args, kwargs = query
+    if not _is_shareable(method):
+        return None
+    try:
+        return method, _freeze(args), _freeze(kwargs)
+    except TypeError:
+        return None
+
+
+def _get_reply_value(reply):
+    """Get the value of a reply from get_snapshot or raise its error"""
+    is_error, value = reply
+    if is_error:
+        raise RuntimeError("%s: %s" % value)
+    return value
+
+
+def _rpc_origin(origin):
+    """Attribute the kernel calls made by the decorated method to origin"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.mx_rpc_origin(origin):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _TimedCallFactory:
+    """Factory of remote calls recording the calls of mx_* methods"""
+
+    def __init__(self, shell, settings):
+        self.shell = shell
+        self.settings = settings
+
+    def __getattr__(self, name):
+        if not name.startswith('mx_'):
+            return getattr(
+                ShellWidget.call_kernel(self.shell, **self.settings), name)
+
+        def call(*args, **kwargs):
+            stats = self.shell.mx_rpc_stats
+            origin = self.shell._mx_rpc_origin
+            request_bytes = get_size((args, kwargs))
+            blocking = self.settings.get('blocking')
+            callback = self.settings.get('callback')
+
+            settings = self.settings
+            if callback is not None and not blocking:
+                def timed_callback(reply):
+                    stats.record(name, origin, time.perf_counter() - start,
+                                 request_bytes, get_size(reply))
+                    return callback(reply)
+                settings = dict(settings, callback=timed_callback)
+
+            start = time.perf_counter()
+            try:
+                reply = getattr(ShellWidget.call_kernel(
+                    self.shell, **settings), name)(*args, **kwargs)
+            except Exception as e:
+                # The time waited for no reply is not a latency
+                stats.record(name, origin,
+                             None if isinstance(e, TimeoutError)
+                             else time.perf_counter() - start,
+                             request_bytes, 0, is_error=True)
+                raise
+
+            if blocking:
+                stats.record(name, origin, time.perf_counter() - start,
+                             request_bytes, get_size(reply))
+            elif callback is None:
+                stats.record(name, origin, None, request_bytes, 0)
+
+            return reply
+
+        return call
+
+
+class _PaneWatcher(QObject):
+    """Call on_shown with the key of a watched widget when it is shown"""
+
+    def __init__(self, parent, on_shown):
+        super().__init__(parent)
+        self.on_shown = on_shown
+        self.keys = {}
+
+    def watch(self, key, widget):
+        if widget not in self.keys:
+            widget.installEventFilter(self)
+        self.keys[widget] = key
+
+    def unwatch(self, widget):
+        self.keys.pop(widget, None)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Show and obj in self.keys:
+            self.on_shown(self.keys[obj])
+        return False
+
+
 class MxShellWidget(ShellWidget):
     """Custom shell widget for modelx"""
 
+    # Send requests of the modelx widgets without blocking the GUI
+    # if the kernel supports mx_get_snapshot.
+    mx_async = True
+
+    # Quiet period in milliseconds to wait for further kernel state
+    # notifications before refreshing the modelx widgets.
+    # The widgets are refreshed without delay if 0.
+    # Overridden per shell by the refresh_delay option of the plugin.
+    mx_refresh_delay = 200
+
     def __init__(self, *args, **kw):
 
         self._mx_exec = {}
+
+        # None until the first call of mx_get_snapshot tells
+        # whether the kernel supports it. False for older kernels.
+        self._mx_snapshot_supported = None
+        self._mx_tree_delta_supported = None
+        self._mx_fields_supported = None
+        self._mx_codec_supported = None
+        self._mx_frame_supported = None
+        self._mx_versions_supported = None
+        self._mx_notify_supported = None
+        self._mx_hash_supported = None
+
+        # Pairs of the key of the last query and the hash of its reply
+        # by pane, see _get_hashed_query
+        self._mx_reply_hashes = {}
+
+        # Changes of models notified by the kernel and
+        # the data viewer tabs to refresh by them
+        self._mx_changes = ModelChanges()
+        self._mx_dataviews = []
+
+        self._mx_attrdict_cache = AttrDictCache()
+
+        # Records of the calls to the kernel and
+        # the widget triggering the current calls
+        self.mx_rpc_stats = RpcStats()
+        self._mx_rpc_origin = None
+
+        # Requests waiting for the pending request to return
+        self._mx_queue = RequestQueue()
+        self._mx_pending = None
+
+        # Keys of the queries sent by the pending request and
+        # pairs of the serial numbers of the sends and
+        # the callbacks waiting for their replies
+        self._mx_inflight = {}
+        self._mx_send_count = 0
+
+        # The widgets showing the results of requests and
+        # the serial numbers of their last requests
+        self._mx_panes = {}
+        self._mx_pane_requests = {}
+        self._mx_request_count = 0
+
+        # The panes not refreshed while hidden
+        self._mx_dirty = set()
+
         super(MxShellWidget, self).__init__(*args, **kw)
-        self.sig_kernel_state_arrived.connect(self.update_mx_widgets)
+
+        # Copied from the plugin's dict by ShellWidget
+        self.kernel_comm_handlers[
+            'mx_models_changed'] = self.handle_mx_models_changed
+
+        self._mx_refresh_timer = QTimer(self)
+        self._mx_refresh_timer.setSingleShot(True)
+        self._mx_refresh_timer.timeout.connect(self._refresh_mx_widgets)
+
+        self._mx_pending_timer = QTimer(self)
+        self._mx_pending_timer.setSingleShot(True)
+        self._mx_pending_timer.timeout.connect(self._on_mx_request_timeout)
+
+        self._mx_pane_watcher = _PaneWatcher(self, self._on_mx_pane_shown)
+
+        self.sig_kernel_state_arrived.connect(self.schedule_mx_widgets_update)
+        self.sig_kernel_is_ready.connect(self._reset_mx_notification)
+
+    def call_kernel(self, interrupt=False, blocking=False, callback=None,
+                    timeout=None, display_error=False):
+        """Send message to the kernel recording the calls in mx_rpc_stats"""
+        return _TimedCallFactory(self, dict(
+            interrupt=interrupt, blocking=blocking, callback=callback,
+            timeout=timeout, display_error=display_error))
+
+    @contextmanager
+    def mx_rpc_origin(self, origin):
+        """Attribute the kernel calls made in the context to origin
+
+        If the context is nested, the outermost origin is taken.
+        """
+        outer = self._mx_rpc_origin
+        if outer is None:
+            self._mx_rpc_origin = origin
+        try:
+            yield
+        finally:
+            self._mx_rpc_origin = outer
+
+    def _get_timeout(self, method):
+        """Get the timeout of method adapted to its latencies"""
+        return self.mx_rpc_stats.get_timeout(
+            method, CALL_KERNEL_TIMEOUT, TIMEOUT_FACTOR, MAX_CALL_TIMEOUT)
+
+    @Slot(dict)
+    def schedule_mx_widgets_update(self, kernel_state):
+        """Update the modelx widgets after the quiet period
+
+        Notifications arriving in the quiet period restart the period,
+        so a burst of notifications results in one update.
+        If the kernel notifies the changes of models, the update is
+        skipped while no changes are notified.
+        """
+        if self._mx_notify_supported:
+            if not self._mx_changes:
+                return
+        else:
+            self._mx_attrdict_cache.expire()
+
+        if self.mx_refresh_delay > 0:
+            self._mx_refresh_timer.start(self.mx_refresh_delay)
+        else:
+            self._refresh_mx_widgets()
+
+    def _refresh_mx_widgets(self):
+        if self._mx_notify_supported:
+            if self._mx_changes:
+                self.update_changed_mx_widgets(self._mx_changes.take())
+        else:
+            self.update_mx_widgets({})
+
+    def handle_mx_models_changed(self, changes):
+        """Handle the changes of models notified by the kernel
+
+        See :mod:`spyder_modelx.utility.modelchanges`.
+        """
+        self._mx_changes.update(changes)
+        for model, kind, objects in changes:
+            self._mx_attrdict_cache.expire(model)
+        self.schedule_mx_widgets_update({})
+
+    def _reset_mx_notification(self):
+        """Subscribe to the changes again at the next update"""
+        self._mx_notify_supported = None
+        self._mx_changes.take()
 
     @Slot(dict)
-    def update_mx_widgets(self, kernel_state):
+    def update_mx_widgets(self, kernel_state, priority=PRIORITY_VISIBLE,
+                          panes=None):
         """
         Modified from update_view in plugins/variableexplorer/widgets/namespacebrowser.py
+
+        Only ``panes`` are updated if given. The hidden panes are
+        marked dirty and updated when they are shown.
         """
         # logger.debug("Updating mx widgets...")
-        mlist = self.get_modellist()
-        name = self.mxmodelselector.get_selected_model(mlist)
-        self.update_modeltree(name)
-        self.reload_mxproperty()
-        self.update_datalist()
-        self.update_mxanalyzer_all()
+
+        if panes is None:
+            # Updating now makes a scheduled update unnecessary
+            self._mx_refresh_timer.stop()
+            self._mx_attrdict_cache.expire()
+            self._mx_changes.take()
+
+        # The model shown in the tree is the selected one before the
+        # model list is updated. If the selection changes by the update,
+        # the tree and the data list are updated again.
+        name = self.mxmodelselector.get_selected_model()
+
+        requests = [('modeltree', 'modellist', ('mx_get_modellist', (), {})),
+                    ('modeltree', 'modeltree', self._get_modeltree_query(name))]
+
+        if name:
+            requests.append(
+                ('datalist', 'datalist', self._get_datalist_query(name)))
+
+        objid = self.mxproperty.objectId
+        if objid:
+            requests.append(
+                ('property', 'property', self._get_mxproperty_query(objid)))
+
+        for adj in ['precedents', 'succs']:
+            for key, query in self._get_mxanalyzer_queries(adj):
+                requests.append((adj, key, query))
+
+        if panes is not None:
+            requests = [req for req in requests if req[0] in panes]
+
+        requests = self._add_kernel_requests(
+            self._get_visible_requests(requests))
+
+        if requests:
+            queries = {key: query for _pane, key, query in requests}
+            self.send_mx_requests(
+                requests,
+                lambda replies, panes: self._apply_mx_widgets_replies(
+                    name, queries, replies, panes),
+                priority
+            )
+
+    def update_changed_mx_widgets(self, changes):
+        """Update the modelx widgets affected by the notified changes
+
+        The model list is updated if any model has objects created or
+        deleted, and the tree and the data list are updated if the
+        selected model has. Otherwise only the changed Cells and
+        References in the tree are updated.
+        """
+        name = self.mxmodelselector.get_selected_model()
+        requests = []
+        nodes = {}
+
+        if changes.is_structural():
+            requests.append(
+                ('modeltree', 'modellist', ('mx_get_modellist', (), {})))
+
+        if name and changes.is_structural(name):
+            requests.append(
+                ('modeltree', 'modeltree', self._get_modeltree_query(name)))
+            requests.append(
+                ('datalist', 'datalist', self._get_datalist_query(name)))
+
+        elif name in changes.models:
+            nodes = self.mxexplorer.get_leaf_paths(
+                name, changes.get_objects(name))
+            if nodes is None or len(nodes) > MAX_NODE_UPDATES:
+                nodes = {}
+                requests.append(
+                    ('modeltree', 'modeltree', self._get_modeltree_query(name)))
+            for fullname in nodes:
+                requests.append(
+                    ('modeltree', ('node', fullname),
+                     ('mx_get_attrdict', (),
+                      dict(fullname=fullname, attrs=_MODELTREE_ATTRS,
+                           recursive=False, fields=_MODELTREE_FIELDS))))
+
+        objid = self.mxproperty.objectId
+        if objid and (changes.is_changed(objid) or
+                      changes.is_structural(get_model_name(objid))):
+            requests.append(
+                ('property', 'property', self._get_mxproperty_query(objid)))
+
+        for adj in ['precedents', 'succs']:
+            tab = self.mxanalyzer.tabs[adj]
+            if (tab.expr_radio.isChecked() or (tab.attrdict and get_model_name(
+                    tab.attrdict['fullname']) in changes.models)):
+                for key, query in self._get_mxanalyzer_queries(adj):
+                    requests.append((adj, key, query))
+
+        # New values are not displayed, as they are calculated by
+        # the tabs themselves in most cases.
+        for pane in list(self._mx_dataviews):
+            if pane.attrdict and changes.is_changed(
+                    pane.attrdict['fullname'], _DATAVIEW_KINDS):
+                if self._is_mx_pane_visible(pane):
+                    self._refresh_mx_dataview(pane)
+                else:
+                    self._mx_dirty.add(pane)
+
+        requests = self._add_kernel_requests(
+            self._get_visible_requests(requests))
+
+        if requests:
+            queries = {key: query for _pane, key, query in requests}
+            self.send_mx_requests(
+                requests,
+                lambda replies, panes: self._apply_mx_widgets_replies(
+                    name, queries, replies, panes, nodes)
+            )
+
+    def _apply_mx_widgets_replies(self, name, queries, replies, panes,
+                                  nodes=None):
+
+        if 'modeltree' in panes:
+            if 'modellist' in replies:
+                mlist = self._get_mx_reply_value(replies['modellist'])
+                newname = self.mxmodelselector.get_selected_model(mlist)
+            else:
+                newname = name
+
+            if newname == name:
+                if 'modeltree' in replies:
+                    self._process_modeltree_reply(
+                        name, queries['modeltree'], replies['modeltree'])
+                if nodes:
+                    self._process_node_replies(name, nodes, replies)
+            else:
+                self.update_modeltree(newname)
+                self.update_datalist()
+                panes = panes - {'datalist'}
+
+        if 'datalist' in panes:
+            self._process_datalist_reply(
+                queries['datalist'], replies['datalist'])
+
+        if 'property' in panes:
+            self._show_mx_reply(replies['property'],
+                                self.mxproperty.process_remote_view)
+
+        for adj in ['precedents', 'succs']:
+            if adj in panes:
+                self._apply_mxanalyzer_replies(adj, replies)
+
+    def _add_kernel_requests(self, requests):
+        """Add the requests of the state of the kernel to requests
+
+        The versions are requested only with other requests.
+        """
+        requests = list(requests)
+        if requests and self._mx_versions_supported is not False:
+            requests.insert(
+                0, ('kernel', 'versions', ('mx_get_versions', (), {})))
+
+        if self._mx_notify_supported is None:
+            requests.append(
+                ('kernel', 'subscribe', ('mx_subscribe_changes', (), {})))
+
+        return requests
+
+    def _get_visible_requests(self, requests):
+        """Get the requests of the visible panes and mark the others dirty"""
+        result = []
+        for request in requests:
+            if self._is_mx_pane_visible(request[0]):
+                result.append(request)
+            else:
+                self._mx_dirty.add(request[0])
+        return result
+
+    def _is_mx_pane_visible(self, pane):
+        widget = self._mx_panes.get(pane, pane)
+        return not hasattr(widget, 'isVisible') or widget.isVisible()
+
+    def _on_mx_pane_shown(self, pane):
+        """Update the pane shown if it is dirty"""
+        if pane in self._mx_dirty:
+            self._mx_dirty.discard(pane)
+            if pane in self._mx_dataviews:
+                QTimer.singleShot(0, lambda: self._refresh_mx_dataview(pane))
+            else:
+                QTimer.singleShot(
+                    0, lambda: self.update_mx_widgets({}, panes={pane}))
+
+    def _refresh_mx_dataview(self, pane):
+        try:
+            pane.request_data(calc=False)
+        except (SyntaxError, ValueError):   # Invalid arguments
+            pass
+
+    def _get_mx_reply_value(self, reply):
+        """Get the value of reply, or None showing the error
+
+        The errors of the replies to the requests of the widgets
+        are shown in the status line of the explorer, so that
+        they are not raised in the callbacks of the replies.
+        """
+        is_error, value = reply
+        if is_error:
+            self.mxexplorer.update_status(False, "%s: %s" % value)
+            return None
+        return value
+
+    def _show_mx_reply(self, reply, show):
+        """Pass the value of reply to show, or show the error"""
+        value = self._get_mx_reply_value(reply)
+        if not reply[0]:
+            show(value)
+
+    def _process_node_replies(self, name, nodes, replies):
+        """Update the tree nodes by the replies of mx_get_attrdict"""
+        changes = []
+        for fullname, path in nodes.items():
+            is_error, value = replies[('node', fullname)]
+            if is_error or not value:   # Deleted meanwhile
+                self.update_modeltree(name)
+                return
+            changes.append(
+                ('attrs', path, project_attrdict(value, _MODELTREE_FIELDS)))
+
+        self.mxexplorer.process_remote_nodes(name, changes)
+
+    # ---- Requests to the kernel ----
+    def get_snapshot(self, queries, callback=None, priority=PRIORITY_VISIBLE):
+        """Call multiple kernel methods in one round trip
+
+        ``queries`` is a list of tuples of a kernel method name,
+        its args and kwargs. The kernel's ``mx_get_snapshot`` calls
+        the methods in order and returns a cloudpickled list of
+        ``(is_error, value)`` pairs, where ``value`` is
+        ``(error name, error message)`` if ``is_error`` is True.
+        The values of the methods in ``_PICKLED_REPLIES`` are unpickled
+        here so that the results are the same as calling the methods
+        one by one. Kernels taking ``encodings`` instead return the list
+        encoded by :mod:`~spyder_modelx.utility.mxcodec`.
+
+        If ``callback`` is given, the list is passed to ``callback``
+        instead of being returned. The call does not block
+        if the kernel is known to support ``mx_get_snapshot``
+        and :attr:`mx_async` is True. Such requests are queued by
+        ``priority`` and sent one at a time after the previous one returns.
+        Neither blocking nor non-blocking calls interrupt the kernel,
+        so they are processed when the kernel finishes running user code.
+
+        If the kernel is older and does not have ``mx_get_snapshot``,
+        the methods are called one by one.
+
+        Non-recursive attrdicts are taken from the attrdict cache
+        if the versions of their models are current.
+        """
+        if callback is None:
+            result = []
+            self._send_snapshot(queries, result.append, blocking=True)
+            return result[0]
+
+        self._queue_snapshot(lambda: queries, callback, priority)
+
+    def _queue_snapshot(self, get_queries, callback, priority,
+                        on_error=None):
+
+        self._mx_queue.push(
+            _SnapshotJob(get_queries, callback, on_error,
+                         self._mx_rpc_origin),
+            priority)
+        self._dispatch_mx_requests()
+
+    def _dispatch_mx_requests(self):
+        """Send queued requests while no request is pending"""
+        while self._mx_pending is None and self._mx_queue:
+            job = self._mx_queue.pop()
+            queries = job.get_queries()
+            if queries is None:     # Cancelled
+                continue
+
+            def on_replies(replies, job=job):
+                if self._mx_pending is not job:     # Given up
+                    return
+                self._finish_mx_request()
+                try:
+                    job.callback(replies)
+                finally:
+                    self._dispatch_mx_requests()
+
+            self._mx_pending = job
+            self._mx_pending_timer.start(
+                int(1000 * self._get_timeout('mx_get_snapshot')))
+
+            outer, self._mx_rpc_origin = self._mx_rpc_origin, job.origin
+            try:
+                self._send_snapshot(queries, on_replies, blocking=False)
+            except Exception as e:
+                if self._mx_pending is job:
+                    self._finish_mx_request()
+                self._drop_inflight((True, (type(e).__name__, str(e))))
+                if job.on_error:
+                    job.on_error()
+                if self._mx_queue:
+                    QTimer.singleShot(0, self._dispatch_mx_requests)
+                raise
+            finally:
+                self._mx_rpc_origin = outer
+
+    def _finish_mx_request(self):
+        self._mx_pending = None
+        self._mx_pending_timer.stop()
+
+    def _on_mx_request_timeout(self):
+        """Give up the pending request unless the kernel is running code"""
+        job = self._mx_pending
+        if job is None:
+            return
+
+        if getattr(self, '_executing', False):
+            self._mx_pending_timer.start()
+            return
+
+        # Recorded without the latency not to lengthen the next timeouts
+        self.mx_rpc_stats.record(
+            'mx_get_snapshot', job.origin, None, 0, 0, is_error=True)
+        self._finish_mx_request()
+        self._drop_inflight(_TIMEOUT_REPLY)
+
+        try:
+            if job.on_error:
+                job.on_error()
+        finally:
+            self._dispatch_mx_requests()
+
+    def _drop_inflight(self, reply):
+        """Pass reply to the callbacks waiting for the pending queries
+
+        The replies to the queries arriving later are not shared.
+        """
+        inflight, self._mx_inflight = self._mx_inflight, {}
+        for _serial, waiters in inflight.values():
+            for waiter in waiters:
+                waiter(reply)
+
+    def _send_snapshot(self, queries, callback, blocking):
+        """Send the queries not answered by the attrdict cache
+
+        Identical queries of methods that only get values are sent once
+        and share the reply. A blocking call waits for the queries
+        being sent by the pending request instead of sending them again,
+        unless the kernel is running code. The shared replies must not
+        be modified.
+        """
+        cache = self._mx_attrdict_cache
+        generation = cache.generation
+        replies = [None] * len(queries)
+
+        for i, (method, args, kwargs) in enumerate(queries):
+            if method == 'mx_get_attrdict':
+                try:
+                    replies[i] = (False, cache.get(kwargs))
+                except KeyError:
+                    pass
+
+        # Indexes of the queries by their keys
+        groups = {}
+        for i, query in enumerate(queries):
+            if replies[i] is None:
+                key = _get_query_key(query)
+                groups.setdefault(i if key is None else key, []).append(i)
+
+        waited = {}
+        if blocking and not getattr(self, '_executing', False):
+            for key in list(groups):
+                if key in self._mx_inflight:
+                    waited[key] = groups.pop(key)
+        wait = self._wait_inflight(waited)
+
+        sent = [queries[indexes[0]] for indexes in groups.values()]
+        if not blocking:
+            self._mx_send_count += 1
+            serial = self._mx_send_count
+            for key in groups:
+                if not isinstance(key, int):
+                    self._mx_inflight[key] = (serial, [])
+
+        def merge(sent_replies):
+            self._cache_replies(sent, sent_replies, generation)
+            for (key, indexes), reply in zip(groups.items(), sent_replies):
+                for i in indexes:
+                    replies[i] = reply
+                if not blocking and key in self._mx_inflight:
+                    # Keys sent again after the send was given up
+                    # are left to the new send
+                    waiter_serial, waiters = self._mx_inflight[key]
+                    if waiter_serial == serial:
+                        del self._mx_inflight[key]
+                        for waiter in waiters:
+                            waiter(reply)
+
+            for key, reply in wait().items():
+                for i in waited[key]:
+                    replies[i] = reply
+
+            callback(replies)
+
+        if sent:
+            self._get_snapshot(sent, merge, blocking)
+        else:
+            merge([])
+
+    def _wait_inflight(self, keys):
+        """Register waiters for the replies to the pending queries of keys
+
+        Return a function to wait for the replies and return them by
+        the keys. Waiting is done by an event loop as in
+        :meth:`_mx_wait_reply`, which quits after the timeout of
+        ``mx_get_snapshot`` and then the replies not arrived
+        are timeout errors.
+        """
+        result = {}
+        loops = []
+
+        def add_waiter(key):
+            def on_reply(reply):
+                result[key] = reply
+                if len(result) == len(keys) and loops:
+                    loops[0].quit()
+            self._mx_inflight[key][1].append(on_reply)
+
+        for key in keys:
+            add_waiter(key)
+
+        def wait():
+            if len(result) < len(keys):
+                loops.append(QEventLoop())
+                timer = QTimer()
+                timer.setSingleShot(True)
+                timer.timeout.connect(loops[0].quit)
+                timer.start(1000 * self._get_timeout('mx_get_snapshot'))
+                loops[0].exec_()
+                timer.stop()
+            for key in keys:
+                result.setdefault(key, _TIMEOUT_REPLY)
+            return result
+
+        return wait
+
+    def _cache_replies(self, queries, replies, generation):
+
+        cache = self._mx_attrdict_cache
+        for (method, args, kwargs), reply in zip(queries, replies):
+            if method == 'mx_get_versions':
+                if _is_missing_reply(reply, method):
+                    self._mx_versions_supported = False
+                elif not reply[0]:
+                    self._mx_versions_supported = True
+                    cache.set_versions(reply[1], generation)
+            elif method == 'mx_subscribe_changes':
+                self._mx_notify_supported = (
+                    not reply[0] and bool(reply[1]))
+
+        for (method, args, kwargs), reply in zip(queries, replies):
+            if method == 'mx_get_attrdict' and not reply[0]:
+                cache.put(kwargs, reply[1], generation)
+
+    def _get_snapshot(self, queries, callback, blocking):
+
+        if self._mx_fields_supported is False:
+            queries = [_remove_fields(query) for query in queries]
+
+        def deliver(result):
+            self._check_fields_replies(queries, result, callback, blocking)
+
+        if self._mx_snapshot_supported and self.mx_async and not blocking:
+            self.call_kernel(
+                interrupt=False,
+                callback=lambda replies: deliver(
+                    self._decode_snapshot(queries, replies))
+            ).mx_get_snapshot(cloudpickle.dumps(queries),
+                              **self._get_snapshot_kwargs())
+            return
+
+        result = None
+        if self._mx_snapshot_supported is not False:
+            try:
+                replies = self._call_snapshot(queries)
+                self._mx_snapshot_supported = True
+                result = self._decode_snapshot(queries, replies)
+            except Exception as e:
+                if _is_missing_handler(e):
+                    self._mx_snapshot_supported = False
+                else:
+                    raise
+
+        if result is None:
+            result = [self._call_one_by_one(*query) for query in queries]
+
+        deliver(result)
+
+    def _check_fields_replies(self, queries, result, callback, blocking):
+        """Request again without fields if the kernel does not take them"""
+        retry = [i for i, (query, reply) in enumerate(zip(queries, result))
+                 if _has_fields(query) and _is_fields_error(reply)]
+
+        if retry:
+            self._mx_fields_supported = False
+
+            def merge(replies):
+                for i, reply in zip(retry, replies):
+                    result[i] = reply
+                callback(result)
+
+            self._get_snapshot(
+                [queries[i] for i in retry], merge, blocking)
+        else:
+            if any(_has_fields(query) for query in queries):
+                self._mx_fields_supported = True
+            callback(result)
+
+    def _get_snapshot_kwargs(self):
+        if self._mx_codec_supported is not False:
+            return {'encodings': [mxcodec.ENCODING]}
+        else:
+            return {}
+
+    def _call_snapshot(self, queries):
+        """Call mx_get_snapshot blocking
+
+        Kernels that do not take ``encodings`` are called again without it.
+        """
+        kwargs = self._get_snapshot_kwargs()
+        try:
+            replies = self.call_kernel(
+                interrupt=False,
+                blocking=True,
+                timeout=self._get_timeout('mx_get_snapshot')).mx_get_snapshot(
+                cloudpickle.dumps(queries), **kwargs)
+        except TypeError as e:
+            if 'encodings' in kwargs and 'encodings' in str(e):
+                self._mx_codec_supported = False
+                return self._call_snapshot(queries)
+            raise
+
+        if 'encodings' in kwargs:
+            self._mx_codec_supported = mxcodec.is_encoded(replies)
+
+        return replies
+
+    def _decode_snapshot(self, queries, replies):
+
+        if mxcodec.is_encoded(replies):
+            # The values are encoded together with the list.
+            return [(is_error, value) for is_error, value
+                    in mxcodec.decode(replies)]
+
+        result = []
+        for query, (is_error, value) in zip(
+                queries, cloudpickle.loads(replies)):
+            if not is_error and query[0] in _PICKLED_REPLIES:
+                value = cloudpickle.loads(value)
+            result.append((is_error, value))
+
+        return result
+
+    def _call_one_by_one(self, method, args, kwargs):
+
+        try:
+            value = getattr(self.call_kernel(
+                interrupt=False,
+                blocking=True,
+                timeout=self._get_timeout(method)), method)(*args, **kwargs)
+        except Exception as e:
+            return True, (type(e).__name__, str(e))
+
+        if method in _PICKLED_REPLIES:
+            value = cloudpickle.loads(value)
+
+        return False, value
+
+    def send_mx_requests(self, requests, callback,
+                         priority=PRIORITY_VISIBLE):
+        """Send requests from modelx widgets in one snapshot call
+
+        ``requests`` is a list of tuples of a pane, a key and a query.
+        A pane is the name of a widget given to :meth:`set_mx_pane`
+        or a widget object, whose ``set_refreshing`` method
+        is called while the request is pending.
+        ``callback`` is called with a dict mapping the keys to the replies
+        and the set of the panes whose replies are not stale, i.e.
+        no newer requests are sent for the panes.
+
+        The requests are queued by ``priority``. The queries of the panes
+        superseded by newer requests before they are sent are cancelled.
+        """
+        panes = []
+        for pane, _key, _query in requests:
+            if pane not in panes:
+                panes.append(pane)
+
+        serials = {}
+        for pane in panes:
+            self._mx_request_count += 1
+            serials[pane] = self._mx_request_count
+            self._mx_pane_requests[pane] = self._mx_request_count
+            self._set_mx_refreshing(pane, True)
+
+        def is_current(pane):
+            return self._mx_pane_requests.get(pane) == serials[pane]
+
+        keys = []
+
+        def get_queries():
+            current = [(key, query) for pane, key, query in requests
+                       if is_current(pane)]
+            if not current:
+                return None
+            keys[:] = [key for key, _query in current]
+            return [query for _key, query in current]
+
+        def on_replies(result):
+            current = set()
+            for pane in panes:
+                if is_current(pane):
+                    del self._mx_pane_requests[pane]
+                    self._set_mx_refreshing(pane, False)
+                    current.add(pane)
+
+            if current:
+                callback(dict(zip(keys, result)), current)
+
+        def on_error():
+            for pane in panes:
+                if is_current(pane):
+                    del self._mx_pane_requests[pane]
+                    self._set_mx_refreshing(pane, False)
+
+        origin = ','.join(
+            pane if isinstance(pane, str) else type(pane).__name__
+            for pane in panes)
+        with self.mx_rpc_origin(origin):
+            self._queue_snapshot(get_queries, on_replies, priority, on_error)
+
+    def set_mx_pane(self, name, widget):
+        self._mx_panes[name] = widget
+        self._mx_pane_watcher.watch(name, widget)
+
+    def _set_mx_refreshing(self, pane, refreshing):
+        widget = self._mx_panes.get(pane, pane)
+        if hasattr(widget, 'set_refreshing'):
+            widget.set_refreshing(refreshing)
 
     # ---- modelx browser ----
     def set_mxexplorer(self, mxexplorer, mxmodelselector):
@@ -104,6 +1136,7 @@ class MxShellWidget(ShellWidget):
         self.mxexplorer = mxexplorer
         self.mxmodelselector = mxmodelselector
         mxexplorer.treeview.shell = self
+        self.set_mx_pane('modeltree', mxexplorer)
 
         self.mxmodelselector.activated.connect(
             lambda : self.update_modeltree(
@@ -123,22 +1156,110 @@ class MxShellWidget(ShellWidget):
 
         # jsonargs = TupleEncoder(ensure_ascii=True).encode(args)
 
-        result = cloudpickle.loads(self.call_kernel(
-            interrupt=True,
-            blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_get_value(
-            obj, args, calc
-        ))
-        return result
+        # Called through mx_get_snapshot so that arrays are received
+        # as raw buffers if the kernel supports mxcodec.
+        reply, = self.get_snapshot([('mx_get_value', (obj, args, calc), {})])
+        return _get_reply_value(reply)
+
+    def update_mxdataview(self, obj=None, args=None, expr=None, calc=False,
+                          callback=None, pane=None):
+        """Update dataview
+
+        If ``callback`` is given, ``callback`` is called with
+        the reply of ``mx_get_value``, i.e. a pair of
+        an error flag and the value or the error,
+        and ``pane`` is the widget to show the refreshing state.
+        Otherwise the value is returned.
+
+        If ``callback`` is given and the value is a large DataFrame,
+        Series or Index, the value is kept in the kernel and
+        a :class:`RemoteFrame` is passed instead of the value.
+        """
+        if callback is None:
+            return self.get_obj_value(obj, args, calc)
+
+        if pane is not None and pane not in self._mx_dataviews:
+            self._mx_dataviews.append(pane)
+            self._mx_pane_watcher.watch(pane, pane)
+            pane.destroyed.connect(lambda: self._remove_mx_dataview(pane))
+
+        if self._mx_frame_supported is False:
+            self.send_mx_requests(
+                [(pane, 'value', ('mx_get_value', (obj, args, calc), {}))],
+                lambda replies, panes: callback(*replies['value'])
+            )
+            return
+
+        def process(replies, panes):
+            reply = replies['value']
+            if _is_missing_reply(reply, 'mx_open_frame'):
+                self._mx_frame_supported = False
+                self.update_mxdataview(obj, args, expr, calc, callback, pane)
+                return
+
+            self._mx_frame_supported = True
+            is_error, value = reply
+            if not is_error:
+                value, is_calculated, frame = value
+                if frame is not None:
+                    value = RemoteFrame(self, frame)
+                value = [value, is_calculated]
+            callback(is_error, value)
+
+        self.send_mx_requests(
+            [(pane, 'value', ('mx_open_frame', (obj, args, calc),
+                              {'min_size': REMOTE_MIN_SIZE,
+                               'rows': (0, WINDOW_ROWS),
+                               'cols': (0, WINDOW_COLS)}))],
+            process
+        )
+
+    def _remove_mx_dataview(self, pane):
+        self._mx_dataviews.remove(pane)
+        self._mx_pane_watcher.unwatch(pane)
+        self._mx_dirty.discard(pane)
 
-    def update_mxdataview(self, obj=None, args=None, expr=None, calc=False):
-        """Update dataview"""
-        return self.get_obj_value(obj, args, calc)
+    @_rpc_origin('dataview')
+    def get_frame_window(self, frame_id, rows, cols, callback=None):
+        """Get a window of a frame kept in the kernel
+
+        If ``callback`` is given, ``callback`` is called with
+        the error flag and the window or the error.
+        """
+        query = ('mx_get_frame_window', (frame_id, rows, cols), {})
+        if callback is None:
+            reply, = self.get_snapshot([query])
+            return _get_reply_value(reply)
+
+        self.get_snapshot([query], lambda replies: callback(*replies[0]))
+
+    @_rpc_origin('dataview')
+    def get_frame_windows(self, frame_id, windows):
+        """Get windows of a frame kept in the kernel by one blocking call
+
+        ``windows`` is a list of the pairs of ``rows`` and ``cols``.
+        """
+        replies = self.get_snapshot(
+            [('mx_get_frame_window', (frame_id, rows, cols), {})
+             for rows, cols in windows])
+        return [_get_reply_value(reply) for reply in replies]
+
+    @_rpc_origin('dataview')
+    def sort_frame(self, frame_id, column, ascending, callback):
+        self.get_snapshot(
+            [('mx_sort_frame', (frame_id, column, ascending), {})],
+            lambda replies: callback(*replies[0]))
+
+    @_rpc_origin('dataview')
+    def close_frame(self, frame_id):
+        self.get_snapshot([('mx_close_frame', (frame_id,), {})],
+                          lambda replies: None, PRIORITY_PREFETCH)
 
     # ---- modelx data list ----
     def set_mxdatalist(self, datalist):
         """Set modelx formula list"""
         self.mxdatalist = datalist
+        self.set_mx_pane('datalist', datalist)
 
     def update_datalist(self):
         """Update codelist"""
@@ -147,28 +1268,49 @@ class MxShellWidget(ShellWidget):
         if not model:
             return
 
-        result = self.call_kernel(
-            interrupt=True,
-            blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_get_value_info(model)
-        self.mxdatalist.process_remote_view(result)
+        query = self._get_datalist_query(model)
+        self.send_mx_requests(
+            [('datalist', 'datalist', query)],
+            lambda replies, panes: self._process_datalist_reply(
+                query, replies['datalist'])
+        )
+
+    def _get_datalist_query(self, model):
+        return self._get_hashed_query(
+            'datalist', ('mx_get_value_info', (model,), {}))
+
+    def _process_datalist_reply(self, query, reply):
+
+        unwrapped = self._unwrap_hashed_reply('datalist', query, reply)
+        if unwrapped is None:
+            self.update_datalist()
+            return
+
+        query, reply = unwrapped
+        if reply[1] is not _UNCHANGED:
+            self._show_mx_reply(reply, self.mxdatalist.process_remote_view)
 
+    # ---- modelx performance ----
+    def set_mxperformance(self, perfwidget):
+        """Set the widget showing mx_rpc_stats"""
+        perfwidget.shell = self
+        self.mxperformance = perfwidget
 
     # ---- modelx code list ----
     def set_mxcodelist(self, codelist):
         """Set modelx formula list"""
         self.mxcodelist = codelist
+        self.set_mx_pane('codelist', codelist)
 
     def update_codelist(self, objname):
         """Update codelist"""
 
         objname = objname + '.cells'
-        data = self.call_kernel(
-            interrupt=True,
-            blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_get_codelist(objname)
-
-        self.mxcodelist.process_remote_view(data)
+        self.send_mx_requests(
+            [('codelist', 'codelist', ('mx_get_codelist', (objname,), {}))],
+            lambda replies, panes: self._show_mx_reply(
+                replies['codelist'], self.mxcodelist.process_remote_view)
+        )
 
     # ---- modelx analyzer ----
     def set_mxanalyzer(self, analyzer):
@@ -177,6 +1319,7 @@ class MxShellWidget(ShellWidget):
         for adjacency in ['precedents', 'succs']:
 
             tab = self.mxanalyzer.tabs[adjacency]
+            self.set_mx_pane(adjacency, tab)
 
             for box in [tab.exprobjbox, tab.exprargbox, tab.argbox]:
                 # adjacenty is a free varible
@@ -192,104 +1335,115 @@ class MxShellWidget(ShellWidget):
                 else:
                     RuntimeError('must not happen')
 
-    def get_attrdict(self, fullname=None, attrs=None, recursive=False):
+    def get_attrdict(self, fullname=None, attrs=None, recursive=False,
+                     fields=None):
 
-        return cloudpickle.loads(self.call_kernel(
-            interrupt=True,
-            blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_get_attrdict(
-            fullname=fullname, attrs=attrs, recursive=recursive
-        ))
+        kwargs = dict(fullname=fullname, attrs=attrs, recursive=recursive)
+        if fields is not None:
+            kwargs['fields'] = fields
+
+        reply, = self.get_snapshot([('mx_get_attrdict', (), kwargs)])
+        return _get_reply_value(reply)
 
     def update_mxanalyzer(self, adjacency, update_attrdict=True):
 
         tab = self.mxanalyzer.tabs[adjacency]
 
-        if tab.object_radio.isChecked():
-            if not tab.attrdict:
-                return
-            if update_attrdict:
-                tab.attrdict = self.get_attrdict(
-                    fullname=tab.attrdict['fullname'],
-                    attrs=['formula', '_evalrepr', 'allow_none', 'parameters'],
-                    recursive=False
-                )
-            if not tab.attrdict:
-                tab.clear_obj()
-                return
-            tab.set_argbox()
-            self._update_mxanalyzer_obj(adjacency, update_attrdict)
-            
-        elif tab.expr_radio.isChecked():
-            self._update_mxanalyzer_expr(adjacency)
-
-    def _update_mxanalyzer_obj(self, adjacency, update_attrdict):
+        if tab.object_radio.isChecked() and not tab.attrdict:
+            return
 
-        tab = self.mxanalyzer.tabs[adjacency]
-        # msgtype = "analyze_" + adjacency + "_setnode"
-        obj = tab.attrdict['fullname']
-        argtxt = tab.argbox.get_expr()
-        args = ast.literal_eval("(" + argtxt + ("," if argtxt else "") + ")")
+        requests = [(adjacency, key, query) for key, query
+                    in self._get_mxanalyzer_queries(adjacency, update_attrdict)]
 
+        if requests:
+            self.send_mx_requests(
+                requests,
+                lambda replies, panes: self._apply_mxanalyzer_replies(
+                    adjacency, replies)
+            )
 
-        try:
-            result = cloudpickle.loads(self.call_kernel(
-                interrupt=True,
-                blocking=True,
-                timeout=CALL_KERNEL_TIMEOUT).mx_get_node(
-                obj, cloudpickle.dumps(args)))
-            # logger.debug(f"_update_mxanalyzer_obj:args: {args}")
-            # logger.debug(f"_update_mxanalyzer_obj: {result}")
-            self.mxanalyzer.update_status(adjacency, True)
-            self.mxanalyzer.update_node(adjacency, result)
+    def _get_mxanalyzer_queries(self, adjacency, update_attrdict=True):
+        """Get keys and queries to update an analyzer tab"""
 
-        except Exception as e:
-            msg = e.__class__.__name__ + ": " + str(e)
-            self.mxanalyzer.update_status(adjacency, False, msg)
+        tab = self.mxanalyzer.tabs[adjacency]
+        queries = []
 
-    def _update_mxanalyzer_expr(self, adjacency):
-        """Update dataview"""
+        if tab.object_radio.isChecked():
+            if not tab.attrdict:
+                return queries
 
-        tab = self.mxanalyzer.tabs[adjacency]
-        objexpr = tab.exprobjbox.get_expr()
-        argexpr = tab.exprargbox.get_expr()
+            # Same as the query of the property widget, so that
+            # the request for the same object is shared or cached.
+            if update_attrdict:
+                queries.append((adjacency + '_attrdict',
+                                self._get_mxproperty_query(
+                                    tab.attrdict['fullname'])))
 
-        # Invalid expression
-        if objexpr is None or argexpr is None:
-            return
+            obj = tab.attrdict['fullname']
+            argtxt = tab.argbox.get_expr()
+            args = ast.literal_eval(
+                "(" + argtxt + ("," if argtxt else "") + ")")
+            queries.append((adjacency + '_node', (
+                'mx_get_node', (obj, cloudpickle.dumps(args)), {})))
 
-        if objexpr:
+        elif tab.expr_radio.isChecked():
+            objexpr = tab.exprobjbox.get_expr()
+            argexpr = tab.exprargbox.get_expr()
 
             # Contribution from bakerwy
             # https://github.com/fumitoh/modelx/discussions/183#discussion-8668563
 
-            try:
+            # Invalid expression
+            if objexpr and argexpr is not None:
                 argstr = "(" + argexpr + ("," if argexpr else "") + ")"
-                result = cloudpickle.loads(self.call_kernel(
-                    interrupt=True, blocking=True,
-                    timeout=CALL_KERNEL_TIMEOUT
-                ).mx_eval_node(objexpr, argstr))
+                queries.append((adjacency + '_node', (
+                    'mx_eval_node', (objexpr, argstr), {})))
 
-                self.mxanalyzer.update_status(adjacency, True)
-                self.mxanalyzer.update_node(adjacency, result)
-            except Exception as e:
+        return queries
+
+    def _apply_mxanalyzer_replies(self, adjacency, replies):
+        """Update an analyzer tab by the replies"""
+
+        tab = self.mxanalyzer.tabs[adjacency]
+
+        key = adjacency + '_attrdict'
+        if key in replies:
+            is_error, value = replies[key]
+            if is_error:
                 self.mxanalyzer.update_status(
-                    adjacency, False, f"{type(e).__name__}: {e}")
+                    adjacency, False, "%s: %s" % value)
+                return
+            tab.attrdict = value
 
+        if tab.object_radio.isChecked():
+            if not tab.attrdict:
+                tab.clear_obj()
+                return
+            tab.set_argbox()
 
+        key = adjacency + '_node'
+        if key in replies:
+            is_error, result = replies[key]
+            if is_error:
+                self.mxanalyzer.update_status(
+                    adjacency, False, "%s: %s" % result)
+            else:
+                self.mxanalyzer.update_status(adjacency, True)
+                self.mxanalyzer.update_node(adjacency, result)
 
     def update_mxanalyzer_all(self):
         for adj in ['precedents', 'succs']:
             self.update_mxanalyzer(adj)
 
+    @_rpc_origin('analyzer')
     def get_adjacent(self, obj: str, args: tuple, adjacency: str):
 
         jsonargs = TupleEncoder(ensure_ascii=True).encode(args)
 
         result = cloudpickle.loads(self.call_kernel(
-            interrupt=True,
+            interrupt=False,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_get_adjacent(
+            timeout=self._get_timeout('mx_get_adjacent')).mx_get_adjacent(
             obj, jsonargs, adjacency
         ))
         return result
@@ -300,12 +1454,21 @@ class MxShellWidget(ShellWidget):
         """Set modelx dataview widget"""
         mxproperty.shell = self
         self.mxproperty = mxproperty
+        self.set_mx_pane('property', mxproperty)
 
 
     def update_mxproperty(self, objname):
 
-        attrs = self.get_attrdict(objname, ['formula', '_evalrepr', 'allow_none', 'parameters'])
-        self.mxproperty.process_remote_view(attrs)
+        self.send_mx_requests(
+            [('property', 'property', self._get_mxproperty_query(objname))],
+            lambda replies, panes: self._show_mx_reply(
+                replies['property'], self.mxproperty.process_remote_view)
+        )
+
+    def _get_mxproperty_query(self, objname):
+        return ('mx_get_attrdict', (),
+                dict(fullname=objname, attrs=_PROPERTY_ATTRS, recursive=False,
+                     fields=_PROPERTY_FIELDS))
 
 
     def reload_mxproperty(self):
@@ -325,57 +1488,230 @@ class MxShellWidget(ShellWidget):
         wait_loop = None
 
 
+    @_rpc_origin('explorer')
     def get_modellist(self):
 
         mlist = self.call_kernel(
-            interrupt=True,
+            interrupt=False,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_get_modellist()
+            timeout=self._get_timeout('mx_get_modellist')).mx_get_modellist()
 
 
         return mlist
 
-    def update_modeltree(self, name):
+    def get_space_tree(self, name):
+        """Get the tree of the spaces in the model of name
+
+        Only the names of the spaces are requested, as the tree in
+        the explorer has only the spaces loaded so far.
+        """
+        return self.get_attrdict(name, recursive=True,
+                                 fields=_SPACE_LIST_FIELDS)
 
-        attrs = self.get_attrdict(
-            name, ['_is_derived', '__len__', '_evalrepr'], recursive=True)
+    def update_modeltree(self, name):
 
         # logger.debug(f"Updating modeltree with {attrs}")
 
-        self.mxexplorer.process_remote_view(attrs)
+        self.mxexplorer.select_tree(
+            self.mxmodelselector.get_selected_modelid())
+        query = self._get_modeltree_query(name)
+        self.send_mx_requests(
+            [('modeltree', 'modeltree', query)],
+            lambda replies, panes: self._process_modeltree_reply(
+                name, query, replies['modeltree'])
+        )
+
+    def _get_modeltree_query(self, name):
+        """Get the query for the changes of the tree
+
+        Only the changes since the version of the tree in the explorer
+        are requested, if the kernel supports mx_get_tree_delta.
+        The children of the spaces not expanded yet are not requested.
+        Otherwise the whole tree is requested unless it is unchanged.
+        """
+        query = self._get_tree_query(
+            name,
+            version=self.mxexplorer.get_tree_version(name),
+            loaded=self.mxexplorer.get_loaded_spaces(name)
+        )
+        if query[0] == 'mx_get_tree_delta':
+            return query
+        else:
+            return self._get_hashed_query('modeltree', query)
+
+    def _get_tree_query(self, fullname, version=None, loaded=()):
+
+        if self._mx_tree_delta_supported is False:
+            return ('mx_get_attrdict', (),
+                    dict(fullname=fullname, attrs=_MODELTREE_ATTRS,
+                         recursive=True, fields=_MODELTREE_FIELDS))
+        else:
+            return ('mx_get_tree_delta', (),
+                    dict(fullname=fullname, attrs=_MODELTREE_ATTRS,
+                         version=version, loaded=sorted(loaded),
+                         fields=_MODELTREE_FIELDS))
+
+    def _get_hashed_query(self, pane, query):
+        """Wrap query so that the reply is omitted if unchanged
+
+        ``mx_get_hashed(query, digest)`` of the kernel calls the method
+        of ``query`` and returns ``[hash, value]``, where ``hash`` is
+        the hash of the value computed by the kernel, and ``value`` is
+        the value as returned by the method, or None if ``hash``
+        equals ``digest``. ``digest`` is the hash of the reply last
+        shown by the pane if it is the reply to the same query.
+        """
+        if self._mx_hash_supported is False:
+            return query
+
+        key = _get_query_key(query)
+        last = self._mx_reply_hashes.get(pane)
+        digest = last[1] if last and last[0] == key else None
+        return ('mx_get_hashed', (query, digest), {})
 
+    def _unwrap_hashed_reply(self, pane, query, reply):
+        """Get the query and reply wrapped by _get_hashed_query
+
+        The value of the reply is ``_UNCHANGED`` if the reply is omitted.
+        None is returned if the kernel turns out to lack mx_get_hashed.
+        """
+        if query[0] != 'mx_get_hashed':
+            return query, reply
+        elif _is_missing_reply(reply, 'mx_get_hashed'):
+            self._mx_hash_supported = False
+            return None
+
+        self._mx_hash_supported = True
+        query, digest = query[1]
+        is_error, value = reply
+        if is_error:
+            self._mx_reply_hashes.pop(pane, None)
+            return query, reply
+
+        hash_, value = value
+        self._mx_reply_hashes[pane] = (_get_query_key(query), hash_)
+        if digest is not None and hash_ == digest:
+            return query, (False, _UNCHANGED)
+        elif isinstance(value, bytes) and query[0] in _PICKLED_REPLIES:
+            value = cloudpickle.loads(value)
+        return query, (False, value)
+
+    def _check_tree_delta_reply(self, query, reply):
+        """Return False if the kernel turns out to lack mx_get_tree_delta"""
+        if query[0] == 'mx_get_tree_delta':
+            if _is_missing_reply(reply, 'mx_get_tree_delta'):
+                self._mx_tree_delta_supported = False
+                return False
+            else:
+                self._mx_tree_delta_supported = True
+        return True
+
+    def _process_modeltree_reply(self, name, query, reply):
+
+        unwrapped = self._unwrap_hashed_reply('modeltree', query, reply)
+        if unwrapped is None or not self._check_tree_delta_reply(
+                query, reply):
+            self.update_modeltree(name)
+            return
+
+        query, reply = unwrapped
+        if query[0] == 'mx_get_tree_delta':
+            self._show_mx_reply(reply, self.mxexplorer.process_remote_delta)
+        elif reply[1] is not _UNCHANGED:
+            self._show_mx_reply(
+                reply, lambda value: self.mxexplorer.process_remote_view(
+                    value, decode=lambda value: project_attrdict(
+                        value, _MODELTREE_FIELDS)))
+
+    def fetch_modeltree_children(self, model, item):
+        """Load the children of a space in the tree when it is expanded
+
+        Only the space and its children are requested. With kernels
+        lacking mx_get_tree_delta, the children are taken from the whole
+        tree last received if the space is in it.
+        """
+        fullname = item.itemData['fullname']
+        if self._mx_tree_delta_supported is False:
+            node = model.unloadedNodes.pop(fullname, None)
+            if node is not None:
+                self.mxexplorer.process_remote_children(
+                    model, item,
+                    prune_tree(node, set(), model.unloadedNodes))
+                return
+
+        query = self._get_tree_query(fullname)
+
+        self.send_mx_requests(
+            [(('modeltree', fullname), 'children', query)],
+            lambda replies, panes: self._process_children_reply(
+                model, item, query, replies['children'])
+        )
+
+    def _process_children_reply(self, model, item, query, reply):
+
+        if not self._check_tree_delta_reply(query, reply):
+            self.fetch_modeltree_children(model, item)
+            return
 
+        is_error, value = reply
+        if is_error:
+            data = None
+            self.mxexplorer.update_status(False, "%s: %s" % value)
+        elif not value:
+            data = None
+        elif query[0] == 'mx_get_tree_delta':
+            data = value['tree']
+        else:
+            data = prune_tree(
+                project_attrdict(value, _MODELTREE_FIELDS), set(),
+                model.unloadedNodes)
+
+        self.mxexplorer.process_remote_children(model, item, data)
+
+        # The reply of a pending update of the tree would not have
+        # the loaded children, so the tree is requested again.
+        if 'modeltree' in self._mx_pane_requests:
+            del self._mx_pane_requests['modeltree']
+            self._set_mx_refreshing('modeltree', False)
+            self.update_modeltree(model.rootItem.itemData['fullname'])
+
+    @_rpc_origin('explorer')
     def new_model(self, name=None, define_var=False, varname=''):
 
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_new_model(
+            timeout=self._get_timeout('mx_new_model')).mx_new_model(
             name, define_var, varname)
 
-        self.update_mx_widgets({})
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def read_model(self, modelpath, name, define_var, varname):
 
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_read_model(
+            timeout=self._get_timeout('mx_read_model')).mx_read_model(
             modelpath, name, define_var, varname)
 
-        self.update_mx_widgets({})
+        self._mx_attrdict_cache.expire(name)
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def new_space(self, model, parent, name, bases, define_var, varname):
 
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_new_space(
+            timeout=self._get_timeout('mx_new_space')).mx_new_space(
             model, parent, name, bases, define_var, varname
         )
 
-        self.update_mx_widgets({})
+        self._mx_attrdict_cache.expire(model)
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def new_cells(self, model, parent, name, formula, define_var, varname):
 
         if formula:
@@ -397,12 +1733,14 @@ class MxShellWidget(ShellWidget):
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_new_cells(
+            timeout=self._get_timeout('mx_new_cells')).mx_new_cells(
             model, parent, name, define_var, varname, formula
         )
 
-        self.update_mx_widgets({})
+        self._mx_attrdict_cache.expire(model)
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def set_formula(self, fullname, formula):
 
         try:
@@ -421,42 +1759,49 @@ class MxShellWidget(ShellWidget):
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_set_formula(
+            timeout=self._get_timeout('mx_set_formula')).mx_set_formula(
             fullname, formula
         )
 
-        self.update_mx_widgets({})
+        self._mx_attrdict_cache.expire(get_model_name(fullname))
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def del_object(self, parent, name):
 
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_del_object(
+            timeout=self._get_timeout('mx_del_object')).mx_del_object(
             parent, name)
 
-        self.update_mx_widgets({})
+        self._mx_attrdict_cache.expire(get_model_name(parent))
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def del_model(self, name):
 
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_del_model(
+            timeout=self._get_timeout('mx_del_model')).mx_del_model(
             name)
 
-        self.update_mx_widgets({})
+        self._mx_attrdict_cache.expire(name)
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def write_model(self, model, modelpath, backup, zipmodel):
 
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_write_model(
+            timeout=self._get_timeout('mx_write_model')).mx_write_model(
             model, modelpath, backup, zipmodel)
 
-        self.update_mx_widgets({})
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
+    @_rpc_origin('explorer')
     def import_names(self,
                      fullname,
                      import_selected,
@@ -466,10 +1811,11 @@ class MxShellWidget(ShellWidget):
         self.call_kernel(
             interrupt=True,
             blocking=True,
-            timeout=CALL_KERNEL_TIMEOUT).mx_import_names(
+            timeout=self._get_timeout('mx_import_names')).mx_import_names(
             fullname, import_selected, import_children, replace_existing)
 
-        self.update_mx_widgets({})
+        self._mx_attrdict_cache.expire(get_model_name(fullname))
+        self.update_mx_widgets({}, PRIORITY_EDIT)
 
 
 
@@ -56,9 +56,71 @@
 ##
 #############################################################################
 
-import itertools
+import sys
 import enum
-from qtpy.QtCore import QAbstractItemModel, QModelIndex, Qt
+import itertools
+from qtpy.QtCore import QAbstractItemModel, QModelIndex, Qt, Signal
+from spyder_modelx.utility.treedelta import (
+    apply_tree_delta, get_tree_delta, is_container, is_same_tree, HASH_KEY)
+from spyder_modelx.utility.listdiff import get_runs, get_moves, move_items
+
+# Children are reordered by a layout change instead of
+# beginMoveRows and endMoveRows if more moves than this are needed.
+MAX_MOVE_SIGNALS = 50
+
+# Number of the item spaces shown at a time under an ItemSpaces node.
+# The next ones are shown when the view scrolls to the last one.
+ITEMSPACE_PAGE_SIZE = 100
+
+# Values of the data interned as they repeat across the nodes
+_INTERNED_KEYS = ('type', 'name', 'repr', 'namedid')
+
+# Child items of the items without children, shared to save a list per item
+_NO_CHILDREN = ()
+
+
+def get_space_containers(data):
+    """Get the full names of the model or space of data and its spaces
+
+    The spaces in the containers not loaded yet are included by
+    their names, and their child spaces are not.
+    """
+    result = [data['fullname']]
+    for child in _get_child_spaces(data):
+        if isinstance(child, dict):
+            result.extend(get_space_containers(child))
+        else:
+            result.append(data['fullname'] + '.' + child)
+    return result
+
+
+def get_child_spaces(data):
+    """Get the named ids of the spaces in the model or space of data
+
+    The spaces are included in the same way as
+    :func:`get_space_containers`.
+    """
+    result = []
+    for child in _get_child_spaces(data):
+        if isinstance(child, dict):
+            result.append(child['namedid'])
+            result.extend(get_child_spaces(child))
+        elif data['type'] == 'Model':
+            result.append(child)
+        else:
+            result.append(data['namedid'] + '.' + child)
+    return result
+
+
+def _get_child_spaces(data):
+    """Get the data of the child spaces, or their names if not loaded"""
+    container = data.get(
+        'spaces' if data['type'] == 'Model' else 'named_spaces', ())
+    if is_container(container):
+        return list(container['items'].values())
+    else:
+        return list(container)
+
 
 class TreeCol(enum.IntEnum):
 
@@ -70,13 +132,26 @@ class TreeCol(enum.IntEnum):
 
 
 class BaseItem(object):
-    """Base Item class for all tree item classes."""
+    """Base Item class for all tree item classes.
+
+    Each item keeps its row in ``rowIndex``, which the parent renumbers
+    when its child items are inserted, removed or moved, so that
+    :meth:`row` does not search the child items of the parent.
+
+    The items only refer to the data in the tree, and have no
+    ``__dict__``. Subclasses must define ``__slots__``.
+    The fields of the data are read from ``itemData`` by its keys.
+    ``childItems`` is an empty tuple shared by the items
+    without children, and becomes a list when children are added.
+    """
+    __slots__ = ('rowIndex', 'parentItem', 'itemData', 'childItems')
 
     def __init__(self, data, parent=None):
 
+        self.rowIndex = 0
         self.parentItem = parent
         self.itemData = None
-        self.childItems = []
+        self.childItems = _NO_CHILDREN
         self.updateData(data)
 
     def updateData(self, data):
@@ -87,18 +162,49 @@ class BaseItem(object):
             self.itemData = data
 
     def updateChild(self):
+        self.childItems = [
+            cls(data, self) for cls, data in self.childSpecs()] or _NO_CHILDREN
+        self.renumberChildren()
+
+    def renumberChildren(self, start=0, stop=None):
+        """Set the rows of the child items from start to stop"""
+        items = self.childItems
+        for row in range(start, len(items) if stop is None else stop):
+            items[row].rowIndex = row
+
+    def childSpecs(self):
+        """Return pairs of the item class and data of the child items"""
         raise NotImplementedError
 
+    def canFetchMore(self):
+        """Return True if the child items are not loaded yet"""
+        return False
+
     def changeParent(self, parent):
         self.parentItem = parent
 
     def appendChild(self, item):
-        item.changeParent(self)
-        self.childItems.append(item)
+        self.insertChildren(len(self.childItems), [item])
 
     def insertChild(self, index, item):
-        item.changeParent(self)
-        self.childItems.insert(index, item)
+        self.insertChildren(index, [item])
+
+    def insertChildren(self, index, items):
+        for item in items:
+            item.changeParent(self)
+        if self.childItems is _NO_CHILDREN:
+            self.childItems = []
+        self.childItems[index:index] = items
+        self.renumberChildren(index)
+
+    def removeChildren(self, position, count):
+        del self.childItems[position:position + count]
+        self.renumberChildren(position)
+
+    def moveChildren(self, index_to, index_from, length):
+        """Move length child items at index_from to before index_to"""
+        self.renumberChildren(
+            *move_items(self.childItems, index_to, index_from, length))
 
     def child(self, row):
         return self.childItems[row]
@@ -134,10 +240,44 @@ class BaseItem(object):
     def parent(self):
         return self.parentItem
 
+    def getPath(self):
+        """Return the path of the item data in the tree data
+
+        Return None if the item is removed from the tree.
+        """
+        if self.parentItem is None:
+            return ()
+
+        owner = self.parentItem
+        while isinstance(owner, ViewItem):
+            owner = owner.parentItem
+
+        path = owner.getPath()
+        if path is None:
+            return None
+
+        for name, value in owner.itemData.items():
+            if is_container(value):
+                for key, data in value['items'].items():
+                    if data is self.itemData:
+                        return path + (name, key)
+        return None
+
     def row(self):
-        if self.parentItem:
-            return self.parentItem.childItems.index(self)
-        return 0
+        parent = self.parentItem
+        if parent is None:
+            return 0
+
+        # The rows are renumbered if the child items of the parent
+        # are modified other than by the methods above.
+        row = self.rowIndex
+        items = parent.childItems
+        if row >= len(items) or items[row] is not self:
+            parent.renumberChildren()
+            row = self.rowIndex
+            if row >= len(items) or items[row] is not self:
+                raise ValueError("item is not a child of its parent")
+        return row
 
     def getType(self):
         return self.itemData.get('type', '')
@@ -145,12 +285,26 @@ class BaseItem(object):
     def getParams(self):
         raise NotImplementedError
 
-    def __getattr__(self, item):
-        return self.itemData[item]
+    def getAttrs(self):
+        """Return the values of the data other than the containers"""
+        return {k: v for k, v in self.itemData.items()
+                if not is_container(v) and k != HASH_KEY}
+
+    def hasSameData(self, other):
+        """Check if other has the same data by the subtree hashes"""
+        return is_same_tree(self.itemData, other.itemData)
 
 
 class InterfaceItem(BaseItem):
     """Object item, such as Model, Space, Cells"""
+    __slots__ = ()
+
+    def updateData(self, data):
+        for key in _INTERNED_KEYS:
+            value = data.get(key)
+            if type(value) is str:
+                data[key] = sys.intern(value)
+        BaseItem.updateData(self, data)
 
     @property
     def objid(self):
@@ -167,11 +321,21 @@ class InterfaceItem(BaseItem):
 
 
 class ViewItem(BaseItem):
+    __slots__ = ()
 
     @property
     def attrid(self):
         return self.getType()
 
+    def getAttrs(self):
+        # The data is the items of a container
+        return {}
+
+    def hasSameData(self, other):
+        items, otheritems = self.itemData, other.itemData
+        return (list(items) == list(otheritems)
+                and all(is_same_tree(items[k], otheritems[k]) for k in items))
+
     def __eq__(self, other):
         if isinstance(other, ViewItem):
             return (self.parent() == other.parent()
@@ -183,63 +347,76 @@ class ViewItem(BaseItem):
 
 class SpaceContainerItem(InterfaceItem):
     """Base Item class for Models and Spaces which inherit SpaceContainer."""
-
-    def updateChild(self):
-        raise NotImplementedError
+    __slots__ = ()
 
     def getSpaceContainerList(self):
-        result = []
-        result.append(self.itemData['fullname'])
-        for child in self.childItems:
-            if isinstance(child, SpaceContainerItem):
-                result.extend(child.getSpaceContainerList())
-        return result
+        return get_space_containers(self.itemData)
 
     def getChildSpaceList(self):
-        result = []
-        for child in self.childItems:
-            if isinstance(child, SpaceContainerItem):
-                result.append(child.itemData['namedid'])
-                result.extend(child.getChildSpaceList())
-        return result
+        return get_child_spaces(self.itemData)
 
 
 class ModelItem(SpaceContainerItem):
     """Item class for a Model (root item)"""
+    __slots__ = ()
+
     def __init__(self, data):
         super(ModelItem, self).__init__(data, parent=None)
 
-    def updateChild(self):
+    def childSpecs(self):
         data = self.itemData
-        self.childItems.clear()
-        self.childItems.extend(SpaceItem(space, self)
-                               for space in data['spaces']['items'].values())
-        self.childItems.extend(RefItem(ref, self)
-                               for ref in data['refs']['items'].values())
+        return ([(SpaceItem, space)
+                 for space in data['spaces']['items'].values()]
+                + [(RefItem, ref) for ref in data['refs']['items'].values()])
 
     def getParams(self):
         return ''
 
 
 class SpaceItem(SpaceContainerItem):
-    """Item class for Space objects."""
-    def updateChild(self):
-        self.childItems.clear()
+    """Item class for Space objects.
+
+    The child items are loaded when the item is expanded.
+    Until then, the containers of the data are tuples of names.
+    """
+    __slots__ = ()
+    containers = ['_named_itemspaces', 'named_spaces', 'cells', 'refs']
+
+    def isLoaded(self):
+        return all(is_container(self.itemData.get(name))
+                   for name in self.containers)
+
+    def canFetchMore(self):
+        if self.isLoaded():
+            return False
+
+        data = self.itemData
+        return bool(data.get('_named_itemspaces') or data.get('named_spaces')
+                    or data.get('cells')
+                    or any(not n.startswith('__')
+                           for n in data.get('refs', ())))
+
+    def childSpecs(self):
+        if not self.isLoaded():
+            return []
+
+        specs = []
         dynspaces = self.itemData['_named_itemspaces']['items']
         if len(dynspaces) > 0:
-            self.childItems.append(ItemSpaceMapItem(dynspaces, self))
+            specs.append((ItemSpaceMapItem, dynspaces))
 
         for space in self.itemData['named_spaces']['items'].values():
-            self.childItems.append(UserSpaceItem(space, self))
+            specs.append((UserSpaceItem, space))
 
         cellsmap = self.itemData['cells']['items']
         for cells in cellsmap.values():
-            self.childItems.append(CellsItem(cells, self))
+            specs.append((CellsItem, cells))
 
         refview = self.itemData['refs']['items']
         for ref in refview.values():
-            self.childItems.append(RefItem(ref, self))
+            specs.append((RefItem, ref))
 
+        return specs
 
     def getParams(self):
         if 'argvalues' in self.itemData:
@@ -251,21 +428,58 @@ class SpaceItem(SpaceContainerItem):
         else:
             return ''
 
-class UserSpaceItem(SpaceItem): pass
+class UserSpaceItem(SpaceItem):
+    __slots__ = ()
 
-class ItemSpaceItem(SpaceItem): pass
+class ItemSpaceItem(SpaceItem):
+    __slots__ = ()
 
 
 class ItemSpaceMapItem(ViewItem):
-    """Item class for parent nodes of dynamic spaces of a space."""
-    def updateChild(self):
-        self.childItems.clear()
-        for space in self.itemData.values():
-            self.childItems.append(ItemSpaceItem(space, self))
+    """Item class for parent nodes of dynamic spaces of a space.
+
+    The item spaces are shown by pages of :data:`ITEMSPACE_PAGE_SIZE`,
+    followed by the ones sought by :meth:`MxTreeModel.seekItemSpace`.
+    The number of all the item spaces is shown in the ``LEN`` column.
+    """
+    __slots__ = ('shownCount', 'soughtKeys')
+
+    def __init__(self, data, parent=None):
+        self.shownCount = ITEMSPACE_PAGE_SIZE
+        self.soughtKeys = []
+        super(ItemSpaceMapItem, self).__init__(data, parent)
+
+    def copyPages(self, other):
+        """Show the same item spaces as other"""
+        self.shownCount = other.shownCount
+        self.soughtKeys = list(other.soughtKeys)
+        self.updateChild()
+
+    def childSpecs(self):
+        items = self.itemData
+        keys = list(itertools.islice(items, self.shownCount))
+        shown = set(keys)
+        keys.extend(key for key in self.soughtKeys
+                    if key in items and key not in shown)
+        return [(ItemSpaceItem, items[key]) for key in keys]
+
+    def canFetchMore(self):
+        return self.shownCount < len(self.itemData)
+
+    def findItemSpace(self, args):
+        """Get the key of the first item space whose arguments start with args
+        """
+        for key, space in self.itemData.items():
+            values = space.get('argvalues')
+            if values is not None and tuple(values[:len(args)]) == args:
+                return key
+        return None
 
     def data(self, column):
         if column == 0:
             return 'ItemSpaces'
+        elif column == TreeCol.LEN:
+            return str(len(self.itemData))
         else:
             return BaseItem.data(self, column)
 
@@ -275,8 +489,10 @@ class ItemSpaceMapItem(ViewItem):
 
 class CellsItem(InterfaceItem):
     """Item class for cells objects."""
-    def updateChild(self):
-        pass
+    __slots__ = ()
+
+    def childSpecs(self):
+        return []
 
     def getParams(self):
         params = self.itemData['parameters']
@@ -285,8 +501,10 @@ class CellsItem(InterfaceItem):
 
 class RefItem(InterfaceItem):
     """Item class for references."""
-    def updateChild(self):
-        pass
+    __slots__ = ()
+
+    def childSpecs(self):
+        return []
 
     def getType(self):
         return "Ref/" + self.itemData["value_type"]
@@ -297,140 +515,267 @@ class RefItem(InterfaceItem):
 
 class MxTreeModel(QAbstractItemModel):
 
+    # Emitted with an item whose child items are to be loaded.
+    # loadChildren or fetchFailed must be called in response.
+    sig_fetch_requested = Signal(object)
+
     def __init__(self, item, parent=None):
         super(MxTreeModel, self).__init__(parent)
         self.rootItem = item
+        self.version = None     # Version of the tree given by the kernel
+        self.fetching = set()   # ids of the items being loaded
+
+        # Nodes pruned from the whole tree sent by older kernels,
+        # by their full names, to load their children from
+        self.unloadedNodes = {}
 
     def updateRoot(self, item):
-        newmodel = item
-        if self.updateItem(QModelIndex(), newmodel):
-            # Refresh view when data changed
-            # https://www.qtcentre.org/threads/48230-QTreeView-How-to-refresh-the-view?p=270537#post270537
-            self.dataChanged.emit(QModelIndex(), QModelIndex())
+        self.updateItem(QModelIndex(), item)
 
-    def getItem(self, index):
-        if not index.isValid():
-            return self.rootItem
-        else:
-            return index.internalPointer()
+    def applyChanges(self, changes):
+        """Apply changes from treedelta to the tree
 
-    def updateItem(self, index, newitem, recursive=True):
+        The items hold the dicts in the tree of the root item,
+        so the items to update are found by the identities of the dicts.
+        """
+        for change in changes:
+            kind, path = change[:2]
+            item, index = self.findItem(path)
+            apply_tree_delta(self.rootItem.itemData, [change])
 
-        updated = False
+            if item is None:    # Not shown in the tree
+                continue
+            elif kind == 'attrs':
+                self.emitRowChanged(index)
 
-        if not index.isValid():
-            item = self.rootItem
-        else:
-            item = index.internalPointer()
+            # Attributes changes can unload the child items
+            self.syncChildren(index, item)
+            for row, child in enumerate(item.childItems):
+                if isinstance(child, ViewItem):
+                    child_index = self.index(row, 0, index)
+                    self.syncChildren(child_index, child)
+                    if kind == 'attrs' or isinstance(child, ItemSpaceMapItem):
+                        # The parameters of the parent
+                        # and the number of item spaces are shown
+                        self.emitRowChanged(child_index)
 
-        if item.itemData != newitem.itemData:
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return False
+        item = self.getItem(parent)
+        return item.childCount() > 0 or item.canFetchMore()
 
-            updated = True
+    def canFetchMore(self, parent):
+        item = self.getItem(parent)
+        return id(item) not in self.fetching and item.canFetchMore()
 
-            item.itemData = newitem.itemData
-            # self.dataChanged.emit(index, index)
-            delItems = set(item.childItems) - set(newitem.childItems)
+    def fetchMore(self, parent):
+        item = self.getItem(parent)
+        if isinstance(item, ItemSpaceMapItem):
+            # The item spaces are in the tree
+            item.shownCount += ITEMSPACE_PAGE_SIZE
+            self.syncChildren(parent, item)
+        else:
+            self.fetching.add(id(item))
+            self.sig_fetch_requested.emit(item)
 
-            if delItems:
-                delRows = sorted([item.row() for item in delItems])
-                # https://stackoverflow.com/questions/10420464/group-list-of-ints-by-continuous-sequence
-                delRows = [list(g) for _, g in itertools.groupby(
-                    delRows, key=lambda n, c=itertools.count(): n-next(c))]
+    def seekItemSpace(self, parent, args):
+        """Show the first item space whose arguments start with args
 
-                # Example:
-                # delRows = [2,3,4,7,8,9]
-                # key(n): delRows -> [2, 2, 2, 4, 4, 4]
-                # delRows = [[2,3,4],[7,8,9]]
+        parent is the index of an ItemSpaces node. The item space is
+        shown after the pages shown so far if it is not in them.
+        Return the index of the item space, or None if not found.
+        """
+        item = self.getItem(parent)
+        key = item.findItemSpace(args)
+        if key is None:
+            return None
 
-                shift = 0
-                for rows in delRows:
-                    self.removeRows(rows[0]-shift, len(rows), index)
-                    shift += len(rows)
+        if key not in item.soughtKeys:
+            item.soughtKeys.append(key)
+        self.syncChildren(parent, item)
+        space = item.itemData[key]
+        for row, child in enumerate(item.childItems):
+            if child.itemData is space:
+                return self.index(row, 0, parent)
+        return None
 
-            addItems = set(newitem.childItems) - set(item.childItems)
+    def loadChildren(self, item, data):
+        """Load the child items of item from its data with the containers
 
-            if addItems:
-                addRows = sorted([item.row() for item in addItems])
-                addRows = [list(g) for _, g in itertools.groupby(
-                    addRows, key=lambda n, c=itertools.count(): n-next(c))]
+        The version is reset as the tree is no longer the one
+        of the version.
+        """
+        path = item.getPath()
+        if path is not None:
+            self.version = None
+            self.applyChanges(get_tree_delta(item.itemData, data, path))
+        self.fetching.discard(id(item))
 
-                for rows in addRows:
-                    self.insertRows(rows, newitem, index)
+    def fetchFailed(self, item):
+        self.fetching.discard(id(item))
 
-            self.reorderChild(index, newitem)
+    def findItem(self, path):
+        """Find the item and its index of the node at path
 
-            if recursive:
-                for row, child in enumerate(item.childItems):
-                    child_index = self.index(row, 0, index)
-                    self.updateItem(child_index, newitem.childItems[row])
+        Return a pair of Nones if the node is not shown in the tree,
+        such as the nodes in the ``spaces`` container of a space.
+        """
+        item = self.rootItem
+        index = QModelIndex()
+        for container, key in zip(path[::2], path[1::2]):
+            data = item.itemData[container]['items'][key]
+            result = self._findChild(item, index, data)
+            if result is None:
+                return None, None
+            item, index = result
+        return item, index
+
+    def _findChild(self, item, index, data):
+        for row, child in enumerate(item.childItems):
+            if child.itemData is data:
+                return child, self.index(row, 0, index)
+
+        for row, child in enumerate(item.childItems):
+            if isinstance(child, ViewItem):
+                result = self._findChild(
+                    child, self.index(row, 0, index), data)
+                if result:
+                    return result
 
-        return updated
+        return None
 
-    def insertRows(self, rows, newitem, parent):
-        # Signature is different from the base method.
-        item = self.getItem(parent)
-        self.beginInsertRows(parent, rows[0], rows[-1])
+    def syncChildren(self, parent, item):
+        """Match the child items with the data of the item
 
-        for row in rows:
-            item.insertChild(row, newitem.childItems[row])
+        The item is kept in ``fetching`` while the rows are changed,
+        so that the views do not fetch more rows in between.
+        """
+        fetching = id(item) in self.fetching
+        self.fetching.add(id(item))
+        try:
+            specs = item.childSpecs()
+            self.diffChildren(
+                parent, item, [id(data) for _, data in specs],
+                lambda child: id(child.itemData),
+                lambda row: specs[row][0](specs[row][1], item))
+        finally:
+            if not fetching:
+                self.fetching.discard(id(item))
+
+    def diffChildren(self, parent, item, keys, getKey, newItem):
+        """Match the child items with keys
+
+        The child items whose keys returned by ``getKey`` are not in
+        ``keys`` are removed, the others are reordered as ``keys``,
+        and the items for the rest of ``keys`` are created by ``newItem``
+        with their rows and inserted. Consecutive rows are removed,
+        moved and inserted together.
+        """
+        key_set = set(keys)
+        delRows = [row for row, child in enumerate(item.childItems)
+                   if getKey(child) not in key_set]
+        for start, count in reversed(get_runs(delRows)):
+            self.removeRows(start, count, parent)
+
+        existing = [getKey(child) for child in item.childItems]
+        existing_set = set(existing)
+        targets = [key for key in keys if key in existing_set]
+        if existing != targets:
+            self.reorderChildren(parent, item, existing, targets)
+
+        addRows = [row for row, key in enumerate(keys)
+                   if key not in existing_set]
+        for start, count in get_runs(addRows):
+            self.beginInsertRows(parent, start, start + count - 1)
+            item.insertChildren(
+                start, [newItem(row) for row in range(start, start + count)])
+            self.endInsertRows()
+
+    def reorderChildren(self, parent, item, source, target):
+        """Reorder the child items from the keys in source to target
+
+        The moves are emitted as row moves if they are not more than
+        :data:`MAX_MOVE_SIGNALS`, and otherwise as a layout change.
+        """
+        moves = get_moves(source, target, limit=MAX_MOVE_SIGNALS)
+        if moves is not None:
+            for index_to, index_from, length in moves:
+                self.moveRows(parent, index_to, index_from, length)
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        children = dict(zip(source, item.childItems))
+        item.childItems[:] = [children[key] for key in target]
+        item.renumberChildren()
+        for index in self.persistentIndexList():
+            child = index.internalPointer() if index.isValid() else None
+            if (child is not None and child.parentItem is item
+                    and index.row() != child.rowIndex):
+                self.changePersistentIndex(index, self.createIndex(
+                    child.rowIndex, index.column(), child))
+        self.layoutChanged.emit()
 
-        self.endInsertRows()
+    def getItem(self, index):
+        if not index.isValid():
+            return self.rootItem
+        else:
+            return index.internalPointer()
 
-    def removeRows(self, position, rows, parent=QModelIndex()):
+    def updateItem(self, index, newitem, recursive=True):
+        """Update the item at index and its children with newitem
 
-        item = self.getItem(parent)
+        Only the branches whose subtree hashes set by ``hash_tree``
+        differ are walked, and only the rows whose attributes changed
+        are emitted by ``dataChanged``. Return True if the item is updated.
+        """
+        item = self.getItem(index)
+        if item.hasSameData(newitem):
+            return False
 
-        self.beginRemoveRows(parent, position, position + rows - 1)
+        attrs_changed = item.getAttrs() != newitem.getAttrs()
+        item.itemData = newitem.itemData
+        if attrs_changed:
+            self.emitRowChanged(index)
+        if isinstance(item, ItemSpaceMapItem):
+            newitem.copyPages(item)
 
-        # for row in range(position, position + rows):
-        while rows > 0:
-            item.childItems.pop(position)
-            rows -= 1
+        self.diffChildren(
+            index, item, newitem.childItems, lambda child: child,
+            lambda row: newitem.childItems[row])
 
-        self.endRemoveRows()
+        for row, child in enumerate(item.childItems):
+            child_index = self.index(row, 0, index)
+            if recursive:
+                self.updateItem(child_index, newitem.childItems[row])
+            if attrs_changed and isinstance(child, ViewItem):
+                # The parameters of the parent are shown
+                self.emitRowChanged(child_index)
 
-    def reorderChild(self, parent, newitem):
-        """Reorder a list to match target by moving a sequence at a time.
+        return True
 
-        Written for QtAbstractItemModel.moveRows.
-        """
-        source = self.getItem(parent).childItems
-        target = newitem.childItems
+    def emitRowChanged(self, index):
+        """Emit dataChanged for the row at index
 
-        i = 0
-        while i < len(source):
+        Nothing is emitted for the root item, which is not shown.
+        """
+        if index.isValid():
+            self.dataChanged.emit(index, index.sibling(
+                index.row(), index.internalPointer().columnCount() - 1))
 
-            if source[i] == target[i]:
-                i += 1
-                continue
-            else:
-                i0 = i
-                j0 = source.index(target[i0])
-                j = j0 + 1
-                while j < len(source):
-                    if source[j] == target[j - j0 + i0]:
-                        j += 1
-                        continue
-                    else:
-                        break
-                self.moveRows(parent, i0, j0, j - j0)
-                i += j - j0
+    def removeRows(self, position, rows, parent=QModelIndex()):
 
-    def moveRows(self, parent, index_to, index_from, length):
-        """Move a sub sequence in a list
+        item = self.getItem(parent)
 
-        index_to must be smaller than index_from
-        """
-        source = self.getItem(parent).childItems
+        self.beginRemoveRows(parent, position, position + rows - 1)
+        item.removeChildren(position, rows)
+        self.endRemoveRows()
 
+    def moveRows(self, parent, index_to, index_from, length):
+        """Move length rows at index_from to before index_to"""
         self.beginMoveRows(parent, index_from, index_from + length - 1,
                            parent, index_to)
-
-        sublist = [source.pop(index_from) for _ in range(length)]
-
-        for _ in range(length):
-            source.insert(index_to, sublist.pop())
-
+        self.getItem(parent).moveChildren(index_to, index_from, length)
         self.endMoveRows()
 
     @property
@@ -501,7 +846,7 @@ class MxTreeModel(QAbstractItemModel):
         childItem = index.internalPointer()
         parentItem = childItem.parent()
 
-        if parentItem is None or parentItem == self.rootItem:
+        if parentItem is None or parentItem is self.rootItem:
             return QModelIndex()
 
         return self.createIndex(parentItem.row(), 0, parentItem)
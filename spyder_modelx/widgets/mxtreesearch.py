@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2018-2022 Fumito Hamamura <fumito.ham@gmail.com>
+
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation version 3.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Search of the items in MxTreeModel by their names
+
+:class:`MxTreeSearch` indexes the names of the items loaded in
+an :class:`~spyder_modelx.widgets.mxtreemodel.MxTreeModel`, and keeps
+the index updated by the signals of the model as the tree changes.
+:class:`MxTreeFilterProxy` shows the items found and their ancestors.
+"""
+
+from qtpy.QtCore import QObject, QSortFilterProxyModel, Signal
+
+from spyder_modelx.utility.nameindex import NameIndex
+from spyder_modelx.widgets.mxtreemodel import InterfaceItem
+
+
+class MxTreeSearch(QObject):
+    """Name index of the items of a MxTreeModel
+
+    The index is created as a child of the model, and is
+    found by ``model.findChild(MxTreeSearch)``.
+    The items are indexed by their ids with their full names.
+    """
+
+    # Emitted when the index is changed
+    sig_index_changed = Signal()
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.model = model
+        self.index = NameIndex()
+        self.items = {}     # id -> item
+
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(self.rebuild)
+        self.rebuild()
+
+    def rebuild(self):
+        self.index.clear()
+        self.items.clear()
+        self._add(self.model.rootItem)
+        self.sig_index_changed.emit()
+
+    def _add(self, item):
+        items = [item]
+        while items:
+            item = items.pop()
+            if isinstance(item, InterfaceItem) and item.parentItem:
+                self.items[id(item)] = item
+                self.index.add(id(item), item.itemData['fullname'])
+            items.extend(item.childItems)
+
+    def _remove(self, item):
+        items = [item]
+        while items:
+            item = items.pop()
+            self.items.pop(id(item), None)
+            self.index.remove(id(item))
+            items.extend(item.childItems)
+
+    def _on_rows_inserted(self, parent, first, last):
+        item = self.model.getItem(parent)
+        for child in item.childItems[first:last + 1]:
+            self._add(child)
+        self.sig_index_changed.emit()
+
+    def _on_rows_removed(self, parent, first, last):
+        item = self.model.getItem(parent)
+        for child in item.childItems[first:last + 1]:
+            self._remove(child)
+        self.sig_index_changed.emit()
+
+    def _on_data_changed(self, topLeft, bottomRight):
+        parent = self.model.getItem(topLeft.parent())
+        for child in parent.childItems[topLeft.row():bottomRight.row() + 1]:
+            if id(child) in self.items:
+                self.index.add(id(child), child.itemData['fullname'])
+        self.sig_index_changed.emit()
+
+    def search(self, text):
+        """Return the ids of the items containing text and their ancestors"""
+        found = self.index.search(text)
+        result = set(found)
+        for key in found:
+            item = self.items[key].parentItem
+            while item is not None and id(item) not in result:
+                result.add(id(item))
+                item = item.parentItem
+        return result
+
+
+class MxTreeFilterProxy(QSortFilterProxyModel):
+    """Proxy of MxTreeModel showing the items of the given ids
+
+    The proxy only shows the items loaded in the model, so that
+    expanding the items in its view does not load their children
+    from the kernel.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.accepted = set()
+
+    def setAccepted(self, accepted):
+        self.accepted = accepted
+        self.invalidateFilter()
+
+    def hasChildren(self, parent):
+        return self.rowCount(parent) > 0
+
+    def canFetchMore(self, parent):
+        return False
+
+    def fetchMore(self, parent):
+        pass
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        item = self.sourceModel().getItem(source_parent)
+        return id(item.childItems[source_row]) in self.accepted